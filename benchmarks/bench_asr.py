@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+ASR benchmark: word error rate, decode latency and real-time factor per Whisper model
+
+Replays recorded agent utterances (a directory of WAV + same-stem .txt
+transcripts, or a JSONL manifest — see src/audio_replay.py) through the
+same sr.AudioData → recognize_whisper() path the conversation loop uses.
+Model load time is reported separately and excluded from decode latency.
+
+Usage:
+    python benchmarks/bench_asr.py recordings/ [--models tiny.en base.en small.en]
+                                   [--speed 0] [--json reports/asr_bench.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_replay import ReplaySource, audio_duration, load_replay_set, word_error_rate
+
+
+def _pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+
+def bench_model(model, utterances, speed):
+    import speech_recognition as sr
+
+    recognizer = sr.Recognizer()
+    replay = ReplaySource(utterances, speed=speed)
+
+    # Load (and warm up) the model on the first utterance, outside the timings
+    start = time.perf_counter()
+    try:
+        recognizer.recognize_whisper(replay.next_audio(), model=model)
+    except sr.UnknownValueError:
+        pass  # silent/unintelligible first clip: the model is loaded all the same
+    load_seconds = time.perf_counter() - start
+    replay.position = 0
+
+    rows = []
+    for utterance, audio in replay:
+        start = time.perf_counter()
+        try:
+            text = recognizer.recognize_whisper(audio, model=model).strip()
+        except sr.UnknownValueError:
+            text = ""
+        decode = time.perf_counter() - start
+        duration = audio_duration(audio)
+        rows.append({
+            "id": utterance.id,
+            "audio_seconds": duration,
+            "decode_seconds": decode,
+            "rtf": decode / duration if duration else 0.0,
+            "hypothesis": text,
+            "reference": utterance.transcript,
+            "wer": word_error_rate(utterance.transcript, text) if utterance.transcript else None,
+        })
+
+    decode = [r["decode_seconds"] for r in rows]
+    scored = [r for r in rows if r["wer"] is not None]
+    ref_words = sum(len(r["reference"].split()) for r in scored)
+    return {
+        "model": model,
+        "utterances": len(rows),
+        "load_seconds": load_seconds,
+        # Corpus WER: errors weighted by reference length
+        "wer": (sum(r["wer"] * len(r["reference"].split()) for r in scored) / ref_words)
+        if ref_words else None,
+        "decode_p50": statistics.median(decode),
+        "decode_p95": _pct(decode, 95),
+        "rtf_mean": sum(decode) / sum(r["audio_seconds"] for r in rows),
+        "rows": rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("replay_set", help="Directory of WAV + .txt files, or JSONL manifest")
+    parser.add_argument("--models", nargs="+", default=["tiny.en", "base.en"],
+                        help="Whisper model names to compare")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Replay pacing (1 = real time); 0 measures decode only")
+    parser.add_argument("--json", type=str, help="Write full per-utterance results here")
+    args = parser.parse_args()
+
+    utterances = load_replay_set(args.replay_set)
+    missing = sum(1 for u in utterances if not u.transcript)
+    print(f"ASR benchmark: {len(utterances)} utterances from {args.replay_set}"
+          + (f" ({missing} without reference transcript, excluded from WER)" if missing else ""))
+
+    results = []
+    for model in args.models:
+        print(f"\n⏳ {model}...")
+        results.append(bench_model(model, utterances, args.speed))
+
+    print(f"\n  {'model':<12} {'WER':>7} {'p50 ms':>9} {'p95 ms':>9} {'RTF':>6} {'load s':>8}")
+    for r in results:
+        wer = f"{r['wer'] * 100:.1f}%" if r["wer"] is not None else "n/a"
+        print(f"  {r['model']:<12} {wer:>7} {r['decode_p50'] * 1000:>9.0f} "
+              f"{r['decode_p95'] * 1000:>9.0f} {r['rtf_mean']:>6.2f} {r['load_seconds']:>8.1f}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Per-utterance results: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark: startup cost of the CLI entry points and src modules
+
+Each case runs in a fresh interpreter. Wall time is the median over
+--repeat runs; one extra run with `python -X importtime` lists the slowest
+imports and checks that no heavy dependency (speech_recognition, Appium,
+selenium, Whisper/torch, requests...) was loaded on a path that does not
+need it. Exits 1 if a case fails, leaks a heavy import, or exceeds the
+budget, so it can guard against regressions in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat 5] [--budget 1.0] [--top 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Top-level packages that must only load on the code paths that use them
+HEAVY = {
+    "speech_recognition", "appium", "selenium", "whisper", "torch", "numpy",
+    "requests", "edge_tts", "piper", "pyaudio", "soundfile", "webrtcvad", "PIL",
+}
+
+# (label, interpreter args) — all of these should start without HEAVY modules
+CASES = [
+    ("e2e --help", ["end_to_end_voice_test.py", "--help"]),
+    ("manual --list-personas", ["manual_voice_test.py", "--list-personas"]),
+    ("import end_to_end_voice_test", ["-c", "import end_to_end_voice_test"]),
+    ("import manual_voice_test", ["-c", "import manual_voice_test"]),
+    ("import src.appium_driver", ["-c", "import src.appium_driver"]),
+    ("import src.ollama_client", ["-c", "import src.ollama_client"]),
+    ("import src.speech_service", ["-c", "import src.speech_service"]),
+    ("import src.report_generator", ["-c", "import src.report_generator"]),
+    ("import src.dashboard", ["-c", "import src.dashboard"]),
+]
+
+
+def _run(args, importtime=False):
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    return time.perf_counter() - start, proc
+
+
+def _parse_importtime(stderr):
+    """[(cumulative_us, module)] from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative, name = line.split(":", 1)[1].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return rows
+
+
+def bench_case(label, args, repeat, top):
+    times = []
+    for _ in range(repeat):
+        seconds, proc = _run(args)
+        if proc.returncode != 0:
+            return {"label": label, "error": (proc.stderr.strip().splitlines() or ["?"])[-1]}
+        times.append(seconds)
+
+    _, proc = _run(args, importtime=True)
+    imports = _parse_importtime(proc.stderr)
+    loaded = {name.split(".")[0] for _, name in imports}
+    return {
+        "label": label,
+        "median": statistics.median(times),
+        "best": min(times),
+        "heavy": sorted(loaded & HEAVY),
+        "slowest": sorted((r for r in imports if "." not in r[1]), reverse=True)[:top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (median reported)")
+    parser.add_argument("--budget", type=float, default=1.0, help="Max median seconds per case")
+    parser.add_argument("--top", type=int, default=5, help="Slowest top-level imports to list")
+    args = parser.parse_args()
+
+    print(f"Import-time benchmark ({args.repeat} runs per case, budget {args.budget:.2f}s)\n")
+    failed = False
+    for label, case_args in CASES:
+        r = bench_case(label, case_args, args.repeat, args.top)
+        if "error" in r:
+            failed = True
+            print(f"  ❌ {label:<30} failed: {r['error']}")
+            continue
+        ok = r["median"] <= args.budget and not r["heavy"]
+        failed |= not ok
+        print(f"  {'✅' if ok else '❌'} {label:<30} {r['median'] * 1000:7.0f} ms "
+              f"(best {r['best'] * 1000:.0f} ms)")
+        if r["heavy"]:
+            print(f"       heavy imports loaded: {', '.join(r['heavy'])}")
+        slowest = ", ".join(f"{name} {us / 1000:.0f}ms" for us, name in r["slowest"])
+        print(f"       slowest: {slowest}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-utterance overhead of speak_sync paths
+
+Compares the old per-call path (new VoiceAI + temp-file cleanup +
+asyncio.run) against the long-lived SpeechService (queue submit on an
+already-running loop). Synthesis and playback are stubbed out so only the
+framework overhead is measured — no network or audio device needed. The
+voice_ai config is loaded once up front for the old path too, so YAML
+parsing does not inflate its numbers.
+
+Usage:
+    python benchmarks/bench_speech_service.py [--calls 200] [--temp-files 10]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_playback import NullPlayback
+from src.speech_service import SpeechService
+from src import voice_ai
+from src.voice_ai import VoiceAI
+
+
+class _SilentVoiceAI(VoiceAI):
+    """VoiceAI whose speak() returns immediately — isolates loop/queue overhead"""
+
+    async def speak(self, text, filename="utterance"):
+        return None
+
+
+def _summary(label, samples):
+    us = sorted(s * 1e6 for s in samples)
+    p95 = us[int(len(us) * 0.95) - 1]
+    print(f"  {label:<38} mean {statistics.mean(us):9.1f} µs   "
+          f"p50 {statistics.median(us):9.1f} µs   p95 {p95:9.1f} µs")
+    return statistics.mean(us)
+
+
+def bench_per_call(audio_dir, calls):
+    config = voice_ai.load_voice_ai_config()
+    load_config = voice_ai.load_voice_ai_config
+    voice_ai.load_voice_ai_config = lambda *args, **kwargs: config  # preloaded
+    samples = []
+    try:
+        for _ in range(calls):
+            start = time.perf_counter()
+            vai = _SilentVoiceAI(audio_dir=audio_dir, playback=NullPlayback(), tts_backend="silence")
+            asyncio.run(vai.speak("Large pepperoni pizza, please."))
+            samples.append(time.perf_counter() - start)
+    finally:
+        voice_ai.load_voice_ai_config = load_config
+    return samples
+
+
+def bench_service(audio_dir, calls):
+    service = SpeechService(
+        voice_ai=_SilentVoiceAI(
+            audio_dir=audio_dir, playback=NullPlayback(), tts_backend="silence"
+        )
+    )
+    samples = []
+    try:
+        for _ in range(calls):
+            start = time.perf_counter()
+            service.speak("Large pepperoni pizza, please.")
+            samples.append(time.perf_counter() - start)
+    finally:
+        service.shutdown()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--temp-files", type=int, default=10,
+                        help="WAV files pre-populated in the audio dir (cleanup scans them)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as audio_dir:
+        for i in range(args.temp_files):
+            with open(os.path.join(audio_dir, f"utterance_{i}.wav"), "wb") as f:
+                f.write(b"\0" * 64)
+
+        print(f"Per-utterance overhead over {args.calls} calls "
+              f"({args.temp_files} temp files in audio dir):")
+        old = _summary("VoiceAI() + asyncio.run (per call)", bench_per_call(audio_dir, args.calls))
+        new = _summary("SpeechService.speak (persistent loop)", bench_service(audio_dir, args.calls))
+        print(f"\n  Saved per utterance: {old - new:.1f} µs ({old / new:.1f}x less overhead)")
+
+
+if __name__ == "__main__":
+    main()
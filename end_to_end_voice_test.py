@@ -11,28 +11,27 @@ Physical audio setup:
 import argparse
 import glob
 import os
+import re
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
 
-import speech_recognition as sr
+from src.audio_archive import audio_archive_from_config
+from src.event_log import DEFAULT_SPEAKERS, ROLE_AGENT, ROLE_CUSTOMER, EventLog
+from src.menu_catalog import get_menu_catalog
+from src.mic_calibration import get_mic_calibration_store, microphone_label
 from src.ollama_client import OllamaClient
-from src.voice_ai import speak_sync
-
-# Import navigation functions
-from launch_and_invoke_voice import (
-    launch_app,
-    scroll_to_start_voice_order,
-    click_start_voice_order,
-    click_arrow_on_ready_screen,
-    grant_microphone_permission,
-    verify_voice_agent_active,
-    get_voice_session_id,
-)
-
-# Import verification
-from verify_order import verify_order
+from src.speculation import IncrementalTranscriber, SpeculativeGenerator
+from src.speech_service import get_speech_service
+from src.tts_backends import print_tts_stats
+from src.turn_timing import TimingRecorder
+from src.vad import EnergyClassifier, vad_segmenter_from_config
+from src.voice_ai import load_voice_ai_config, speak_sync
+
+# speech_recognition, the Appium client (launch_and_invoke_voice) and the
+# verification stack (verify_order) are imported inside the code paths that
+# need them, so --help and quick CLI invocations start without them.
 
 PERSONAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "personas")
 
@@ -87,13 +86,224 @@ Output only the persona text, matching the structure of the example above."""
         return load_persona("default")
 
 
+def rejected_menu_items(agent_speech, rejection_phrases, catalog=None):
+    """
+    Return canonical menu items named in the rejecting clause of an agent line.
+
+    Only the sentence/clause that contains the rejection phrase is considered,
+    so "We don't have salads, but we do have chicken wings" does not reject
+    the wings the agent is offering instead.
+    """
+    catalog = catalog or get_menu_catalog()
+    names = []
+    for sentence in re.split(r"[.!?]", agent_speech):
+        clause = re.split(r"\bbut\b", sentence, flags=re.IGNORECASE)[0]
+        if any(p in clause.lower() for p in rejection_phrases):
+            for name in catalog.item_names(clause):
+                if name not in names:
+                    names.append(name)
+    return names
+
+
+# Agent phrases that mean the order is placed / handed off to payment.
+# "cvv" is intentionally excluded: the agent may ask for CVV,
+# and Ravi must respond with "Yes, the CVV is 358." before ending.
+ORDER_COMPLETE_PHRASES = [
+    "transfer", "payment",
+    "thank you for your order",
+    "order has been placed", "has been placed",
+    "placed successfully", "order is confirmed",
+    "order confirmed", "successfully placed",
+]
+
+# Agent phrases that mean an item is unavailable
+REJECTION_PHRASES = [
+    "don't have", "do not have", "we don't", "we do not",
+    "not available", "unfortunately", "i'm sorry, we",
+    "sorry, we don't", "sorry, we do not", "i'm sorry,",
+    "can't add", "cannot add",
+]
+
+# Agent phrases confirming an action is already done,
+# e.g. "I've already updated your order", "You already have wings"
+CONFIRMATION_PHRASES = [
+    "i've already", "i have already", "already updated",
+    "already added", "already removed", "already swapped",
+    "already changed", "already included", "already have the",
+    "you already have", "i've updated your order",
+    "i've added", "i've removed", "i've swapped",
+]
+
+# Agent phrases that, together with a question, offer a list of options
+# (e.g. "We have Pepsi, Diet Pepsi and Mountain Dew. Which would you like?")
+OFFER_TRIGGER_PHRASES = [
+    "we have", "you can choose", "you can pick",
+    "would you like", "which would you", "what size",
+    "what kind", "what flavor", "which size", "which flavor",
+]
+
+
+def agent_ends_session(agent_speech):
+    """True if the agent line ends the conversation (goodbye or order placed)"""
+    agent_lower = agent_speech.lower()
+    if "exit" in agent_lower or "goodbye" in agent_lower:
+        return True
+    return any(phrase in agent_lower for phrase in ORDER_COMPLETE_PHRASES)
+
+
+class ConversationState:
+    """
+    What Ravi has learned from the agent so far, and the prompt built from it.
+
+    observe_agent() is the only mutator for agent turns, so preview_prompt()
+    can build the prompt a hypothetical agent line would produce (used for
+    speculative generation on partial transcripts) without touching state.
+    """
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or get_menu_catalog()
+        self.history = []
+        self.rejected_items = []    # Items the agent has explicitly said are unavailable
+        self.rejected_menu = []     # Canonical catalog names for those items (all size/alias variants)
+        self.confirmed_updates = [] # Actions the agent has confirmed are already done
+        self.last_offer = None      # Most recent list of options the agent asked Ravi to choose from
+
+    def copy(self):
+        other = ConversationState(self.catalog)
+        other.history = list(self.history)
+        other.rejected_items = list(self.rejected_items)
+        other.rejected_menu = list(self.rejected_menu)
+        other.confirmed_updates = list(self.confirmed_updates)
+        other.last_offer = self.last_offer
+        return other
+
+    def add_agent_line(self, agent_speech):
+        self.history.append(f"Agent: {agent_speech}")
+
+    def add_ravi_line(self, ravi_response):
+        self.history.append(f"Ravi: {ravi_response}")
+        self.last_offer = None  # Ravi has responded — clear pending offer
+
+    def observe_agent(self, agent_speech, verbose=True):
+        """
+        Update rejections / confirmations / pending offer from an agent line.
+
+        Returns:
+            list of (kind, value) classifier hits: "rejection", "rejected_item",
+            "confirmation", "offer"
+        """
+        agent_lower = agent_speech.lower()
+        say = print if verbose else (lambda *a, **k: None)
+        hits = []
+
+        # Track items the agent has explicitly said are unavailable.
+        # The full agent sentence is stored so specific sizes/items
+        # can be injected verbatim into the constraint block.
+        if any(p in agent_lower for p in REJECTION_PHRASES):
+            if agent_speech.strip() not in self.rejected_items:
+                self.rejected_items.append(agent_speech.strip())
+                hits.append(("rejection", agent_speech.strip()))
+                say(f"   📋 Rejection noted: \"{agent_speech.strip()}\"")
+            for name in rejected_menu_items(agent_speech, REJECTION_PHRASES, self.catalog):
+                if name not in self.rejected_menu:
+                    self.rejected_menu.append(name)
+                    hits.append(("rejected_item", name))
+                    say(f"   📋 Rejected menu item: {name}")
+
+        # Track when the agent confirms an action is already done.
+        if any(p in agent_lower for p in CONFIRMATION_PHRASES):
+            if agent_speech.strip() not in self.confirmed_updates:
+                self.confirmed_updates.append(agent_speech.strip())
+                hits.append(("confirmation", agent_speech.strip()))
+                say(f"   ✅ Confirmation noted: \"{agent_speech.strip()}\"")
+
+        # Track when the agent offers a list of options to choose from.
+        # Detected when agent asks a question AND lists specific items.
+        if "?" in agent_speech and any(p in agent_lower for p in OFFER_TRIGGER_PHRASES):
+            self.last_offer = agent_speech.strip()
+            hits.append(("offer", self.last_offer))
+            say(f"   🍕 Offer noted: \"{self.last_offer}\"")
+        return hits
+
+    def build_prompt(self):
+        """
+        Prompt for Ravi's next line.
+
+        CRITICAL constraints go FIRST in the prompt so the LLM
+        reads them before the conversation history. Placing them
+        after the history causes the model to ignore them because
+        it anchors on the prior dialogue context.
+        """
+        prompt = ""
+        has_rules = self.rejected_items or self.confirmed_updates or self.last_offer
+        if has_rules:
+            prompt += "RULES FOR THIS RESPONSE — read these BEFORE the conversation:\n"
+
+        if self.rejected_items:
+            prompt += (
+                "The agent has confirmed these items are NOT AVAILABLE.\n"
+                "You MUST NOT mention, request, or reference any of them again "
+                "in any form (including size variants):\n"
+            )
+            for r in self.rejected_items:
+                prompt += f"  ✗ {r}\n"
+            if self.rejected_menu:
+                prompt += (
+                    "Menu items ruled out (any size, any wording): "
+                    + ", ".join(self.rejected_menu) + "\n"
+                )
+            prompt += "If the agent offered alternatives, pick one of those instead.\n"
+
+        if self.confirmed_updates:
+            prompt += (
+                "The agent has ALREADY CONFIRMED these actions are done. "
+                "Do NOT ask for them again, do NOT reference these items as missing or unresolved. "
+                "Treat them as complete:\n"
+            )
+            for c in self.confirmed_updates:
+                prompt += f"  ✓ {c}\n"
+            if len(self.confirmed_updates) >= 2:
+                prompt += (
+                    "WARNING: You have been repeating yourself. "
+                    "The agent has confirmed the same thing multiple times. "
+                    "Stop asking about it and move the conversation forward. "
+                    "If your order is complete, say so and wrap up the call.\n"
+                )
+
+        if self.last_offer:
+            prompt += (
+                f"The agent just asked you to choose. "
+                f"You MUST pick a specific option from what they listed. "
+                f"Do NOT give a vague answer like 'can we just get a drink'.\n"
+                f"Agent's question/offer: \"{self.last_offer}\"\n"
+            )
+
+        if has_rules:
+            prompt += "\n"
+
+        prompt += "Conversation History:\n" + "\n".join(self.history)
+        prompt += "\n\nYou are Ravi. Respond with ONLY your spoken words. What do you say next?"
+        return prompt
+
+    def preview_prompt(self, agent_speech):
+        """Prompt that would follow agent_speech, without changing this state"""
+        preview = self.copy()
+        preview.add_agent_line(agent_speech)
+        preview.observe_agent(agent_speech, verbose=False)
+        return preview.build_prompt()
+
+
 def run_ai_customer_conversation(
-    persona_name=None, scenario=None, mic_name="MacBook Pro Microphone"
+    persona_name=None, scenario=None, mic_name="MacBook Pro Microphone", replay=None,
+    session_id=None,
 ):
     """
     Run AI customer conversation loop.
     Replicates manual_voice_test.py conversation logic exactly.
 
+    If replay (a ReplaySource) is given, agent turns come from recorded
+    audio instead of the microphone.
+
     Returns: path to conversation log file
     """
     # Set up logging
@@ -116,9 +326,20 @@ def run_ai_customer_conversation(
         ravi_persona = load_persona(name)
         print(f"📋 Loaded persona: {name}")
 
+    import speech_recognition as sr
+
     # Set up microphone
-    mic_index = find_microphone_index(mic_name)
+    mic_index = None if replay else find_microphone_index(mic_name)
     recognizer = sr.Recognizer()
+    voice_config = load_voice_ai_config()
+    calibration = get_mic_calibration_store()
+    mic_label = microphone_label(mic_index)
+    segmenter = None
+    if not replay and voice_config.get("vad", "webrtc") != "off":
+        segmenter = vad_segmenter_from_config(voice_config)
+        if isinstance(segmenter.classifier, EnergyClassifier):
+            # Start from this mic's stored ambient level instead of the first frame
+            segmenter.classifier.noise_floor_db = calibration.noise_floor_db(mic_label)
 
     # Initialize log
     persona_label = persona_name or scenario or "default"
@@ -127,12 +348,59 @@ def run_ai_customer_conversation(
         f.write(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write("-" * 20 + "\n\n")
 
-    conversation_history = []
-    rejected_items = []    # Items the agent has explicitly said are unavailable
-    confirmed_updates = [] # Actions the agent has confirmed are already done
-    last_offer = None      # Most recent list of options the agent asked Ravi to choose from
+    state = ConversationState(get_menu_catalog())
+    events = EventLog.for_log(log_file)
+    events.emit(
+        "run_start",
+        persona=persona_name,
+        scenario=scenario,
+        session_id=session_id,
+        mic=None if replay else mic_label,
+        replay=bool(replay),
+        speakers=DEFAULT_SPEAKERS,
+    )
+    timings = TimingRecorder(log_file, on_turn=lambda t: events.emit("timings", **t))
+    end_reason = "timeout"
     turn = 1
 
+    def log_utterance(role, text):
+        speaker = DEFAULT_SPEAKERS[role]
+        log_f.write(f"{speaker}: {text}\n")
+        events.emit("utterance", turn=turn, role=role, speaker=speaker, text=text)
+
+    def log_notice(text):
+        log_f.write(text + "\n")
+        events.emit("notice", turn=turn, text=text)
+
+    # Per-run audio archive (test.record_audio): agent segments + Ravi's TTS
+    archive = audio_archive_from_config(log_file.stem)
+    if archive:
+        def archive_ravi_audio(text, pcm, sample_rate, channels):
+            archive.add("ravi", turn, pcm, sample_rate, channels, transcript=text)
+
+        get_speech_service().voice_ai.add_audio_listener(archive_ravi_audio)
+        print(f"🎙️ Recording turn audio to: {archive.run_dir}")
+
+    # Incremental ASR + speculative LLM: start Ravi's reply on a partial
+    # transcript once the agent's question is complete
+    transcriber = speculator = None
+    if segmenter and voice_config.get("speculative_llm", False):
+        speculator = SpeculativeGenerator(
+            lambda prompt: ollama.generate(prompt, system=ravi_persona)
+        )
+
+        def on_partial_transcript(hypothesis):
+            text = hypothesis.text
+            if not text.endswith("?") or agent_ends_session(text):
+                return
+            if speculator.speculate(text, state.preview_prompt(text)):
+                print(f'   💭 Partial: "{text}" — speculating')
+
+        transcriber = IncrementalTranscriber(
+            sample_rate=segmenter.sample_rate, on_hypothesis=on_partial_transcript
+        )
+        segmenter.on_partial = transcriber.submit
+
     print("\n🎤 AI Customer (Ravi) is listening for the voice agent...")
     print("   Make sure phone speaker volume is up so computer mic can hear it.")
     print("   Press Ctrl+C to end conversation early.\n")
@@ -141,164 +409,125 @@ def run_ai_customer_conversation(
         with open(log_file, "a") as log_f:
             while True:
                 print(f"--- Turn {turn} ---")
+                timer = timings.start_turn(turn)
+                if speculator:
+                    transcriber.new_turn()
+                    speculator.new_turn()
 
                 try:
+                    audio = None
                     # 1. Listen for the voice agent (phone) speaking
-                    with sr.Microphone(device_index=mic_index) as source:
-                        recognizer.dynamic_energy_threshold = True
-                        recognizer.pause_threshold = 1.0  # slight buffer for TTS pauses between phrases
-
-                        print("\n   🔴 Listening for Agent...")
-                        audio = recognizer.listen(source, timeout=45, phrase_time_limit=30)
+                    if replay:
+                        print("\n   🔁 Replaying recorded agent audio...")
+                        with timer.span("agent_speech"):
+                            audio = replay.next_audio()
+                    elif segmenter:
+                        # VAD endpointing: returns as soon as the agent stops
+                        with sr.Microphone(
+                            device_index=mic_index, sample_rate=segmenter.sample_rate
+                        ) as source:
+                            print("\n   🔴 Listening for Agent...")
+                            listen_start = time.monotonic()
+                            segment = segmenter.listen(source, timeout=45)
+                        timer.add_segment(listen_start, segment)
+                        if isinstance(segmenter.classifier, EnergyClassifier):
+                            calibration.observe_noise_floor_db(
+                                mic_label, segmenter.classifier.noise_floor_db
+                            )
+                        print(
+                            f"   ⏱️ Endpointed in {segment.endpoint_latency * 1000:.0f} ms "
+                            f"({segment.duration:.1f}s segment)"
+                        )
+                        audio = segment.to_audio_data()
+                    else:
+                        with sr.Microphone(device_index=mic_index) as source:
+                            recognizer.dynamic_energy_threshold = True
+                            recognizer.pause_threshold = 1.0  # slight buffer for TTS pauses between phrases
+                            calibration.apply(recognizer, source, mic_label)
+
+                            print("\n   🔴 Listening for Agent...")
+                            # wait + speech + pause_threshold are not separable here
+                            with timer.span("listen_wait"):
+                                audio = recognizer.listen(source, timeout=45, phrase_time_limit=30)
+                        calibration.observe(mic_label, recognizer.energy_threshold)
 
                     print("   🔄 Transcribing agent's speech...")
-                    agent_speech = recognizer.recognize_whisper(audio, model="tiny.en")
+                    with timer.span("transcription"):
+                        agent_speech = recognizer.recognize_whisper(audio, model="tiny.en")
                     print(f'   👨‍💼 Agent: "{agent_speech}"')
+                    if archive:
+                        archive.add_audio_data("agent", turn, audio, transcript=agent_speech)
 
-                    agent_line = f"Agent: {agent_speech}"
-                    conversation_history.append(agent_line)
-                    log_f.write(agent_line + "\n")
+                    state.add_agent_line(agent_speech)
+                    log_utterance(ROLE_AGENT, agent_speech)
 
                     if "exit" in agent_speech.lower() or "goodbye" in agent_speech.lower():
                         print("\n🛑 Agent ended the session.")
+                        end_reason = "agent_goodbye"
                         break
 
                     # Check for agent-side termination conditions.
-                    # "cvv" is intentionally excluded: the agent may ask for CVV,
-                    # and Ravi must respond with "Yes, the CVV is 358." before ending.
                     agent_lower = agent_speech.lower()
-                    order_complete_phrases = [
-                        "transfer", "payment",
-                        "thank you for your order",
-                        "order has been placed", "has been placed",
-                        "placed successfully", "order is confirmed",
-                        "order confirmed", "successfully placed",
-                    ]
-                    if any(phrase in agent_lower for phrase in order_complete_phrases):
+                    if any(phrase in agent_lower for phrase in ORDER_COMPLETE_PHRASES):
                         print("\n✅ Agent initiated payment transfer. Ending conversation.")
+                        events.emit("classifier", turn=turn, kind="order_complete", text=agent_speech)
                         speak_sync("Thank you.")
-                        log_f.write("Ravi: Thank you.\n")
+                        log_utterance(ROLE_CUSTOMER, "Thank you.")
+                        end_reason = "order_complete"
                         break
 
-                    # Track items the agent has explicitly said are unavailable.
-                    # The full agent sentence is stored so specific sizes/items
-                    # can be injected verbatim into the constraint block.
-                    rejection_phrases = [
-                        "don't have", "do not have", "we don't", "we do not",
-                        "not available", "unfortunately", "i'm sorry, we",
-                        "sorry, we don't", "sorry, we do not", "i'm sorry,",
-                        "can't add", "cannot add",
-                    ]
-                    if any(p in agent_lower for p in rejection_phrases):
-                        if agent_speech.strip() not in rejected_items:
-                            rejected_items.append(agent_speech.strip())
-                            print(f"   📋 Rejection noted: \"{agent_speech.strip()}\"")
-
-                    # Track when the agent confirms an action is already done.
-                    # e.g. "I've already updated your order", "You already have wings"
-                    confirmation_phrases = [
-                        "i've already", "i have already", "already updated",
-                        "already added", "already removed", "already swapped",
-                        "already changed", "already included", "already have the",
-                        "you already have", "i've updated your order",
-                        "i've added", "i've removed", "i've swapped",
-                    ]
-                    if any(p in agent_lower for p in confirmation_phrases):
-                        if agent_speech.strip() not in confirmed_updates:
-                            confirmed_updates.append(agent_speech.strip())
-                            print(f"   ✅ Confirmation noted: \"{agent_speech.strip()}\"")
-
-                    # Track when the agent offers a list of options to choose from.
-                    # Detected when agent asks a question AND lists specific items
-                    # (e.g. "We have Pepsi, Diet Pepsi and Mountain Dew. Which would you like?")
-                    offer_trigger_phrases = [
-                        "we have", "you can choose", "you can pick",
-                        "would you like", "which would you", "what size",
-                        "what kind", "what flavor", "which size", "which flavor",
-                    ]
-                    if "?" in agent_speech and any(p in agent_lower for p in offer_trigger_phrases):
-                        last_offer = agent_speech.strip()
-                        print(f"   🍕 Offer noted: \"{last_offer}\"")
+                    for kind, value in state.observe_agent(agent_speech):
+                        if kind == "rejected_item":
+                            events.emit("rejected_item", turn=turn, item=value)
+                        elif kind == "confirmation":
+                            events.emit("confirmed_update", turn=turn, text=value)
+                        else:
+                            events.emit("classifier", turn=turn, kind=kind, text=value)
 
                     # 2. Get AI response.
-                    # CRITICAL constraints go FIRST in the prompt so the LLM
-                    # reads them before the conversation history. Placing them
-                    # after the history causes the model to ignore them because
-                    # it anchors on the prior dialogue context.
                     print("   🤖 Ravi is thinking...")
-                    prompt = ""
-                    has_rules = rejected_items or confirmed_updates or last_offer
-                    if has_rules:
-                        prompt += "RULES FOR THIS RESPONSE — read these BEFORE the conversation:\n"
-
-                    if rejected_items:
-                        prompt += (
-                            "The agent has confirmed these items are NOT AVAILABLE.\n"
-                            "You MUST NOT mention, request, or reference any of them again "
-                            "in any form (including size variants):\n"
-                        )
-                        for r in rejected_items:
-                            prompt += f"  ✗ {r}\n"
-                        prompt += "If the agent offered alternatives, pick one of those instead.\n"
-
-                    if confirmed_updates:
-                        prompt += (
-                            "The agent has ALREADY CONFIRMED these actions are done. "
-                            "Do NOT ask for them again, do NOT reference these items as missing or unresolved. "
-                            "Treat them as complete:\n"
-                        )
-                        for c in confirmed_updates:
-                            prompt += f"  ✓ {c}\n"
-                        if len(confirmed_updates) >= 2:
-                            prompt += (
-                                "WARNING: You have been repeating yourself. "
-                                "The agent has confirmed the same thing multiple times. "
-                                "Stop asking about it and move the conversation forward. "
-                                "If your order is complete, say so and wrap up the call.\n"
-                            )
-
-                    if last_offer:
-                        prompt += (
-                            f"The agent just asked you to choose. "
-                            f"You MUST pick a specific option from what they listed. "
-                            f"Do NOT give a vague answer like 'can we just get a drink'.\n"
-                            f"Agent's question/offer: \"{last_offer}\"\n"
-                        )
-
-                    if has_rules:
-                        prompt += "\n"
-
-                    prompt += "Conversation History:\n" + "\n".join(conversation_history)
-                    prompt += "\n\nYou are Ravi. Respond with ONLY your spoken words. What do you say next?"
-
-                    ravi_response = ollama.generate(prompt, system=ravi_persona)
+                    with timer.span("prompt_build"):
+                        prompt = state.build_prompt()
+                    if speculator:
+                        with timer.span("llm_total"):
+                            ravi_response = speculator.resolve(agent_speech, prompt)
+                    else:
+                        llm_start = time.monotonic()
+                        ravi_response, llm = ollama.generate_with_timing(prompt, system=ravi_persona)
+                        timer.add("llm_ttft", llm_start, llm["ttft"])
+                        timer.add("llm_total", llm_start, llm["total"])
 
                     # 3. Ravi (AI) speaks
                     print(f'   👤 Ravi (AI): "{ravi_response}"')
-                    speak_sync(ravi_response)
+                    speak_start = time.monotonic()
+                    timer.add_utterance(speak_start, speak_sync(ravi_response))
 
-                    ravi_line = f"Ravi: {ravi_response}"
-                    conversation_history.append(ravi_line)
-                    log_f.write(ravi_line + "\n")
-                    last_offer = None  # Ravi has responded — clear pending offer
+                    state.add_ravi_line(ravi_response)
+                    log_utterance(ROLE_CUSTOMER, ravi_response)
 
                     # 4. Check if Ravi is ending the conversation.
                     # CVV provided → order is done, no need to wait for agent's next turn.
                     end_phrases = ["goodbye", "thanks, bye"]
                     if "cvv" in ravi_response.lower():
                         print("\n✅ Ravi provided CVV. Order complete — ending conversation.")
+                        end_reason = "customer_cvv"
                         break
                     if any(phrase in ravi_response.lower() for phrase in end_phrases):
                         print("\n✅ Ravi has ended the conversation. Test complete.")
+                        end_reason = "customer_goodbye"
                         break
 
                 except sr.UnknownValueError:
+                    if archive and audio is not None:
+                        archive.add_audio_data("agent", turn, audio)  # keep it for offline re-transcription
                     print("   ⚠️  Could not understand audio. Please try again.")
-                    log_f.write("[Audio not understood]\n")
+                    log_notice("[Audio not understood]")
+                    timings.discard_turn()  # the turn is retried under the same number
                     continue
                 except sr.RequestError as e:
                     print(f"   Could not request results; {e}")
-                    log_f.write(f"[Request Error: {e}]\n")
+                    log_notice(f"[Request Error: {e}]")
+                    timings.discard_turn()  # the turn is retried under the same number
                     continue
 
                 turn += 1
@@ -306,13 +535,33 @@ def run_ai_customer_conversation(
 
     except KeyboardInterrupt:
         print("\n🛑 Session interrupted by user. Exiting.")
+        end_reason = "interrupted"
     except sr.WaitTimeoutError:
         print("\n\n[Timeout: No speech detected from phone]")
+        end_reason = "timeout"
     except Exception as e:
         print(f"\n\n[Error: {e}]")
+        end_reason = f"error: {e}"
         import traceback
         traceback.print_exc()
 
+    timings.save()
+    events.emit("run_end", reason=end_reason, turns=turn)
+    events.close()
+    timings.print_summary()
+    calibration.save()
+    if archive:
+        get_speech_service().voice_ai.remove_audio_listener(archive_ravi_audio)
+        archive.close()
+        print(f"🎙️ Archived {archive.clips} clips ({archive.bytes_written / 1024:.0f} KB): "
+              f"{archive.index_path}")
+    print_tts_stats()
+    if segmenter:
+        segmenter.print_stats()
+    if speculator:
+        speculator.print_stats()
+        speculator.shutdown()
+        transcriber.shutdown()
     print(f"\n✅ Conversation saved to: {log_file}")
     return str(log_file)
 
@@ -330,14 +579,60 @@ def find_microphone_index(mic_name):
     return None  # Use default
 
 
+def _index_run(log_file, **fields):
+    """
+    Record a finished run in the run index and refresh the dashboard (never fails the test).
+
+    Returns:
+        the run's index row, or None if the index could not be updated
+    """
+    try:
+        from src.run_index import get_run_index
+
+        row = get_run_index().record_from_log(log_file, **fields)
+    except Exception as e:
+        print(f"⚠️  Could not update run index: {e}")
+        return None
+    try:
+        from src.dashboard import generate_dashboard
+
+        generate_dashboard()
+    except Exception as e:
+        print(f"⚠️  Dashboard update failed: {e}")
+    return row
+
+
+def _emit_results(**kwargs):
+    """Write the run's JSON and JUnit results (never fails the test)"""
+    try:
+        from src.results_emitter import write_run_results
+
+        json_path, junit_path = write_run_results(**kwargs)
+        print(f"🧾 Results: {json_path}, {junit_path}")
+    except Exception as e:
+        print(f"⚠️  Results export failed: {e}")
+
+
 def run_full_flow(args):
     """
     Full flow: Launch app → AI customer conversation → verify cart
     """
+    from launch_and_invoke_voice import (
+        launch_app,
+        open_voice_order_screen,
+        click_arrow_on_ready_screen,
+        verify_voice_agent_active,
+        get_voice_session_id,
+    )
+    from verify_order import verify_order
+
     driver = None
     phase_statuses = {"navigation": "skipped", "conversation": "skipped", "verification": "skipped"}
     start_time = datetime.now()
     log_file = None
+    report_path = None
+    session_id = None
+    navigation = None
     results = {
         "passed": False, "score": 0,
         "matched_items": [], "missing_items": [], "extra_items": [],
@@ -371,14 +666,14 @@ def run_full_flow(args):
         print("PHASE 1: Navigate to Voice Agent")
         print("=" * 70)
 
-        driver = launch_app()
-        element = scroll_to_start_voice_order(driver)
-        if not element:
+        driver = launch_app(activate=False)
+        navigation = open_voice_order_screen(driver)
+        if not navigation:
             print("❌ Could not find 'Start Voice Order' button")
             phase_statuses["navigation"] = "failed"
             return 1
+        print(f"🧭 Navigation: {navigation.describe()}")
 
-        click_start_voice_order(driver, element)
         click_arrow_on_ready_screen(driver)
         #grant_microphone_permission(driver)
 
@@ -403,7 +698,8 @@ def run_full_flow(args):
         # Run AI customer conversation
         try:
             log_file = run_ai_customer_conversation(
-                persona_name=args.persona, scenario=args.scenario, mic_name=args.mic
+                persona_name=args.persona, scenario=args.scenario, mic_name=args.mic,
+                session_id=session_id,
             )
         except Exception as e:
             print(f"\n❌ AI customer conversation failed: {e}")
@@ -440,15 +736,18 @@ def run_full_flow(args):
         # Generate HTML report
         try:
             from src.report_generator import generate_html_report
+            driver.flush_screenshots()  # the report reads the screenshot files
             report_path = generate_html_report(
                 results=results,
                 log_file=log_file,
                 show_images=args.show_images,
+                image_mode=args.image_mode,
                 metadata={
                     "persona": args.persona,
                     "scenario": args.scenario,
                     "mic": args.mic,
                     "session_id": session_id,
+                    "navigation": navigation.to_dict(),
                     "start_time": start_time,
                     "end_time": datetime.now(),
                 },
@@ -468,9 +767,44 @@ def run_full_flow(args):
         return 1
 
     finally:
+        end_time = datetime.now()
+        index_row = None
+        if log_file:
+            index_row = _index_run(
+                log_file,
+                persona=args.persona,
+                scenario=args.scenario,
+                session_id=session_id,
+                started_at=start_time,
+                ended_at=end_time,
+                passed=results["passed"] if phase_statuses["verification"] != "skipped" else None,
+                score=results["score"] if phase_statuses["verification"] != "skipped" else None,
+                phase_navigation=phase_statuses["navigation"],
+                phase_conversation=phase_statuses["conversation"],
+                phase_verification=phase_statuses["verification"],
+                report_file=report_path,
+                **(navigation.index_fields() if navigation else {}),
+            )
+        _emit_results(
+            run_id=Path(log_file).stem if log_file else f"test_run_{start_time:%Y%m%d_%H%M%S}",
+            results=results,
+            phase_statuses=phase_statuses,
+            metadata={
+                "persona": args.persona,
+                "scenario": args.scenario,
+                "session_id": session_id,
+                "navigation": navigation.to_dict() if navigation else None,
+                "start_time": start_time,
+                "end_time": end_time,
+            },
+            log_file=log_file,
+            report_path=report_path,
+            index_row=index_row,
+        )
         if driver:
-            input("\n👉 Press ENTER to close app and exit...")
-            driver.stop()
+            if getattr(args, "interactive", True):
+                input("\n👉 Press ENTER to close app and exit...")
+            driver.release()
 
 
 def run_verify_only(args):
@@ -483,9 +817,10 @@ def run_verify_only(args):
         print("\nAssuming app is already open with cart visible...")
 
         from src.appium_driver import AppiumDriver
+        from verify_order import verify_order
 
         driver = AppiumDriver("config/appium_config.yaml")
-        driver.start()
+        driver.lease(reset_app=False)  # the order screen must stay as it is
 
         log_file = args.log if args.log else None
         results = verify_order(driver, expected_items=args.items, log_file=log_file)
@@ -504,7 +839,34 @@ def run_verify_only(args):
 
     finally:
         if driver:
-            driver.stop()
+            driver.release()
+
+
+def run_replay(args):
+    """
+    Conversation loop against recorded agent audio — no phone or Appium.
+    """
+    from src.audio_replay import ReplaySource
+
+    replay = ReplaySource.from_path(args.replay, speed=args.replay_speed)
+    print(f"🔁 Replaying {len(replay.utterances)} recorded agent utterances "
+          f"({'unpaced' if not args.replay_speed else f'{args.replay_speed:g}x'})")
+    start_time = datetime.now()
+    log_file = run_ai_customer_conversation(
+        persona_name=args.persona, scenario=args.scenario, replay=replay
+    )
+    if log_file:
+        _index_run(
+            log_file,
+            persona=args.persona,
+            scenario=args.scenario,
+            started_at=start_time,
+            ended_at=datetime.now(),
+            phase_navigation="skipped",
+            phase_conversation="passed",
+            phase_verification="skipped",
+        )
+    return 0 if log_file else 1
 
 
 def main():
@@ -528,6 +890,9 @@ Examples:
   # Verify with expected items
   python end_to_end_voice_test.py --verify-only --items "Large pepperoni" "Garlic knots"
 
+  # Conversation against recorded agent audio (WAV + .txt per utterance), 4x speed
+  python end_to_end_voice_test.py --replay recordings/run_01 --replay-speed 4
+
 Audio Setup (Physical):
   Position phone near computer speakers so phone mic captures Ravi's voice.
   Position computer mic near phone speaker to capture app voice agent.
@@ -545,6 +910,12 @@ Audio Setup (Physical):
         action="store_true",
         help="Only verify cart (assumes app already open)",
     )
+    group.add_argument(
+        "--replay",
+        type=str,
+        metavar="PATH",
+        help="Run the conversation on recorded agent audio (directory or JSONL manifest)",
+    )
 
     parser.add_argument(
         "--persona", type=str, help="AI customer persona name (from personas/ dir)"
@@ -562,6 +933,12 @@ Audio Setup (Physical):
         "--log", type=str, help="Conversation log file for verification"
     )
     parser.add_argument("--items", nargs="+", help="Expected items to verify")
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Replay pacing: 1 = real time, 4 = 4x faster, 0 = no pacing",
+    )
 
     img_group = parser.add_mutually_exclusive_group()
     img_group.add_argument(
@@ -569,7 +946,7 @@ Audio Setup (Physical):
         dest="show_images",
         action="store_true",
         default=True,
-        help="Embed screenshots in HTML report (default: on)",
+        help="Include screenshots in HTML report (default: on)",
     )
     img_group.add_argument(
         "--no-images",
@@ -577,11 +954,20 @@ Audio Setup (Physical):
         action="store_false",
         help="Omit screenshots from HTML report",
     )
+    parser.add_argument(
+        "--image-mode",
+        choices=["linked", "embed"],
+        default="linked",
+        help="linked: thumbnails linking to shared originals in reports/assets/ (default); "
+             "embed: full-size base64 images in a self-contained report",
+    )
 
     args = parser.parse_args()
 
     if args.full:
         return run_full_flow(args)
+    elif args.replay:
+        return run_replay(args)
     else:
         return run_verify_only(args)
 
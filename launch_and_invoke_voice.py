@@ -10,19 +10,32 @@ Step 6: Verify voice agent is active (keywords: 'welcome to papa johns')
 """
 
 from appium.webdriver.common.appiumby import AppiumBy
+from src.app_checkpoint import restore_for_run, restore_planned
 from src.appium_driver import AppiumDriver
+from src.fast_path import NavigationTiming, fast_path_configured, navigation_timing, try_fast_path
 import subprocess
 import time
+from typing import Optional
 
 
-def launch_app() -> AppiumDriver:
+def launch_app(activate: bool = True) -> AppiumDriver:
     print(f"\n{'='*50}")
     print("Step 1: Launch Application")
     print(f"{'='*50}")
 
     driver = AppiumDriver("config/appium_config.yaml")
-    driver.start()
+    restoring = restore_planned(driver.config)
+    # Warm session from the previous run when appium.reuse_session is on; a restore
+    # force-stops the app anyway, so the lease only resets it when there is none
+    driver.lease(reset_app=not restoring)
+    if restoring and restore_for_run(driver.config) is None:  # logged-in app data
+        driver.reset_app_state()  # restore refused — reset the app as lease() would have
+    if activate:
+        activate_app(driver)
+    return driver
+
 
+def activate_app(driver: AppiumDriver):
     # Explicitly launch the app (in case it's closed)
     app_package = driver.config['capabilities']['appPackage']
     print(f"  Launching {app_package}...")
@@ -35,8 +48,6 @@ def launch_app() -> AppiumDriver:
     driver.take_screenshot("step1_app_launched")
     print("  Screenshot saved: step1_app_launched")
 
-    return driver
-
 
 def scroll_to_start_voice_order(driver: AppiumDriver):
     print(f"\n{'='*50}")
@@ -79,6 +90,40 @@ def click_start_voice_order(driver: AppiumDriver, element):
     print("  Screenshot saved: step3_voice_agent_launched")
 
 
+def open_voice_order_screen(driver: AppiumDriver) -> Optional[NavigationTiming]:
+    """
+    Steps 1-3: reach the 'Pizza Assistant is Ready' screen, through the
+    deep link / activity fast path when the build supports it (see
+    src/fast_path.py), else by launching the app and tapping through it.
+
+    Args:
+        driver: AppiumDriver from launch_app(activate=False)
+
+    Returns:
+        NavigationTiming, or None if 'Start Voice Order' could not be found
+    """
+    started = time.monotonic()
+    path = try_fast_path(driver)
+    if path:
+        print(f"  ✅ Voice ordering screen opened via {path}")
+        driver.take_screenshot("step3_voice_agent_launched")
+        return navigation_timing(path, time.monotonic() - started)
+
+    tried = fast_path_configured(driver.config)
+    if tried:
+        driver.reset_app_state()  # the fast path may have left the app on another screen
+    ui_started = time.monotonic()
+    activate_app(driver)
+    element = scroll_to_start_voice_order(driver)
+    if not element:
+        return None
+    click_start_voice_order(driver, element)
+    return navigation_timing(
+        None, time.monotonic() - ui_started,
+        fallback_reason="fast path failed" if tried else "fast path not configured",
+    )
+
+
 def click_arrow_on_ready_screen(driver: AppiumDriver):
     print(f"\n{'='*50}")
     print("Step 4: Click arrow on 'Pizza Assistant is Ready' screen")
@@ -146,45 +191,22 @@ def get_voice_session_id(driver: AppiumDriver) -> str:
     print("Step 7: Capture Voice Session ID (# button)")
     print(f"{'='*50}")
 
-    # ── Dump every visible text / content-desc for diagnosis ──────
-    print("  Scanning all visible elements on screen:")
-    driver.driver.implicitly_wait(0)
+    # One page_source fetch: dump the screen for diagnosis and locate '#' in it
     try:
-        all_els = driver.driver.find_elements(AppiumBy.XPATH, "//*")
-        for el in all_els:
-            txt  = el.get_attribute("text") or ""
-            desc = el.get_attribute("content-desc") or ""
-            cls  = el.get_attribute("class") or ""
-            if txt.strip() or desc.strip():
-                print(f"    class={cls!r}  text={txt!r}  content-desc={desc!r}")
+        snapshot = driver.dump_hierarchy("voice_session", print_limit=0)
     except Exception as e:
         print(f"    (dump failed: {e})")
-    finally:
-        driver.driver.implicitly_wait(10)
-
-    locators = [
-        (AppiumBy.XPATH, "//*[@text='#']"),
-        (AppiumBy.XPATH, "//*[@content-desc='#']"),
-        (AppiumBy.XPATH, "//*[contains(@text,'#')]"),
-        (AppiumBy.XPATH, "//*[contains(@content-desc,'#')]"),
-    ]
+        return ""
 
-    driver.driver.implicitly_wait(0)
-    element = None
-    try:
-        for by, value in locators:
-            elements = driver.driver.find_elements(by, value)
-            if elements:
-                element = elements[0]
-                print(f"  Found '#' button via {value}")
-                print(f"    text={element.get_attribute('text')!r}  "
-                      f"content-desc={element.get_attribute('content-desc')!r}")
-                break
-    finally:
-        driver.driver.implicitly_wait(10)
+    node = None
+    for pattern in ("=#", "#"):  # exact text/content-desc first, then contains
+        node = snapshot.find(pattern)
+        if node:
+            print(f"  Found '#' button: {node.summary()}")
+            break
 
-    if not element:
-        print("  ⚠️  '#' debug button not found — check element dump above for the right locator")
+    if not node or not node.center:
+        print("  ⚠️  '#' debug button not found — check the UI dump file for the right locator")
         return ""
 
     try:
@@ -192,7 +214,7 @@ def get_voice_session_id(driver: AppiumDriver) -> str:
         before = _read_clipboard(driver)
         print(f"  Clipboard before click: {before!r}")
 
-        element.click()
+        driver.driver.execute_script("mobile: clickGesture", {"x": node.center[0], "y": node.center[1]})
         time.sleep(1.5)  # give the app a moment to write to clipboard
 
         session_id = _read_clipboard(driver)
@@ -315,10 +337,10 @@ def verify_voice_agent_active(driver: AppiumDriver) -> bool:
 if __name__ == "__main__":
     driver = None
     try:
-        driver = launch_app()
-        element = scroll_to_start_voice_order(driver)
-        if element:
-            click_start_voice_order(driver, element)
+        driver = launch_app(activate=False)
+        navigation = open_voice_order_screen(driver)
+        if navigation:
+            print(f"  Navigation: {navigation.describe()}")
             click_arrow_on_ready_screen(driver)
             # grant_microphone_permission(driver)
             verify_voice_agent_active(driver)
@@ -327,4 +349,4 @@ if __name__ == "__main__":
         time.sleep(5)
     finally:
         if driver:
-            driver.stop()
+            driver.release()
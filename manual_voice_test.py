@@ -18,7 +18,6 @@ ribe your response, and Ravi will reply.
 
 import argparse
 import os
-import speech_recognition as sr
 import sys
 from datetime import datetime
 from src.ollama_client import OllamaClient
@@ -99,6 +98,8 @@ Output only the persona text, matching the structure of the example above."""
 
 def select_microphone():
     """Lists available microphones and prompts the user to select one."""
+    import speech_recognition as sr
+
     mics = sr.Microphone.list_microphone_names()
     if not mics:
         print("❌ No microphones found. Please ensure a microphone is connected.")
@@ -180,6 +181,8 @@ def main():
     log_filepath = os.path.join(logs_dir, log_filename)
     print(f"📝 Saving conversation log to: {log_filepath}")
 
+    import speech_recognition as sr
+
     mic_index = None
     try:
         # Try to find and set the default microphone
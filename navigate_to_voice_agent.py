@@ -4,7 +4,17 @@ Complete Navigation to Voice Agent - Refactored
 Navigates through all setup steps to voice agent ready state with improved structure
 """
 from appium.webdriver.common.appiumby import AppiumBy
+from src.app_checkpoint import capture_after_setup, capture_enabled, restore_for_run
 from src.appium_driver import AppiumDriver
+from src.screen_classifier import (
+    SETUP_SCREENS,
+    TARGET_SCREEN,
+    UNKNOWN_SCREEN,
+    classify,
+    next_transition,
+    plan,
+)
+from src.ui_hierarchy import UiSnapshot
 from selenium.webdriver.common.keys import Keys
 import time
 from typing import Optional, Tuple, List
@@ -46,6 +56,15 @@ class NavigationConfig:
     login_timeout: int = 10
     post_login_wait: int = 8
 
+    # Screen-classifier navigation (falls back to the fixed step lists)
+    use_screen_classifier: bool = True
+    screen_change_timeout: float = 8.0
+    screen_poll_interval: float = 0.5
+    max_screen_steps: int = 20
+
+    # Restore the logged-in app data before navigating / save it after a full setup
+    use_checkpoint: bool = True
+
 
 class ElementLocator:
     """Centralized element locators for better maintainability"""
@@ -129,6 +148,7 @@ class VoiceAgentNavigator:
         self.driver: Optional[AppiumDriver] = None
         self.current_step: Optional[NavigationStep] = None
         self.is_fresh_install: Optional[bool] = None
+        self.screen_steps_taken = 0  # transitions navigate_by_screen() has acted on
 
     def _print_step(self, step: NavigationStep, message: str = ""):
         """Print formatted step information"""
@@ -178,19 +198,9 @@ class VoiceAgentNavigator:
         return False
 
     def _show_debug_info(self):
-        """Show debug information about current screen"""
-        visible_texts = self.driver.get_visible_text_elements()
-        self._print_info(f"Visible texts: {visible_texts}")
-
-        clickable = self.driver.driver.find_elements(
-            AppiumBy.XPATH, "//*[@clickable='true']"
-        )
-        self._print_info(f"Clickable elements ({len(clickable)}):")
-        for i, elem in enumerate(clickable[:20], 1):
-            text = elem.get_attribute("text") or ""
-            desc = elem.get_attribute("content-desc") or ""
-            resource_id = elem.get_attribute("resource-id") or ""
-            print(f"      [{i}] Text: '{text}', Desc: '{desc}', ID: '{resource_id}'")
+        """Show debug information about current screen (one page_source fetch)"""
+        snapshot = self.driver.dump_hierarchy("debug", clickable_only=True, print_limit=20)
+        self._print_info(f"Visible texts: {snapshot.texts()}")
 
     def scroll_down(self):
         """Scroll down one screen to reveal off-screen elements"""
@@ -215,13 +225,99 @@ class VoiceAgentNavigator:
             self._print_info("Starting app...", "🚀")
             self.driver = AppiumDriver("config/appium_config.yaml")
             self.driver.start()
-            time.sleep(3)
+            if self.config.use_checkpoint and restore_for_run(self.driver.config) is not None:
+                self.driver.driver.activate_app(self.driver.config["capabilities"]["appPackage"])
+            if not self.config.use_screen_classifier:  # the classifier waits for a known screen
+                time.sleep(3)
             self._print_success("App launched")
             return True
         except Exception as e:
             self._print_error(f"Failed to start app: {e}")
             return False
 
+    def _snapshot(self) -> UiSnapshot:
+        """One page_source dump of the current screen"""
+        return UiSnapshot.capture(self.driver)
+
+    def _wait_for_screen(self, previous: Optional[str] = None) -> Tuple[str, UiSnapshot]:
+        """
+        Poll snapshots until the screen is classified and (if `previous` is
+        given) its fingerprint differs from that one.
+
+        Returns:
+            (screen, snapshot) — screen is UNKNOWN_SCREEN on timeout
+        """
+        deadline = time.monotonic() + self.config.screen_change_timeout
+        while True:
+            snapshot = self._snapshot()
+            screen = classify(snapshot)
+            changed = previous is None or snapshot.fingerprint != previous
+            if (changed and screen != UNKNOWN_SCREEN) or time.monotonic() >= deadline:
+                return (screen if changed else UNKNOWN_SCREEN), snapshot
+            time.sleep(self.config.screen_poll_interval)
+
+    def _tap_node(self, snapshot: UiSnapshot, pattern: str) -> bool:
+        """Tap the centre of the first node in the snapshot matching `pattern`"""
+        node = snapshot.find(pattern)
+        if not node or not node.center:
+            self._print_error(f"No element matching '{pattern}' on screen")
+            return False
+        x, y = node.center
+        self._print_info(f"Tapping '{(node.desc or node.text)[:50]}' at ({x}, {y})", "👆")
+        self.driver.driver.execute_script("mobile: clickGesture", {"x": x, "y": y})
+        return True
+
+    def navigate_by_screen(self) -> bool:
+        """
+        Drive the app to the voice agent with the screen classifier: classify
+        one snapshot, take the first step of the shortest path from that
+        screen, wait for the screen to change, repeat.
+
+        Returns:
+            True on the voice agent screen; False if a screen could not be
+            recognised or an action failed (the caller falls back to the
+            fixed step lists; screen_steps_taken tells it how far this got)
+        """
+        screen, snapshot = self._wait_for_screen()
+        if screen == UNKNOWN_SCREEN:  # e.g. Start Voice Order below the fold
+            self.scroll_down()
+            screen, snapshot = self._wait_for_screen()
+        if self.is_fresh_install is None:
+            self.is_fresh_install = screen in SETUP_SCREENS
+        route = " → ".join(t.action for t in plan(screen)) or "none"
+        self._print_info(f"Screen: {screen} — route: {route}", "🧭")
+
+        for _ in range(self.config.max_screen_steps):
+            if screen == TARGET_SCREEN:
+                self._print_success("Voice agent screen reached")
+                return True
+            transition = next_transition(screen)
+            if transition is None:
+                self._print_warning(f"No known route from screen '{screen}'")
+                self._print_info(f"Visible texts: {snapshot.texts()[:20]}")
+                return False
+
+            print(f"\n{'='*60}")
+            print(f"{screen} → {transition.action} ({len(plan(screen))} step(s) left)")
+            print(f"{'='*60}")
+            self.screen_steps_taken += 1
+            if transition.tap:
+                if not self._tap_node(snapshot, transition.tap):
+                    return False
+            elif not getattr(self, transition.action)():
+                self._print_error(f"Navigation failed at: {transition.action}")
+                return False
+
+            previous = snapshot.fingerprint
+            screen, snapshot = self._wait_for_screen(previous)
+            if screen == UNKNOWN_SCREEN:
+                self.scroll_down()
+                screen, snapshot = self._wait_for_screen()
+            self._print_info(f"Now on: {screen}", "📍")
+
+        self._print_error(f"Gave up after {self.config.max_screen_steps} screens")
+        return False
+
     def detect_app_state(self) -> str:
         """
         Detect whether app is freshly installed or already configured
@@ -229,8 +325,22 @@ class VoiceAgentNavigator:
         Returns:
             'fresh_install' - QA environment selection visible (needs full setup)
             'already_configured' - Skip to order screen (user already logged in)
+            'home_screen' - Carryout banner visible (tap it to reach the order screen)
         """
         self._print_info("Detecting app state...", "🔍")
+        if self.config.use_screen_classifier:
+            screen, _ = self._wait_for_screen()
+            if screen != UNKNOWN_SCREEN:
+                self._print_info(f"Screen classified as '{screen}'", "🔍")
+                self.is_fresh_install = screen in SETUP_SCREENS
+                if self.is_fresh_install:
+                    return "fresh_install"
+                return "home_screen" if screen == "home" else "already_configured"
+            self._print_info("Screen not recognised - probing elements", "🔍")
+        return self._probe_app_state()
+
+    def _probe_app_state(self) -> str:
+        """detect_app_state() by probing for elements one locator at a time"""
         time.sleep(2)  # Wait for screen to stabilize
 
         # Check for QA environment button (indicates fresh install)
@@ -565,8 +675,19 @@ class VoiceAgentNavigator:
             if not self.start_app():
                 return False
 
-            # Detect app state by checking for QA button
+            if self.config.use_screen_classifier:
+                if self.navigate_by_screen():
+                    if not self.verify_voice_agent() or not self._save_checkpoint():
+                        return False
+                    self._print_completion()
+                    return True
+                self._print_warning("Screen-classifier navigation failed - using fixed step lists")
+
             app_state = self.detect_app_state()
+            if app_state == "fresh_install" and self.screen_steps_taken:
+                # The full setup list starts at QA environment selection, which is behind us
+                self._print_error("Setup stopped part-way through - restart the app to run the full setup flow")
+                return False
 
             if app_state == "fresh_install":
                 # Full setup flow for fresh install (QA button present)
@@ -620,6 +741,8 @@ class VoiceAgentNavigator:
                         self._print_error(f"Navigation failed at: {step_func.__name__}")
                         return False
 
+            if not self._save_checkpoint():
+                return False
             self._print_completion()
             return True
 
@@ -630,6 +753,23 @@ class VoiceAgentNavigator:
             traceback.print_exc()
             return False
 
+    def _save_checkpoint(self) -> bool:
+        """
+        After a full setup, save the configured app data for the next runs.
+
+        The capture stops the app (so nothing is saved mid-write) and starts
+        it again, so this drives back to the voice agent afterwards.
+
+        Returns:
+            False if the voice agent could not be reached again
+        """
+        if not (self.config.use_checkpoint and self.is_fresh_install and capture_enabled(self.driver.config)):
+            return True
+        capture_after_setup(self.driver.config)
+        self._print_info("App restarted for the checkpoint - returning to the voice agent", "♻️")
+        self.is_fresh_install = False  # setup is done; don't capture again
+        return self.navigate_by_screen() and self.verify_voice_agent()
+
     def _print_completion(self):
         """Print completion message"""
         print("\n" + "=" * 60)
@@ -0,0 +1,306 @@
+"""
+App data checkpoints - skip the setup flow on every run
+
+A fresh install needs QA environment selection, two Continue screens, login,
+the post-login and Samsung Pass dialogs, carryout and store selection before
+any ordering test can start. Once the app has been through that, its private
+data directory holds everything it needs to come back logged in and
+configured; a checkpoint is a tar of that directory taken over
+`adb exec-out run-as <package>` (the QA build is debuggable) with the app
+force-stopped, so no database is caught mid-write, and a restore
+streams it back with `adb exec-in` after force-stopping the app — a local
+stand-in for `adb backup`/`adb restore`, which recent Android versions no
+longer honour.
+
+Checkpoints live in artifacts/checkpoints/<serial>/<package>/<name>.tar with a
+.json sidecar recording the app version and install time; a checkpoint taken
+before the app was reinstalled or updated is refused (its keystore-backed
+secrets would not decrypt any more), and the next full setup captures a new one.
+
+Usage:
+    python -m src.app_checkpoint capture [--name configured]
+    python -m src.app_checkpoint restore [--name configured]
+    python -m src.app_checkpoint info
+"""
+import json
+import os
+import re
+import subprocess
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import yaml
+
+DEFAULT_CHECKPOINT_DIR = "artifacts/checkpoints"
+DEFAULT_NAME = "configured"
+
+# Regenerated by the app/OS; never worth saving or restoring
+_SKIP_DIRS = {"cache", "code_cache", "lib"}
+
+
+class CheckpointError(Exception):
+    """adb/run-as failure or a checkpoint that does not match the installed app"""
+
+
+class CheckpointRestoreFailed(CheckpointError):
+    """A restore failed after the app's data was cleared — the app is now a fresh install"""
+
+
+class AppCheckpoint:
+    """Capture and restore the private data of one app on one device"""
+
+    def __init__(self, package: str, serial: Optional[str] = None, checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR):
+        """
+        Args:
+            package:        application ID, e.g. com.papajohns.android.debug.qa
+            serial:         adb serial (None = the only connected device)
+            checkpoint_dir: root directory for checkpoint files
+        """
+        self.package = package
+        self.serial = serial
+        self.dir = os.path.join(checkpoint_dir, serial or "default", package)
+
+    @classmethod
+    def from_config(cls, config: dict) -> "AppCheckpoint":
+        """Checkpoint for the app and device in an appium_config.yaml dict"""
+        caps = config.get("capabilities") or {}
+        options = config.get("checkpoint") or {}
+        return cls(caps["appPackage"], caps.get("udid"), options.get("dir", DEFAULT_CHECKPOINT_DIR))
+
+    @classmethod
+    def from_config_file(cls, config_path: str = "config/appium_config.yaml") -> "AppCheckpoint":
+        with open(config_path, "r") as f:
+            return cls.from_config(yaml.safe_load(f) or {})
+
+    # ── adb ───────────────────────────────────────────────────────
+
+    def _adb(self, *args, timeout: float = 60, **kwargs) -> subprocess.CompletedProcess:
+        cmd = ["adb"] + (["-s", self.serial] if self.serial else []) + list(args)
+        try:
+            return subprocess.run(cmd, timeout=timeout, **kwargs)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise CheckpointError(f"{' '.join(cmd[:6])}: {e}") from e
+
+    def _run_as(self, *args, timeout: float = 30) -> str:
+        proc = self._adb("shell", "run-as", self.package, *args, timeout=timeout,
+                         capture_output=True, text=True)
+        if proc.returncode != 0 or "run-as:" in proc.stderr + proc.stdout:
+            raise CheckpointError(f"run-as {self.package} {' '.join(args)}: "
+                                  f"{(proc.stderr or proc.stdout).strip()}")
+        return proc.stdout
+
+    def _data_dirs(self) -> List[str]:
+        return sorted(d for d in self._run_as("ls").split() if d not in _SKIP_DIRS)
+
+    def installed_version(self) -> dict:
+        """versionName/versionCode/firstInstallTime/lastUpdateTime of the installed app"""
+        proc = self._adb("shell", "dumpsys", "package", self.package, capture_output=True, text=True, timeout=30)
+        info = {}
+        for key in ("versionName", "versionCode", "firstInstallTime", "lastUpdateTime"):
+            m = re.search(rf"{key}=(\S+(?: \d\d:\d\d:\d\d)?)", proc.stdout or "")  # times have a space
+            if m:
+                info[key] = m.group(1)
+        return info
+
+    # ── Files ─────────────────────────────────────────────────────
+
+    def path_for(self, name: str = DEFAULT_NAME) -> str:
+        return os.path.join(self.dir, f"{name}.tar")
+
+    def info(self, name: str = DEFAULT_NAME) -> Optional[dict]:
+        """The checkpoint's sidecar metadata, or None if there is no checkpoint"""
+        try:
+            with open(self.path_for(name) + ".json", "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def exists(self, name: str = DEFAULT_NAME) -> bool:
+        return os.path.isfile(self.path_for(name)) and self.info(name) is not None
+
+    # ── Capture / restore ─────────────────────────────────────────
+
+    def force_stop(self):
+        self._adb("shell", "am", "force-stop", self.package, capture_output=True, timeout=15)
+
+    def launch(self):
+        """Start the app's launcher activity"""
+        self._adb("shell", "monkey", "-p", self.package, "-c", "android.intent.category.LAUNCHER", "1",
+                  capture_output=True, timeout=15)
+
+    def capture(self, name: str = DEFAULT_NAME, relaunch: bool = True) -> dict:
+        """
+        Save the app's data directory (everything but caches) as a checkpoint.
+
+        The app is force-stopped first so no SQLite database, WAL file or
+        shared_prefs is captured mid-write.
+
+        Args:
+            relaunch: start the app again afterwards (on its launch screen)
+
+        Returns:
+            the checkpoint metadata
+        """
+        started = time.monotonic()
+        dirs = self._data_dirs()
+        if not dirs:
+            raise CheckpointError(f"{self.package} has no data to checkpoint")
+        os.makedirs(self.dir, exist_ok=True)
+        path = self.path_for(name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        self.force_stop()
+        try:
+            with open(tmp, "wb") as out:
+                proc = self._adb("exec-out", "run-as", self.package, "tar", "-cf", "-", *dirs,
+                                 stdout=out, stderr=subprocess.PIPE, timeout=120)
+        finally:
+            if relaunch:
+                self.launch()
+        if proc.returncode != 0 or os.path.getsize(tmp) == 0:
+            os.remove(tmp)
+            raise CheckpointError(f"tar of {self.package} failed: {proc.stderr.decode(errors='replace').strip()}")
+        os.replace(tmp, path)
+        meta = {
+            "package": self.package,
+            "serial": self.serial,
+            "name": name,
+            "dirs": dirs,
+            "bytes": os.path.getsize(path),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "app": self.installed_version(),
+        }
+        with open(path + ".json", "w") as f:
+            json.dump(meta, f, indent=2)
+        print(f"💾 Checkpoint '{name}' saved: {meta['bytes'] / 1024:.0f} KB "
+              f"({', '.join(dirs)}) in {time.monotonic() - started:.1f}s")
+        return meta
+
+    def restore(self, name: str = DEFAULT_NAME) -> float:
+        """
+        Force-stop the app and replace its data with the checkpoint.
+
+        Returns:
+            seconds taken
+
+        Raises:
+            CheckpointError: no checkpoint, a different app install, or adb failed
+                             before anything was changed
+            CheckpointRestoreFailed: the app's data was cleared but could not
+                                     be restored
+        """
+        started = time.monotonic()
+        meta = self.info(name)
+        if not meta or not os.path.isfile(self.path_for(name)):
+            raise CheckpointError(f"No checkpoint '{name}' in {self.dir}")
+        installed = self.installed_version()
+        saved = meta.get("app") or {}
+        changed = [k for k in ("versionCode", "firstInstallTime", "lastUpdateTime")
+                   if saved.get(k) and installed.get(k) and saved[k] != installed[k]]
+        if changed:
+            raise CheckpointError(f"Checkpoint '{name}' is from another install of {self.package} "
+                                  f"({', '.join(changed)} changed) — capture a new one")
+
+        self.force_stop()
+        # Everything there now, not just what was captured: later data must not survive
+        stale = sorted(set(self._data_dirs()) | set(meta["dirs"]))
+        try:
+            self._run_as("rm", "-rf", *stale)
+            with open(self.path_for(name), "rb") as data:
+                proc = self._adb("exec-in", "run-as", self.package, "tar", "-xf", "-",
+                                 stdin=data, capture_output=True, timeout=120)
+            if proc.returncode != 0:
+                raise CheckpointError(proc.stderr.decode(errors="replace").strip())
+        except CheckpointError as e:
+            raise CheckpointRestoreFailed(
+                f"Restoring {self.package} failed after its app data was cleared — "
+                f"the app is now a fresh install: {e}"
+            ) from e
+        seconds = time.monotonic() - started
+        print(f"♻️  Restored checkpoint '{name}' ({meta['created_at']}) in {seconds:.1f}s")
+        return seconds
+
+    def delete(self, name: str = DEFAULT_NAME):
+        for path in (self.path_for(name), self.path_for(name) + ".json"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def restore_planned(config: dict) -> bool:
+    """True if restore_for_run() will try a restore (enabled and a checkpoint exists)"""
+    options = config.get("checkpoint") or {}
+    return bool(options.get("restore_before_run", False)) and \
+        AppCheckpoint.from_config(config).exists(options.get("name", DEFAULT_NAME))
+
+
+def restore_for_run(config: dict) -> Optional[float]:
+    """
+    Restore the configured checkpoint before a run, if enabled and present
+    (the app is left force-stopped after a restore). A checkpoint that
+    cannot be used is skipped with a warning.
+
+    Returns:
+        seconds taken, or None if nothing was restored
+
+    Raises:
+        CheckpointRestoreFailed: the app's data was cleared but not restored;
+                                 the run cannot continue as planned
+    """
+    options = config.get("checkpoint") or {}
+    if not options.get("restore_before_run", False):
+        return None
+    name = options.get("name", DEFAULT_NAME)
+    if not restore_planned(config):
+        print(f"   ℹ️ No app checkpoint '{name}' yet — the setup flow will create one")
+        return None
+    try:
+        return AppCheckpoint.from_config(config).restore(name)
+    except CheckpointRestoreFailed:
+        raise
+    except CheckpointError as e:
+        print(f"   ⚠️ Checkpoint restore skipped: {e}")
+        return None
+
+
+def capture_enabled(config: dict) -> bool:
+    return bool((config.get("checkpoint") or {}).get("capture_after_setup", False))
+
+
+def capture_after_setup(config: dict) -> Optional[dict]:
+    """
+    Capture the configured checkpoint after a full setup flow, if enabled.
+    The capture restarts the app: it is back on its launch screen afterwards.
+    """
+    if not capture_enabled(config):
+        return None
+    options = config.get("checkpoint") or {}
+    try:
+        return AppCheckpoint.from_config(config).capture(options.get("name", DEFAULT_NAME))
+    except CheckpointError as e:
+        print(f"   ⚠️ Could not capture app checkpoint: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Capture or restore the app's data checkpoint")
+    parser.add_argument("command", choices=["capture", "restore", "info", "delete"])
+    parser.add_argument("--name", default=DEFAULT_NAME)
+    parser.add_argument("--config", default="config/appium_config.yaml")
+    args = parser.parse_args()
+
+    checkpoint = AppCheckpoint.from_config_file(args.config)
+    try:
+        if args.command == "capture":
+            checkpoint.capture(args.name)
+        elif args.command == "restore":
+            checkpoint.restore(args.name)
+        elif args.command == "delete":
+            checkpoint.delete(args.name)
+        else:
+            print(json.dumps(checkpoint.info(args.name), indent=2))
+    except CheckpointError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -1,14 +1,16 @@
 """
 Appium Driver Wrapper for Papa John's Voice Ordering App
+
+The Appium client and selenium are imported when a session starts, so
+importing this module (and the scripts built on it) stays cheap.
 """
-from appium import webdriver
-from appium.options.android import UiAutomator2Options
-from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import yaml
 import time
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from appium import webdriver
+    from selenium.webdriver.support.ui import WebDriverWait
 
 
 class AppiumDriver:
@@ -18,22 +20,39 @@ class AppiumDriver:
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)
         
-        self.driver: Optional[webdriver.Remote] = None
-        self.wait: Optional[WebDriverWait] = None
+        self.driver: Optional["webdriver.Remote"] = None
+        self.wait: Optional["WebDriverWait"] = None
+        self.startup_seconds: Optional[float] = None  # cold session start time
+        self._dump_dir: Optional[str] = None          # this run's UI dump directory
+        self._dumps = 0
     
     def start(self):
         """Initialize and start Appium driver"""
+        from appium import webdriver
+
         print("🚀 Starting Appium driver...")
-        
-        options = UiAutomator2Options()
-        for key, value in self.config['capabilities'].items():
-            options.set_capability(key, value)
-        
+        started = time.monotonic()
         self.driver = webdriver.Remote(
             self.config['appium']['server_url'],
-            options=options
+            options=self._options()
         )
+        self._after_connect()
+        self.startup_seconds = time.monotonic() - started
         
+        print(f"✅ Appium driver started successfully ({self.startup_seconds:.1f}s)")
+        return self
+
+    def _options(self):
+        from appium.options.android import UiAutomator2Options
+
+        options = UiAutomator2Options()
+        for key, value in self.config['capabilities'].items():
+            options.set_capability(key, value)
+        return options
+
+    def _after_connect(self):
+        from selenium.webdriver.support.ui import WebDriverWait
+
         # Set implicit wait
         timeout = self.config['timeouts']['implicit_wait']
         self.driver.implicitly_wait(timeout)
@@ -43,19 +62,89 @@ class AppiumDriver:
             self.driver,
             self.config['timeouts']['explicit_wait']
         )
-        
-        print("✅ Appium driver started successfully")
+
+    def attach(self, session_id: str):
+        """Connect to an existing session on the server instead of creating one"""
+        from appium import webdriver
+
+        class _AttachedRemote(webdriver.Remote):
+            def start_session(self, *args, **kwargs):
+                # Skip POST /session: reuse the server-side session as-is
+                self.session_id = session_id
+                self.caps = {}
+
+        self.driver = _AttachedRemote(self.config['appium']['server_url'], options=self._options())
+        self._after_connect()
         return self
+
+    # ── Session reuse (see src/session_broker.py) ─────────────────
+
+    @property
+    def reuse_session(self) -> bool:
+        return bool(self.config['appium'].get('reuse_session', False))
+
+    def lease(self, reset_app: bool = True):
+        """
+        Start a session for a run: a warm one from the session broker when
+        appium.reuse_session is on (health-checked), else a new one.
+
+        Args:
+            reset_app: restart the app on a reused session (off to inspect
+                       whatever screen the previous run left behind)
+        """
+        if self.reuse_session:
+            from src.session_broker import get_session_broker
+
+            if get_session_broker().lease(self, reset_app=reset_app):
+                return self
+        return self.start()
+
+    def release(self):
+        """End a run: return the session to the broker, or stop it when reuse is off or it is unhealthy"""
+        if not self.driver:
+            return
+        self.flush_screenshots()
+        if self.reuse_session and self.is_healthy():
+            from src.session_broker import get_session_broker
+
+            get_session_broker().give_back(self)
+            self.driver = None
+            return
+        self.stop()
+
+    def is_healthy(self) -> bool:
+        """True if the session answers commands (server and UiAutomator2 both alive)"""
+        try:
+            return bool(self.driver and self.driver.current_package)
+        except Exception:
+            return False
+
+    def reset_app_state(self):
+        """Restart the app under test so a reused session starts from its launch screen"""
+        app_package = self.config['capabilities']['appPackage']
+        try:
+            self.driver.terminate_app(app_package)
+        except Exception as e:
+            print(f"⚠️  Could not terminate {app_package}: {e}")
+        self.driver.activate_app(app_package)
     
     def stop(self):
         """Stop Appium driver"""
         if self.driver:
+            self.flush_screenshots()
             print("🛑 Stopping Appium driver...")
             self.driver.quit()
             self.driver = None
+            if self.reuse_session:
+                from src.session_broker import get_session_broker
+
+                get_session_broker().discard(self)
     
     def find_element_safe(self, by, value, timeout=10):
         """Find element with explicit wait and error handling"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
             wait = WebDriverWait(self.driver, timeout)
             element = wait.until(
@@ -74,6 +163,8 @@ class AppiumDriver:
     
     def get_visible_text_elements(self) -> List[str]:
         """Get all visible text elements on screen for AI validation"""
+        from appium.webdriver.common.appiumby import AppiumBy
+
         try:
             elements = self.driver.find_elements(AppiumBy.XPATH, "//*[@text]")
             texts = [elem.get_attribute('text') for elem in elements if elem.get_attribute('text')]
@@ -82,24 +173,107 @@ class AppiumDriver:
             return []
     
     def get_screen_state(self) -> dict:
-        """Get current screen state for validation"""
+        """Get current screen state for validation (the screenshot is fetched only if read)"""
+        from src.screenshot_service import LazyScreenshot
+
         return {
             "activity": self.driver.current_activity,
             "package": self.driver.current_package,
             "visible_texts": self.get_visible_text_elements(),
-            "screenshot": self.take_screenshot_base64()
+            "screenshot": LazyScreenshot(self),
         }
     
-    def take_screenshot(self, name: str):
-        """Take screenshot and save to file"""
+    def dump_hierarchy(self, label: str = "screen", clickable_only: bool = False, print_limit: int = 20):
+        """
+        Dump the current screen's elements from one page_source fetch.
+
+        The full dump goes to <test.ui_dump_dir>/<run start>/NN_<label>.json
+        (compact records: class, text, desc, id, clickable, bounds); only the
+        first `print_limit` lines are printed.
+
+        Args:
+            label:          name for the dump file and console header
+            clickable_only: list clickable elements only
+            print_limit:    elements printed to stdout (0 = none)
+
+        Returns:
+            UiSnapshot of the screen (for locating elements without more requests)
+        """
+        import json
+        import os
+        from datetime import datetime
+        from src.ui_hierarchy import UiSnapshot
+
+        snapshot = UiSnapshot.capture(self)
+        nodes = snapshot.labelled(clickable_only)
+        path = None
+        try:
+            if self._dump_dir is None:
+                root = self.config['test'].get('ui_dump_dir', 'logs/ui_dumps')
+                self._dump_dir = os.path.join(root, datetime.now().strftime("%Y%m%d_%H%M%S"))
+                os.makedirs(self._dump_dir, exist_ok=True)
+            self._dumps += 1
+            path = os.path.join(self._dump_dir, f"{self._dumps:02d}_{label}.json")
+            with open(path, "w") as f:
+                json.dump({
+                    "label": label,
+                    "captured_at": datetime.now().isoformat(timespec="seconds"),
+                    "elements": len(snapshot.nodes),
+                    "nodes": [n.to_dict() for n in (snapshot.nodes if not clickable_only else nodes)],
+                }, f, separators=(",", ":"))
+        except OSError as e:
+            print(f"⚠️  Could not write UI dump: {e}")
+
+        kind = "clickable" if clickable_only else "labelled"
+        print(f"🧾 UI dump '{label}': {len(nodes)} {kind} of {len(snapshot.nodes)} elements"
+              + (f" → {path}" if path else ""))
+        for i, node in enumerate(nodes[:print_limit], 1):
+            print(f"      [{i}] {node.summary()}")
+        if len(nodes) > print_limit > 0:
+            print(f"      ... {len(nodes) - print_limit} more in the dump file")
+        return snapshot
+
+    def take_screenshot(self, name: str, wait: bool = False):
+        """
+        Take screenshot and save to file.
+
+        The screen is captured before this returns. With
+        test.async_screenshots (the default) decoding and writing the PNG
+        are queued on the screenshot service; the file exists after
+        flush_screenshots().
+
+        Args:
+            name: file name (without .png) in test.screenshot_dir
+            wait: capture and write before returning
+
+        Returns:
+            path of the PNG
+        """
         screenshot_dir = self.config['test']['screenshot_dir']
         import os
         os.makedirs(screenshot_dir, exist_ok=True)
-        
+
         filepath = f"{screenshot_dir}/{name}.png"
-        self.driver.save_screenshot(filepath)
-        print(f"📸 Screenshot saved: {filepath}")
+        if wait or not self.config['test'].get('async_screenshots', True):
+            self.driver.save_screenshot(filepath)
+            print(f"📸 Screenshot saved: {filepath}")
+            return filepath
+
+        from src.screenshot_service import get_screenshot_service
+
+        get_screenshot_service().submit(self.driver.get_screenshot_as_base64(), filepath)
+        print(f"📸 Screenshot queued: {filepath}")
         return filepath
+
+    def flush_screenshots(self, timeout: float = 30) -> bool:
+        """Wait until queued screenshots are written (before reading them or ending the session)"""
+        import sys
+
+        if "src.screenshot_service" not in sys.modules:  # nothing was ever queued
+            return True
+        from src.screenshot_service import get_screenshot_service
+
+        return get_screenshot_service().flush(timeout)
     
     def take_screenshot_base64(self) -> str:
         """Get screenshot as base64 string"""
@@ -0,0 +1,143 @@
+"""
+Audio archive - per-run recording of every agent segment and Ravi utterance
+
+Enabled by `test.record_audio` in the config. Callers hand PCM to add(),
+which only enqueues it; a background writer thread encodes each clip
+(FLAC via soundfile, WAV if soundfile is unavailable) and appends a line
+to index.jsonl:
+
+    {"turn": 3, "role": "agent", "audio": "turn003_agent.flac",
+     "transcript": "...", "seconds": 4.2, "sample_rate": 16000, ...}
+
+The index doubles as a replay manifest (src/audio_replay.py), so a failing
+run can be re-transcribed or replayed through the loop offline.
+"""
+import json
+import os
+import queue
+import threading
+import time
+import wave
+from datetime import datetime
+from typing import Optional
+
+import yaml
+
+DEFAULT_CONFIG_PATH = "config/appium_config.yaml"
+SAMPLE_WIDTH = 2
+
+
+class AudioArchive:
+    """Background writer for one run's audio clips"""
+
+    def __init__(self, run_dir: str, fmt: str = "flac"):
+        """
+        Args:
+            run_dir: directory for this run's clips and index.jsonl
+            fmt:     "flac" (compressed, needs soundfile) or "wav"
+        """
+        self.run_dir = run_dir
+        os.makedirs(run_dir, exist_ok=True)
+        self.fmt = fmt
+        if fmt == "flac":
+            try:
+                import soundfile  # noqa: F401
+            except ImportError:
+                print("   ⚠️ soundfile not installed — archiving audio as WAV")
+                self.fmt = "wav"
+        self.index_path = os.path.join(run_dir, "index.jsonl")
+        self.clips = 0
+        self.bytes_written = 0
+        self._counts = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="audio-archive", daemon=True)
+        self._thread.start()
+
+    # ── Producer side (hot path: enqueue only) ────────────────────
+
+    def add(
+        self,
+        role: str,
+        turn: int,
+        pcm: bytes,
+        sample_rate: int,
+        channels: int = 1,
+        transcript: Optional[str] = None,
+    ):
+        """Queue a 16-bit PCM clip for writing"""
+        self._queue.put((role, turn, pcm, sample_rate, channels, transcript, time.time()))
+
+    def add_audio_data(self, role: str, turn: int, audio, transcript: Optional[str] = None):
+        """Queue an sr.AudioData clip (as captured from the microphone)"""
+        pcm = audio.frame_data if audio.sample_width == SAMPLE_WIDTH else audio.get_raw_data(
+            convert_width=SAMPLE_WIDTH
+        )
+        self.add(role, turn, pcm, audio.sample_rate, 1, transcript)
+
+    def close(self, timeout: Optional[float] = 30):
+        """Flush queued clips and stop the writer"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    # ── Writer thread ─────────────────────────────────────────────
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            try:
+                self._write(*job)
+            except Exception as e:
+                print(f"   ⚠️ Audio archive write failed: {e}")
+
+    def _write(self, role, turn, pcm, sample_rate, channels, transcript, captured_at):
+        key = (turn, role)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        suffix = f"_{self._counts[key]}" if self._counts[key] > 1 else ""
+        name = f"turn{turn:03d}_{role}{suffix}.{self.fmt}"
+        path = os.path.join(self.run_dir, name)
+
+        if self.fmt == "flac":
+            import numpy as np
+            import soundfile as sf
+
+            samples = np.frombuffer(pcm, dtype="<i2").reshape(-1, channels)
+            sf.write(path, samples, sample_rate, format="FLAC", subtype="PCM_16")
+        else:
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(channels)
+                wav.setsampwidth(SAMPLE_WIDTH)
+                wav.setframerate(sample_rate)
+                wav.writeframes(pcm)
+
+        entry = {
+            "turn": turn,
+            "role": role,
+            "audio": name,
+            "transcript": transcript,
+            "seconds": round(len(pcm) / float(SAMPLE_WIDTH * channels * sample_rate), 3),
+            "sample_rate": sample_rate,
+            "channels": channels,
+            "captured_at": datetime.fromtimestamp(captured_at).isoformat(timespec="milliseconds"),
+        }
+        with open(self.index_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        self.clips += 1
+        self.bytes_written += os.path.getsize(path)
+
+
+def audio_archive_from_config(run_id: str, config_path: str = DEFAULT_CONFIG_PATH) -> Optional[AudioArchive]:
+    """AudioArchive for a run if test.record_audio is on, else None"""
+    try:
+        with open(config_path, "r") as f:
+            test_config = (yaml.safe_load(f) or {}).get("test") or {}
+    except OSError:
+        test_config = {}
+    if not test_config.get("record_audio", False):
+        return None
+    base = test_config.get("audio_archive_dir", "logs/audio")
+    return AudioArchive(
+        os.path.join(base, run_id), fmt=test_config.get("audio_archive_format", "flac")
+    )
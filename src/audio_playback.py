@@ -0,0 +1,385 @@
+"""
+Audio playback backends - play decoded PCM in-process
+
+Replaces the per-utterance `afplay` subprocess: PCM is written straight to an
+output device (or a virtual sink such as BlackHole / a PulseAudio null sink)
+through a PyAudio stream that stays open between utterances.
+Headless runs use the null or file sinks.
+"""
+import io
+import os
+import threading
+import time
+import wave
+from typing import Optional, Tuple
+
+SAMPLE_WIDTH = 2  # all backends take signed 16-bit little-endian PCM
+
+
+def decode_audio(data: bytes) -> Tuple[bytes, int, int]:
+    """
+    Decode an encoded audio buffer (MP3 from edge-tts, WAV, FLAC...) in memory.
+
+    Returns:
+        (pcm_int16_bytes, sample_rate, channels)
+    """
+    import soundfile as sf
+
+    samples, sample_rate = sf.read(io.BytesIO(data), dtype="int16")
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    return samples.tobytes(), sample_rate, channels
+
+
+def pcm_duration(pcm: bytes, sample_rate: int, channels: int) -> float:
+    """Duration in seconds of a 16-bit PCM buffer"""
+    if not sample_rate:
+        return 0.0
+    return len(pcm) / float(SAMPLE_WIDTH * channels * sample_rate)
+
+
+class PlaybackStream:
+    """An open output for one utterance; write() blocks at device speed"""
+
+    def write(self, pcm: bytes):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PlaybackBackend:
+    """Base class for playback sinks"""
+
+    name = "base"
+
+    def open_stream(self, sample_rate: int, channels: int) -> PlaybackStream:
+        raise NotImplementedError
+
+    def play(self, pcm: bytes, sample_rate: int, channels: int = 1):
+        """Play a complete PCM buffer and return once it has been written"""
+        with self.open_stream(sample_rate, channels) as stream:
+            stream.write(pcm)
+
+    def close(self):
+        """Release device resources"""
+        pass
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PyAudio (in-process device output)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _PyAudioUtteranceStream(PlaybackStream):
+    def __init__(self, backend: "PyAudioPlayback", stream):
+        self.backend = backend
+        self.stream = stream
+
+    def write(self, pcm: bytes):
+        self.stream.write(pcm)
+
+    def close(self):
+        # Keep the device stream warm for the next utterance; just let the
+        # device buffer drain so the next listen() does not clip the tail.
+        try:
+            time.sleep(self.stream.get_output_latency())
+        except Exception:
+            pass
+
+
+class PyAudioPlayback(PlaybackBackend):
+    """Plays PCM on an output device via PyAudio, reusing one open stream"""
+
+    name = "pyaudio"
+
+    def __init__(self, device_name: Optional[str] = None):
+        """
+        Args:
+            device_name: substring of the output device name (e.g. "BlackHole",
+                         "MacBook Pro Speakers"); None uses the default output
+        """
+        import pyaudio
+
+        self._pyaudio = pyaudio
+        self.pa = pyaudio.PyAudio()
+        self.device_index = self._find_device(device_name) if device_name else None
+        self._stream = None
+        self._format: Optional[Tuple[int, int]] = None
+
+    def _find_device(self, device_name: str) -> Optional[int]:
+        for i in range(self.pa.get_device_count()):
+            info = self.pa.get_device_info_by_index(i)
+            if info.get("maxOutputChannels", 0) > 0 and device_name.lower() in info["name"].lower():
+                print(f"   🔈 Using output device: {info['name']}")
+                return i
+        print(f"   ⚠️ Output device '{device_name}' not found, using default")
+        return None
+
+    def open_stream(self, sample_rate: int, channels: int) -> PlaybackStream:
+        if self._stream is None or self._format != (sample_rate, channels):
+            self._close_device_stream()
+            self._stream = self.pa.open(
+                format=self._pyaudio.paInt16,
+                channels=channels,
+                rate=sample_rate,
+                output=True,
+                output_device_index=self.device_index,
+            )
+            self._format = (sample_rate, channels)
+        return _PyAudioUtteranceStream(self, self._stream)
+
+    def _close_device_stream(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+            self._format = None
+
+    def close(self):
+        self._close_device_stream()
+        self.pa.terminate()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Headless sinks
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _NullStream(PlaybackStream):
+    def __init__(self, backend: "NullPlayback", sample_rate: int, channels: int):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+    def write(self, pcm: bytes):
+        self.backend.bytes_played += len(pcm)
+        if self.backend.realtime:
+            time.sleep(pcm_duration(pcm, self.sample_rate, self.channels))
+
+
+class NullPlayback(PlaybackBackend):
+    """Discards audio; optionally sleeps for its duration to keep turn timing realistic"""
+
+    name = "null"
+
+    def __init__(self, realtime: bool = False):
+        self.realtime = realtime
+        self.bytes_played = 0
+
+    def open_stream(self, sample_rate: int, channels: int) -> PlaybackStream:
+        return _NullStream(self, sample_rate, channels)
+
+
+class _WaveFileStream(PlaybackStream):
+    def __init__(self, path: str, sample_rate: int, channels: int):
+        self.path = path
+        self.wav = wave.open(path, "wb")
+        self.wav.setnchannels(channels)
+        self.wav.setsampwidth(SAMPLE_WIDTH)
+        self.wav.setframerate(sample_rate)
+
+    def write(self, pcm: bytes):
+        self.wav.writeframes(pcm)
+
+    def close(self):
+        self.wav.close()
+
+
+class FilePlayback(PlaybackBackend):
+    """Writes each utterance to a numbered WAV file — for headless debugging"""
+
+    name = "file"
+
+    def __init__(self, output_dir: str = "/tmp/pizza_voice_test/playback"):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.count = 0
+
+    def open_stream(self, sample_rate: int, channels: int) -> PlaybackStream:
+        self.count += 1
+        path = os.path.join(
+            self.output_dir, f"utterance_{int(time.time() * 1000)}_{self.count:03d}.wav"
+        )
+        return _WaveFileStream(path, sample_rate, channels)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Streaming playback
+# ─────────────────────────────────────────────────────────────────────────────
+
+class PCMRingBuffer:
+    """
+    Fixed-capacity, thread-safe byte ring between a producer (TTS decoder)
+    and a consumer (playback thread). Reads block until data arrives or the
+    buffer is closed; writes block only when the buffer is full.
+    """
+
+    def __init__(self, capacity: int):
+        self._buf = bytearray(capacity)
+        self._capacity = capacity
+        self._start = 0
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def available(self) -> int:
+        with self._cond:
+            return self._size
+
+    @property
+    def closed(self) -> bool:
+        with self._cond:
+            return self._closed
+
+    def write(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            with self._cond:
+                while self._size == self._capacity and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                n = min(len(view), self._capacity - self._size)
+                end = (self._start + self._size) % self._capacity
+                first = min(n, self._capacity - end)
+                self._buf[end:end + first] = view[:first]
+                self._buf[:n - first] = view[first:n]
+                self._size += n
+                self._cond.notify_all()
+            view = view[n:]
+
+    def read(self, max_bytes: int, align: int = 1) -> bytes:
+        """Read up to max_bytes (a multiple of align); b"" once closed and drained"""
+        with self._cond:
+            while self._size < align and not self._closed:
+                self._cond.wait()
+            n = min(max_bytes, self._size)
+            n -= n % align
+            if n <= 0:
+                return b""
+            first = min(n, self._capacity - self._start)
+            out = bytes(self._buf[self._start:self._start + first]) + bytes(self._buf[:n - first])
+            self._start = (self._start + n) % self._capacity
+            self._size -= n
+            self._cond.notify_all()
+            return out
+
+    def wait_for(self, nbytes: int, timeout: Optional[float] = None) -> bool:
+        """Block until nbytes are buffered or the producer closed the buffer"""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._size >= nbytes or self._closed, timeout=timeout
+            )
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StreamingPlayer:
+    """
+    Plays PCM as it is produced: a background thread waits for `prebuffer_ms`
+    of audio, then drains the ring buffer into the backend at device speed.
+    """
+
+    def __init__(
+        self,
+        backend: PlaybackBackend,
+        sample_rate: int,
+        channels: int = 1,
+        prebuffer_ms: int = 300,
+        capacity_seconds: int = 120,
+        chunk_ms: int = 50,
+    ):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.channels = channels
+        bytes_per_ms = sample_rate * channels * SAMPLE_WIDTH / 1000.0
+        self.frame_bytes = channels * SAMPLE_WIDTH
+        self.prebuffer_bytes = int(bytes_per_ms * prebuffer_ms)
+        self.chunk_bytes = max(self.frame_bytes, int(bytes_per_ms * chunk_ms))
+        self.buffer = PCMRingBuffer(int(bytes_per_ms * capacity_seconds * 1000))
+        self.first_audio_at: Optional[float] = None  # time.monotonic() of first device write
+        self.bytes_played = 0
+        self.error: Optional[BaseException] = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="streaming-player", daemon=True)
+
+    @property
+    def seconds_played(self) -> float:
+        return self.bytes_played / float(self.frame_bytes * self.sample_rate)
+
+    def start(self) -> "StreamingPlayer":
+        self._thread.start()
+        return self
+
+    def feed(self, pcm: bytes):
+        self.buffer.write(pcm)
+
+    def finish(self):
+        """Signal end of audio; the thread plays whatever is left and exits"""
+        self.buffer.close()
+
+    def wait(self, timeout: Optional[float] = None):
+        self._thread.join(timeout)
+        if self.error:
+            raise self.error
+
+    def stop(self, timeout: Optional[float] = 5):
+        """Drop whatever is still buffered and wait for the thread to exit"""
+        self._stopped = True
+        self.buffer.close()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            self.buffer.wait_for(self.prebuffer_bytes)
+            with self.backend.open_stream(self.sample_rate, self.channels) as stream:
+                while not self._stopped:
+                    chunk = self.buffer.read(self.chunk_bytes, align=self.frame_bytes)
+                    if not chunk or self._stopped:
+                        break
+                    if self.first_audio_at is None:
+                        self.first_audio_at = time.monotonic()
+                    stream.write(chunk)
+                    self.bytes_played += len(chunk)
+        except BaseException as e:  # surfaced to the caller from wait()
+            self.error = e
+            self.buffer.close()
+
+
+PLAYBACK_BACKENDS = {
+    PyAudioPlayback.name: PyAudioPlayback,
+    NullPlayback.name: NullPlayback,
+    FilePlayback.name: FilePlayback,
+}
+
+
+def create_playback_backend(name: str = "pyaudio", **options) -> PlaybackBackend:
+    """
+    Build a playback backend by name: "pyaudio" | "null" | "file".
+
+    Falls back to the null sink when PyAudio (or an output device) is not
+    available, so headless runners keep working.
+    """
+    if name not in PLAYBACK_BACKENDS:
+        raise ValueError(
+            f"Unknown playback backend '{name}'. Available: {', '.join(PLAYBACK_BACKENDS)}"
+        )
+    try:
+        return PLAYBACK_BACKENDS[name](**options)
+    except Exception as e:
+        if name != PyAudioPlayback.name:
+            raise
+        print(f"   ⚠️ PyAudio playback unavailable ({e}) — using null sink")
+        return NullPlayback()
@@ -0,0 +1,154 @@
+"""
+Recorded-audio replay - feed saved agent utterances through the ASR path
+
+A replay set is either
+  - a directory of audio files (WAV/FLAC/AIFF) with same-stem .txt
+    reference transcripts, or
+  - a JSONL manifest of {"audio": "<path>", "transcript": "..."} lines
+    (audio paths relative to the manifest) — including the index.jsonl
+    of a run's audio archive (src/audio_archive.py).
+
+ReplaySource yields the same sr.AudioData the conversation loop gets from
+the microphone, paced at real time (speed=1), accelerated (speed=4) or as
+fast as possible (speed=0), so transcription can be measured and the loop
+exercised without a phone.
+"""
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from src.speculation import normalize_utterance
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".aif", ".aiff")
+
+
+@dataclass
+class ReplayUtterance:
+    """One recorded agent utterance and its reference transcript"""
+
+    id: str
+    audio_path: str
+    transcript: Optional[str] = None
+
+
+def load_replay_set(path: str) -> List[ReplayUtterance]:
+    """Load utterances from a directory or a JSONL manifest (see module docstring)"""
+    utterances = []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() not in AUDIO_EXTENSIONS:
+                continue
+            transcript_path = os.path.join(path, stem + ".txt")
+            transcript = None
+            if os.path.isfile(transcript_path):
+                with open(transcript_path, "r") as f:
+                    transcript = f.read().strip()
+            utterances.append(ReplayUtterance(stem, os.path.join(path, name), transcript))
+    else:
+        base = os.path.dirname(os.path.abspath(path))
+        with open(path, "r") as f:
+            for i, line in enumerate(f):
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry.get("role", "agent") != "agent":
+                    continue  # audio archive index: skip Ravi's own utterances
+                audio = entry["audio"]
+                if not os.path.isabs(audio):
+                    audio = os.path.join(base, audio)
+                utterances.append(ReplayUtterance(
+                    entry.get("id") or os.path.splitext(os.path.basename(audio))[0] or str(i),
+                    audio,
+                    entry.get("transcript"),
+                ))
+    if not utterances:
+        raise ValueError(f"No replay audio found in {path}")
+    return utterances
+
+
+def load_audio_data(audio_path: str):
+    """Read an audio file into sr.AudioData (what the microphone path produces)"""
+    import speech_recognition as sr
+
+    with sr.AudioFile(audio_path) as source:
+        return sr.Recognizer().record(source)
+
+
+def audio_duration(audio) -> float:
+    """Duration of an sr.AudioData in seconds"""
+    return len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+
+
+class ReplaySource:
+    """
+    Hands out recorded utterances in order, as if captured live.
+
+    next_audio() blocks for the utterance's duration / speed before
+    returning it, mirroring how long the microphone path would take to
+    capture it.
+    """
+
+    def __init__(self, utterances: List[ReplayUtterance], speed: float = 1.0):
+        """
+        Args:
+            utterances: replay set, see load_replay_set()
+            speed:      1.0 = real time, >1 accelerated, 0 = no pacing
+        """
+        self.utterances = utterances
+        self.speed = speed
+        self.position = 0
+
+    @classmethod
+    def from_path(cls, path: str, speed: float = 1.0) -> "ReplaySource":
+        return cls(load_replay_set(path), speed)
+
+    @property
+    def current(self) -> Optional[ReplayUtterance]:
+        """Utterance most recently returned by next_audio()"""
+        return self.utterances[self.position - 1] if self.position else None
+
+    def next_audio(self):
+        """
+        Next utterance as sr.AudioData.
+
+        Raises:
+            sr.WaitTimeoutError: replay set exhausted (same as a silent phone)
+        """
+        import speech_recognition as sr
+
+        if self.position >= len(self.utterances):
+            raise sr.WaitTimeoutError("replay set exhausted")
+        utterance = self.utterances[self.position]
+        self.position += 1
+        audio = load_audio_data(utterance.audio_path)
+        if self.speed > 0:
+            time.sleep(audio_duration(audio) / self.speed)
+        return audio
+
+    def __iter__(self) -> Iterator[Tuple[ReplayUtterance, object]]:
+        """Yield (utterance, sr.AudioData) pairs until the set is exhausted"""
+        while self.position < len(self.utterances):
+            audio = self.next_audio()
+            yield self.current, audio
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """WER = (substitutions + deletions + insertions) / reference words"""
+    ref = normalize_utterance(reference).split()
+    hyp = normalize_utterance(hypothesis).split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,             # deletion
+                current[j - 1] + 1,          # insertion
+                previous[j - 1] + (r != h),  # substitution / match
+            )
+        previous = current
+    return previous[-1] / float(len(ref))
@@ -0,0 +1,416 @@
+"""
+Trend dashboard across test runs.
+
+Reads run history from the run index (src/run_index.py) and renders
+reports/dashboard.html: pass rate per persona, score distribution, per-phase
+failure rates, conversation turn counts and latency percentiles over time,
+plus a drift table comparing recent runs with the ones before them.
+
+Builds are incremental: each run is reduced once to a small digest (reading
+its timings sidecar and, for old runs, its transcript) and cached in
+reports/dashboard_cache.json together with the index's updated_at watermark.
+Regenerating after a new run only digests runs written since the last build.
+
+Usage:
+    python -m src.dashboard [--full] [--output reports/dashboard.html]
+"""
+import json
+import os
+import statistics
+from datetime import datetime
+
+from src.event_log import read_conversation
+from src.report_generator import STAGE_COLORS, _build_styles, _esc, _phase_color
+from src.run_index import RunIndex, get_run_index
+from src.turn_timing import load_timings
+
+DEFAULT_OUTPUT = "reports/dashboard.html"
+CACHE_VERSION = 1
+PHASES = ["navigation", "conversation", "verification"]
+TREND_STAGES = ["transcription", "llm_ttft", "tts_first_audio"]
+DRIFT_WINDOW = 10       # runs per comparison window
+DRIFT_THRESHOLD = 0.15  # flag a >15% change in the bad direction
+
+
+def cache_path_for(output: str) -> str:
+    """reports/dashboard.html → reports/dashboard_cache.json"""
+    return os.path.splitext(output)[0] + "_cache.json"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Run digests (the only per-run file I/O)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _digest(row: dict) -> dict:
+    """Reduce an index row (plus its timings sidecar) to what the charts need"""
+    log_file = row.get("log_file")
+    turns = row.get("turns")
+    if turns is None and log_file and os.path.isfile(log_file):
+        turns = sum(1 for t in read_conversation(log_file) if t["role"] == "customer")
+
+    stages = {}
+    turn_p50, turn_p95 = row.get("turn_p50"), row.get("turn_p95")
+    timings = load_timings(log_file)
+    if timings:
+        summary = timings.get("summary") or {}
+        stages = {name: s["p50"] for name, s in summary.items() if name in TREND_STAGES}
+        if turn_p50 is None and "turn" in summary:
+            turn_p50, turn_p95 = summary["turn"]["p50"], summary["turn"]["p95"]
+
+    passed = row.get("passed")
+    return {
+        "run_id": row["run_id"],
+        "started_at": row.get("started_at") or "",
+        "persona": row.get("persona") or "default",
+        "passed": None if passed is None else bool(passed),
+        "score": row.get("score"),
+        "phases": {p: row.get(f"phase_{p}") for p in PHASES},
+        "turns": turns,
+        "turn_p50": turn_p50,
+        "turn_p95": turn_p95,
+        "stages": stages,
+        "report_file": row.get("report_file"),
+    }
+
+
+def _load_cache(path: str) -> dict:
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "watermark": None, "runs": {}}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Aggregates
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _persona_stats(runs: list[dict]) -> list[dict]:
+    by_persona: dict[str, list[dict]] = {}
+    for r in runs:
+        by_persona.setdefault(r["persona"], []).append(r)
+    stats = []
+    for persona, rs in by_persona.items():
+        verified = [r for r in rs if r["passed"] is not None]
+        scores = [r["score"] for r in rs if r["score"] is not None]
+        stats.append({
+            "persona": persona,
+            "runs": len(rs),
+            "verified": len(verified),
+            "passed": sum(1 for r in verified if r["passed"]),
+            "mean_score": statistics.mean(scores) if scores else None,
+            "last_run": max(r["started_at"] for r in rs),
+        })
+    return sorted(stats, key=lambda s: -s["runs"])
+
+
+def _phase_failure_rates(runs: list[dict]) -> dict:
+    """{phase: (failed, attempted)} ignoring skipped/unknown phases"""
+    rates = {}
+    for phase in PHASES:
+        statuses = [r["phases"].get(phase) for r in runs]
+        attempted = [s for s in statuses if s in ("passed", "failed")]
+        rates[phase] = (attempted.count("failed"), len(attempted))
+    return rates
+
+
+def _score_histogram(runs: list[dict]) -> list[int]:
+    buckets = [0] * 10
+    for r in runs:
+        if r["score"] is not None:
+            buckets[min(9, int(r["score"] // 10))] += 1
+    return buckets
+
+
+def _drift(runs: list[dict]) -> list[dict]:
+    """Median of the last DRIFT_WINDOW runs vs the DRIFT_WINDOW before them"""
+    metrics = [
+        ("Score", lambda r: r["score"], True),
+        ("Turn p50 (s)", lambda r: r["turn_p50"], False),
+        ("Turn p95 (s)", lambda r: r["turn_p95"], False),
+        ("Conversation turns", lambda r: r["turns"], False),
+    ] + [(f"{stage} p50 (s)", lambda r, s=stage: r["stages"].get(s), False) for stage in TREND_STAGES]
+
+    rows = []
+    for label, get, higher_is_better in metrics:
+        values = [v for v in (get(r) for r in runs) if v is not None]
+        if len(values) < 2:
+            continue
+        recent = values[-DRIFT_WINDOW:]
+        previous = values[-2 * DRIFT_WINDOW:-DRIFT_WINDOW] or values[:-len(recent)]
+        if not previous:
+            continue
+        before, now = statistics.median(previous), statistics.median(recent)
+        change = (now - before) / before if before else 0.0
+        worse = -change if higher_is_better else change
+        rows.append({
+            "metric": label, "before": before, "now": now,
+            "change": change, "flagged": worse > DRIFT_THRESHOLD,
+        })
+    return rows
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTML section builders
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _build_dashboard_styles() -> str:
+    return """
+    <style>
+      .stat-cards { display: flex; gap: 16px; flex-wrap: wrap; }
+      .stat-card { flex: 1; min-width: 160px; background: #f8fafc; border-radius: 10px;
+                   padding: 16px 20px; }
+      .stat-card .value { font-size: 1.6rem; font-weight: 800; color: #1e3a5f; }
+      .stat-card .label { font-size: 0.78rem; color: #64748b; text-transform: uppercase;
+                          letter-spacing: 0.05em; font-weight: 600; }
+      .histogram { display: flex; align-items: flex-end; gap: 6px; height: 140px; }
+      .histogram .col { flex: 1; display: flex; flex-direction: column; align-items: center;
+                        justify-content: flex-end; height: 100%; font-size: 0.72rem; color: #64748b; }
+      .histogram .bar { width: 100%; background: #1e3a5f; border-radius: 3px 3px 0 0; min-height: 1px; }
+      .chart { width: 100%; height: auto; }
+      .chart text { font-size: 10px; fill: #64748b; }
+      .items-table tr.drift td { background: #fef2f2; }
+    </style>
+"""
+
+
+def _build_dashboard_header(runs: list[dict]) -> str:
+    verified = [r for r in runs if r["passed"] is not None]
+    rate = 100.0 * sum(1 for r in verified if r["passed"]) / len(verified) if verified else 0.0
+    span = f"{runs[0]['started_at'][:10]} → {runs[-1]['started_at'][:10]}" if runs else "no runs"
+    return f"""
+    <div class="header">
+      <div>
+        <h1>Papa John's Voice Ordering Test Dashboard</h1>
+        <div class="meta">{len(runs)} runs &nbsp;|&nbsp; {_esc(span)}</div>
+      </div>
+      <div class="badge" style="background:#1e3a5f;">Pass rate: {rate:.0f}% of {len(verified)} verified</div>
+    </div>
+"""
+
+
+def _build_personas(runs: list[dict]) -> str:
+    rows = []
+    for s in _persona_stats(runs):
+        rate = f"{100.0 * s['passed'] / s['verified']:.0f}%" if s["verified"] else "—"
+        score = f"{s['mean_score']:.1f}" if s["mean_score"] is not None else "—"
+        rows.append(
+            f"<tr><td>{_esc(s['persona'])}</td><td>{s['runs']}</td><td>{s['passed']}/{s['verified']}</td>"
+            f"<td>{rate}</td><td>{score}</td><td>{_esc(s['last_run'][:16].replace('T', ' '))}</td></tr>"
+        )
+    return f"""
+    <div class="section">
+      <h2>Pass Rate by Persona</h2>
+      <table class="items-table">
+        <thead><tr><th>Persona</th><th>Runs</th><th>Passed</th><th>Pass rate</th><th>Mean score</th><th>Last run</th></tr></thead>
+        <tbody>{''.join(rows)}</tbody>
+      </table>
+    </div>
+"""
+
+
+def _build_phase_failures(runs: list[dict]) -> str:
+    cards = []
+    for phase, (failed, attempted) in _phase_failure_rates(runs).items():
+        rate = 100.0 * failed / attempted if attempted else 0.0
+        color = _phase_color("failed" if failed else "passed") if attempted else _phase_color("skipped")
+        cards.append(f"""
+        <div class="stat-card" style="border-left:4px solid {color};">
+          <div class="value">{rate:.0f}%</div>
+          <div class="label">{_esc(phase.title())} failures ({failed}/{attempted})</div>
+        </div>""")
+    return f"""
+    <div class="section">
+      <h2>Phase Failure Rates</h2>
+      <div class="stat-cards">{''.join(cards)}</div>
+    </div>
+"""
+
+
+def _build_score_histogram(runs: list[dict]) -> str:
+    buckets = _score_histogram(runs)
+    if not any(buckets):
+        return ""
+    top = max(buckets)
+    cols = "".join(
+        f'<div class="col"><span>{n or ""}</span>'
+        f'<div class="bar" style="height:{100.0 * n / top:.1f}%;"></div>'
+        f'<span>{i * 10}{"+" if i == 9 else ""}</span></div>'
+        for i, n in enumerate(buckets)
+    )
+    return f"""
+    <div class="section">
+      <h2>Score Distribution</h2>
+      <div class="histogram">{cols}</div>
+    </div>
+"""
+
+
+def _svg_chart(series: list[tuple], n_runs: int, unit: str = "", height: int = 160) -> str:
+    """
+    Inline SVG line chart with one x position per run (oldest → newest).
+
+    Args:
+        series: [(label, color, [(run_position, value), ...]), ...]
+    """
+    values = [v for _, _, points in series for _, v in points]
+    if not values:
+        return ""
+    width, pad = 900, 32
+    top = max(values) * 1.1 or 1.0
+    step = (width - 2 * pad) / max(1, n_runs - 1)
+
+    def xy(i, v):
+        return pad + i * step, height - pad - (height - 2 * pad) * v / top
+
+    parts = [
+        f'<line x1="{pad}" y1="{height - pad}" x2="{width - pad}" y2="{height - pad}" stroke="#e2e8f0"/>',
+        f'<text x="2" y="{pad}">{top:.3g}{_esc(unit)}</text>',
+        f'<text x="2" y="{height - pad}">0</text>',
+    ]
+    legend = []
+    for label, color, points in series:
+        if not points:
+            continue
+        coords = " ".join(f"{x:.1f},{y:.1f}" for x, y in (xy(i, v) for i, v in points))
+        parts.append(f'<polyline points="{coords}" fill="none" stroke="{color}" stroke-width="1.5"/>')
+        parts.extend(
+            f'<circle cx="{x:.1f}" cy="{y:.1f}" r="2.5" fill="{color}"><title>{_esc(label)}: {v:.3g}{_esc(unit)}</title></circle>'
+            for (x, y), (_, v) in zip((xy(i, v) for i, v in points), points)
+        )
+        legend.append(f'<span><i style="background:{color};"></i>{_esc(label)}</span>')
+    return (
+        f'<div class="wf-legend">{"".join(legend)}</div>'
+        f'<svg class="chart" viewBox="0 0 {width} {height}">{"".join(parts)}</svg>'
+    )
+
+
+def _points(runs: list[dict], get) -> list[tuple]:
+    return [(i, v) for i, v in ((i, get(r)) for i, r in enumerate(runs)) if v is not None]
+
+
+def _build_trends(runs: list[dict]) -> str:
+    n = len(runs)
+    charts = [
+        ("Order Score", _svg_chart([("score", "#1e3a5f", _points(runs, lambda r: r["score"]))], n)),
+        ("Conversation Turns", _svg_chart([("turns", "#64748b", _points(runs, lambda r: r["turns"]))], n)),
+        ("Turn Latency", _svg_chart([
+            ("p50", "#0ea5e9", _points(runs, lambda r: r["turn_p50"])),
+            ("p95", "#f43f5e", _points(runs, lambda r: r["turn_p95"])),
+        ], n, unit="s")),
+        ("Stage Latency (p50)", _svg_chart([
+            (stage, STAGE_COLORS[stage], _points(runs, lambda r, s=stage: r["stages"].get(s)))
+            for stage in TREND_STAGES
+        ], n, unit="s")),
+    ]
+    body = "".join(
+        f'<h3 style="font-size:0.9rem;color:#475569;margin:18px 0 6px;">{_esc(title)}</h3>{chart}'
+        for title, chart in charts if chart
+    )
+    if not body:
+        return ""
+    return f"""
+    <div class="section">
+      <h2>Trends ({n} runs, oldest → newest)</h2>
+      {body}
+    </div>
+"""
+
+
+def _build_drift(runs: list[dict]) -> str:
+    rows = _drift(runs)
+    if not rows:
+        return ""
+    body = "".join(
+        f'<tr class="{"drift" if r["flagged"] else ""}"><td>{_esc(r["metric"])}</td>'
+        f'<td>{r["before"]:.3g}</td><td>{r["now"]:.3g}</td>'
+        f'<td>{r["change"] * 100:+.0f}%{" ⚠️" if r["flagged"] else ""}</td></tr>'
+        for r in rows
+    )
+    return f"""
+    <div class="section">
+      <h2>Drift (median of last {DRIFT_WINDOW} runs vs previous {DRIFT_WINDOW})</h2>
+      <table class="items-table">
+        <thead><tr><th>Metric</th><th>Before</th><th>Recent</th><th>Change</th></tr></thead>
+        <tbody>{body}</tbody>
+      </table>
+    </div>
+"""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Public API
+# ─────────────────────────────────────────────────────────────────────────────
+
+def generate_dashboard(
+    index: RunIndex | None = None,
+    output: str = DEFAULT_OUTPUT,
+    full: bool = False,
+) -> str:
+    """
+    Regenerate the trend dashboard, digesting only runs changed since the last build.
+
+    Args:
+        index:  RunIndex to read (default: the process-wide one)
+        output: HTML path; the digest cache is written next to it
+        full:   ignore the cache and re-digest every run
+
+    Returns:
+        Absolute path to the generated HTML file
+    """
+    index = index or get_run_index()
+    cache_path = cache_path_for(output)
+    cache = {"version": CACHE_VERSION, "watermark": None, "runs": {}} if full else _load_cache(cache_path)
+
+    changed = index.runs_updated_since(cache["watermark"])
+    for row in changed:
+        cache["runs"][row["run_id"]] = _digest(row)
+        if row.get("updated_at") and (cache["watermark"] or "") < row["updated_at"]:
+            cache["watermark"] = row["updated_at"]
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump(cache, f)
+
+    runs = sorted(cache["runs"].values(), key=lambda r: r["started_at"])
+    html = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Voice Order Test Dashboard</title>
+  {_build_styles()}
+  {_build_dashboard_styles()}
+</head>
+<body>
+  {_build_dashboard_header(runs)}
+  {_build_drift(runs)}
+  {_build_personas(runs)}
+  {_build_phase_failures(runs)}
+  {_build_score_histogram(runs)}
+  {_build_trends(runs)}
+  <div style="text-align:center;padding:24px 0 32px;color:#94a3b8;font-size:0.8rem;">
+    Generated by pizza-voice-test &nbsp;|&nbsp; {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+  </div>
+</body>
+</html>"""
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(html)
+
+    print(f"📈 Dashboard: {len(runs)} runs ({len(changed)} new/updated) → {output}")
+    return os.path.abspath(output)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the multi-run trend dashboard")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--db", default=None, help="Run index database (default: logs/run_index.sqlite3)")
+    parser.add_argument("--full", action="store_true", help="Rebuild every run digest")
+    args = parser.parse_args()
+
+    generate_dashboard(RunIndex(args.db) if args.db else None, output=args.output, full=args.full)
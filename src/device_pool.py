@@ -0,0 +1,343 @@
+"""
+Device pool - run independent end-to-end sessions on several phones at once
+
+Devices are listed under `devices:` in config/appium_config.yaml:
+
+    devices:
+      - name: pixel7-a
+        udid: "28291FDH2000K7"
+        appium_port: 4723          # or server_url: "http://host:4723"
+        system_port: 8201          # UiAutomator2 port, unique per device
+        mic: "USB Audio Device"    # input that hears this phone's speaker
+        playback_device: "USB Audio Device"  # output feeding this phone's mic
+
+Each device runs in its own worker process with its own workspace,
+artifacts/devices/<name>/, holding a config/appium_config.yaml derived from
+the base config (server URL, udid, systemPort, screenshot and audio
+directories, playback device) plus the run's logs/ and reports/. Worker
+output goes to worker.log there. When a worker finishes, its runs are
+copied into the main run index (tagged with the device) so the dashboard
+covers the whole rack.
+
+Targets:
+    full   — run_full_flow() from end_to_end_voice_test.py (non-interactive)
+    smoke  — start an Appium session, read the current activity and a
+             screenshot, stop; with appium.reuse_session, release the session
+             and check the next lease gets it back warm; with --fake,
+             against local FakeAppiumServers
+
+Usage:
+    python -m src.device_pool [--devices pixel7-a pixel8] [--persona rushed]
+    python -m src.device_pool --target smoke --fake
+"""
+import argparse
+import contextlib
+import copy
+import os
+import shutil
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CONFIG_PATH = "config/appium_config.yaml"
+DEFAULT_WORKSPACE_ROOT = "artifacts/devices"
+
+
+@dataclass
+class DeviceSpec:
+    """One phone in the rack and the host resources wired to it"""
+    name: str
+    udid: str
+    appium_port: int = 4723
+    system_port: Optional[int] = None
+    server_url: Optional[str] = None
+    mic: Optional[str] = None
+    playback_device: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        return self.server_url or f"http://localhost:{self.appium_port}"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DeviceSpec":
+        known = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+def load_devices(config_path: str = DEFAULT_CONFIG_PATH) -> List[DeviceSpec]:
+    """DeviceSpecs from the config's `devices:` list"""
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f) or {}
+    devices = [DeviceSpec.from_dict(d) for d in config.get("devices") or []]
+    for field in ("name", "udid", "system_port"):  # must not be shared between devices
+        values = [getattr(d, field) for d in devices if getattr(d, field) is not None]
+        if len(values) != len(set(values)):
+            raise ValueError(f"devices: duplicate {field} in {config_path}")
+    return devices
+
+
+def device_config(base: dict, device: DeviceSpec, workspace: str) -> dict:
+    """Base config with this device's server, capabilities and artifact paths"""
+    config = copy.deepcopy(base)
+    config.pop("devices", None)
+    config.setdefault("appium", {})["server_url"] = device.url
+    caps = config.setdefault("capabilities", {})
+    caps["udid"] = device.udid
+    caps["deviceName"] = device.name
+    if device.system_port:
+        caps["systemPort"] = device.system_port
+    test = config.setdefault("test", {})
+    test["screenshot_dir"] = os.path.join(workspace, "screenshots")
+    test["audio_dir"] = os.path.join(workspace, "audio_tmp")
+    voice = config.setdefault("voice_ai", {})
+    if device.playback_device:
+        voice["playback_device"] = device.playback_device
+    voice["playback_dir"] = os.path.join(workspace, "playback")
+    return config
+
+
+def prepare_workspace(base_config_path: str, device: DeviceSpec, root: str = DEFAULT_WORKSPACE_ROOT) -> str:
+    """
+    Create artifacts/devices/<name>/ with a device-specific config directory.
+
+    Returns:
+        absolute workspace path
+    """
+    workspace = os.path.abspath(os.path.join(root, device.name))
+    config_dir = os.path.join(workspace, "config")
+    os.makedirs(config_dir, exist_ok=True)
+    base_dir = os.path.dirname(os.path.abspath(base_config_path))
+    for name in os.listdir(base_dir):  # other config files (menu catalog...) as-is
+        src = os.path.join(base_dir, name)
+        if os.path.isfile(src) and name != os.path.basename(base_config_path):
+            shutil.copyfile(src, os.path.join(config_dir, name))
+    with open(base_config_path, "r") as f:
+        base = yaml.safe_load(f) or {}
+    with open(os.path.join(config_dir, "appium_config.yaml"), "w") as f:
+        yaml.safe_dump(device_config(base, device, workspace), f, sort_keys=False)
+    return workspace
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Worker side (runs in a child process, inside the device workspace)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _target_full(device: DeviceSpec, options: dict) -> dict:
+    import end_to_end_voice_test
+
+    args = argparse.Namespace(
+        persona=options.get("persona"),
+        scenario=options.get("scenario"),
+        mic=device.mic or "MacBook Pro Microphone",
+        show_images=options.get("show_images", True),
+        image_mode=options.get("image_mode", "linked"),
+        interactive=False,
+    )
+    return {"exit_code": end_to_end_voice_test.run_full_flow(args)}
+
+
+def _target_smoke(device: DeviceSpec, options: dict) -> dict:
+    from src.appium_driver import AppiumDriver
+
+    driver = AppiumDriver(DEFAULT_CONFIG_PATH).lease(reset_app=False)
+    try:
+        activity = driver.driver.current_activity
+        driver.take_screenshot("smoke")
+    finally:
+        driver.release()
+    result = {"exit_code": 0, "activity": activity}
+
+    if driver.reuse_session:
+        # lease → release → lease: the second lease has to get the parked session back
+        from src.session_broker import get_session_broker
+
+        reused_before = get_session_broker().reused
+        driver.lease(reset_app=False)
+        try:
+            result["session_reused"] = get_session_broker().reused > reused_before
+        finally:
+            driver.stop()  # leave nothing warm behind (fake servers go away)
+        if not result["session_reused"]:
+            print("   ❌ Released session was not reused by the next lease")
+            result["exit_code"] = 1
+    return result
+
+
+TARGETS: Dict[str, Callable[[DeviceSpec, dict], dict]] = {
+    "full": _target_full,
+    "smoke": _target_smoke,
+}
+
+
+def _device_worker(device_data: dict, workspace: str, target: str, options: dict) -> dict:
+    """Entry point of a worker process: run one target on one device"""
+    device = DeviceSpec.from_dict(device_data)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    os.chdir(workspace)
+    start = time.monotonic()
+    result = {"device": device.name, "workspace": workspace, "exit_code": 1}
+    with open(os.path.join(workspace, "worker.log"), "a", buffering=1) as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        print(f"\n===== {datetime.now():%Y-%m-%d %H:%M:%S} {target} on {device.name} ({device.udid}) =====")
+        try:
+            result.update(TARGETS[target](device, options))
+        except Exception as e:
+            traceback.print_exc()
+            result["error"] = str(e)
+    result["seconds"] = time.monotonic() - start
+    return result
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Coordinator
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _merge_run_index(workspace: str, device: str, since: str):
+    """Copy the worker's run rows into the main index with absolute artifact paths"""
+    from src.run_index import DEFAULT_DB_PATH, RunIndex, get_run_index
+
+    device_db = os.path.join(workspace, DEFAULT_DB_PATH)
+    if not os.path.isfile(device_db):
+        return 0
+    source = RunIndex(device_db)
+    try:
+        rows = source.runs_updated_since(since)
+    finally:
+        source.close()
+    main = get_run_index()
+    for row in rows:
+        run_id = row.pop("run_id")
+        row.pop("updated_at", None)
+        for key, value in list(row.items()):
+            if key.endswith("_file") and value and not os.path.isabs(value):
+                row[key] = os.path.join(workspace, value)
+        main.record_run(run_id, device=device, **row)
+    return len(rows)
+
+
+class DevicePool:
+    """Runs one worker process per device and collects the results"""
+
+    def __init__(
+        self,
+        devices: List[DeviceSpec],
+        config_path: str = DEFAULT_CONFIG_PATH,
+        workspace_root: str = DEFAULT_WORKSPACE_ROOT,
+    ):
+        """
+        Args:
+            devices:        devices to use (see load_devices())
+            config_path:    base config the per-device configs are derived from
+            workspace_root: parent of the per-device artifact directories
+        """
+        if not devices:
+            raise ValueError("Device pool is empty — add devices: to the config")
+        self.devices = devices
+        self.config_path = config_path
+        self.workspace_root = workspace_root
+
+    def run(self, target: str = "full", options: Optional[dict] = None, merge_index: bool = True) -> List[dict]:
+        """
+        Run `target` on every device in parallel.
+
+        Returns:
+            [{device, workspace, exit_code, seconds, ...}] in completion order
+        """
+        options = options or {}
+        since = datetime.now().isoformat(timespec="microseconds")
+        workspaces = {d.name: prepare_workspace(self.config_path, d, self.workspace_root) for d in self.devices}
+        print(f"📱 Running '{target}' on {len(self.devices)} devices: "
+              f"{', '.join(d.name for d in self.devices)}")
+
+        results = []
+        # One single-worker executor per device: every device gets a fresh
+        # process (process-wide singletons and cwd are per workspace), and
+        # spawn keeps audio/Appium state from leaking in from this process.
+        executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) for _ in self.devices
+        ]
+        try:
+            futures = {
+                executor.submit(_device_worker, asdict(d), workspaces[d.name], target, options): d
+                for executor, d in zip(executors, self.devices)
+            }
+            for future in as_completed(futures):
+                device = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:  # worker process died
+                    result = {"device": device.name, "workspace": workspaces[device.name],
+                              "exit_code": 1, "error": f"worker crashed: {e}"}
+                ok = result.get("exit_code") == 0
+                print(f"  {'✅' if ok else '❌'} {device.name:<16} "
+                      f"{result.get('seconds', 0):6.1f}s  {result.get('error', '')}  → {result['workspace']}")
+                if merge_index:
+                    try:
+                        _merge_run_index(result["workspace"], device.name, since)
+                    except Exception as e:
+                        print(f"     ⚠️ Could not merge run index: {e}")
+                results.append(result)
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run end-to-end sessions on several devices in parallel")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--devices", nargs="+", help="Device names to use (default: all)")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="full")
+    parser.add_argument("--persona", type=str, default=None)
+    parser.add_argument("--scenario", type=str, default=None)
+    parser.add_argument("--workspace-root", default=DEFAULT_WORKSPACE_ROOT)
+    parser.add_argument("--fake", action="store_true",
+                        help="Point every device at its own local FakeAppiumServer (use with --target smoke)")
+    args = parser.parse_args()
+
+    devices = load_devices(args.config)
+    if args.devices:
+        unknown = set(args.devices) - {d.name for d in devices}
+        if unknown:
+            parser.error(f"unknown devices: {', '.join(sorted(unknown))}")
+        devices = [d for d in devices if d.name in args.devices]
+
+    servers = []
+    if args.fake:
+        from src.fake_appium import FakeAppiumServer
+
+        for device in devices:
+            server = FakeAppiumServer().start()
+            device.server_url = server.url
+            servers.append(server)
+
+    try:
+        results = DevicePool(devices, args.config, args.workspace_root).run(
+            args.target, {"persona": args.persona, "scenario": args.scenario},
+            merge_index=not args.fake,
+        )
+    finally:
+        for server in servers:
+            server.stop()
+
+    if not args.fake:
+        try:
+            from src.dashboard import generate_dashboard
+
+            generate_dashboard()
+        except Exception as e:
+            print(f"⚠️  Dashboard update failed: {e}")
+    return 0 if all(r.get("exit_code") == 0 for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
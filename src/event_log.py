@@ -0,0 +1,161 @@
+"""
+Structured conversation event log (JSONL)
+
+Written next to the text log as logs/test_run_<ts>.events.jsonl, one JSON
+object per line, append-only:
+
+    {"ts": "...", "type": "run_start", "persona": "...", "speakers": {...}, ...}
+    {"ts": "...", "type": "utterance", "turn": 1, "role": "agent", "speaker": "Agent", "text": "..."}
+    {"ts": "...", "type": "classifier", "turn": 1, "kind": "rejection", "text": "..."}
+    {"ts": "...", "type": "rejected_item", "turn": 1, "item": "..."}
+    {"ts": "...", "type": "timings", "turn": 1, "spans": [...], "total": 4.2}
+    {"ts": "...", "type": "run_end", "reason": "..."}
+
+Writes are buffered and flushed every `flush_every` events or
+`flush_interval` seconds, and on close. The report and order verification
+read this log directly; the plain-text log is kept for humans and older
+runs.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+ROLE_AGENT = "agent"
+ROLE_CUSTOMER = "customer"
+DEFAULT_SPEAKERS = {ROLE_AGENT: "Agent", ROLE_CUSTOMER: "Ravi"}
+
+
+def events_path_for(log_file: str) -> str:
+    """logs/test_run_X.txt → logs/test_run_X.events.jsonl"""
+    return os.path.splitext(str(log_file))[0] + ".events.jsonl"
+
+
+class EventLog:
+    """Buffered append-only JSONL writer for one run"""
+
+    def __init__(self, path: str, flush_every: int = 8, flush_interval: float = 2.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    @classmethod
+    def for_log(cls, log_file: str, **options) -> "EventLog":
+        return cls(events_path_for(log_file), **options)
+
+    def emit(self, event_type: str, **fields):
+        """Queue an event; flushed in batches"""
+        event = {"ts": datetime.now().isoformat(timespec="milliseconds"), "type": event_type}
+        event.update(fields)
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            due = (
+                len(self._buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._buffer:
+                self._file.write("\n".join(self._buffer) + "\n")
+                self._buffer.clear()
+            self._file.flush()
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._file.close()
+
+
+def read_events(log_file: Optional[str]) -> Optional[List[dict]]:
+    """Events for a conversation log (text log path or .events.jsonl), or None"""
+    if not log_file:
+        return None
+    path = log_file if str(log_file).endswith(".events.jsonl") else events_path_for(log_file)
+    if not os.path.isfile(path):
+        return None
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue  # truncated last line of an interrupted run
+    return events
+
+
+def _parse_text_log(log_file: str) -> List[dict]:
+    """Turns from a legacy plain-text log (Agent:/Ravi: lines)"""
+    turns = []
+    with open(log_file, "r") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            for role, speaker in DEFAULT_SPEAKERS.items():
+                if line.startswith(f"{speaker}:"):
+                    text = line[len(speaker) + 1:].strip()
+                    if text:
+                        turns.append({"role": role, "speaker": speaker, "text": text})
+                    break
+            else:
+                if line.startswith("[") and line.endswith("]"):
+                    turns.append({"role": "system", "speaker": "system", "text": line})
+    return turns
+
+
+def read_conversation(log_file: Optional[str]) -> List[dict]:
+    """
+    Conversation turns as [{"role", "speaker", "text"}], role being
+    "agent" | "customer" | "system". Uses the event log when present and
+    falls back to parsing the text log.
+    """
+    events = read_events(log_file)
+    if events is not None:
+        turns = []
+        for e in events:
+            if e["type"] == "utterance":
+                turns.append({"role": e["role"], "speaker": e["speaker"], "text": e["text"]})
+            elif e["type"] == "notice":
+                turns.append({"role": "system", "speaker": "system", "text": e["text"]})
+        return turns
+    if log_file and os.path.isfile(log_file):
+        return _parse_text_log(log_file)
+    return []
+
+
+def format_transcript(turns: List[dict]) -> str:
+    """Render turns back to "Speaker: text" lines (for LLM prompts)"""
+    return "\n".join(
+        t["text"] if t["role"] == "system" else f"{t['speaker']}: {t['text']}" for t in turns
+    )
+
+
+def run_metadata(events: Optional[List[dict]]) -> dict:
+    """The run_start event's fields (persona, scenario, speakers, session_id...)"""
+    for e in events or []:
+        if e["type"] == "run_start":
+            return e
+    return {}
+
+
+def rejected_items(events: Optional[List[dict]]) -> List[str]:
+    """Canonical menu items the agent said are unavailable"""
+    items = []
+    for e in events or []:
+        if e["type"] == "rejected_item" and e["item"] not in items:
+            items.append(e["item"])
+    return items
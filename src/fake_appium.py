@@ -0,0 +1,183 @@
+"""
+Fake Appium server - a minimal W3C WebDriver endpoint for exercising the
+device pool without phones.
+
+Answers enough of the protocol for AppiumDriver.start()/stop() and the
+read-only calls the flows make (timeouts, current activity/package — as
+endpoints or `mobile:` scripts — page source, screenshots, element lookups). Every session is recorded with the
+capabilities it was created with, so a test can check that each pool worker
+reached its own server with its own udid and systemPort.
+
+Usage:
+    server = FakeAppiumServer(port=4723).start()
+    ...
+    server.stop()
+
+    python -m src.fake_appium --ports 4723 4724     # serve until Ctrl-C
+"""
+import json
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+# 1x1 transparent PNG
+_BLANK_PNG = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAAC0lEQVR4nGNg"
+    "AAIAAAUAAXpeqz8AAAAASUVORK5CYII="
+)
+
+_SESSION_RE = re.compile(r"^/session/([^/]+)(/.*)?$")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_FakeHTTPServer"
+
+    def log_message(self, format, *args):  # keep test output quiet
+        pass
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def _reply(self, value, status: int = 200):
+        data = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _no_session(self, session_id: str):
+        self._reply({"error": "invalid session id", "message": f"No session {session_id}"}, 404)
+
+    def do_GET(self):
+        fake = self.server.fake
+        fake.requests.append(("GET", self.path))
+        if self.path == "/status":
+            return self._reply({"ready": True, "message": "fake appium"})
+        m = _SESSION_RE.match(self.path)
+        if not m:
+            return self._reply(None)
+        session_id, command = m.group(1), m.group(2) or ""
+        if session_id not in fake.sessions:
+            return self._no_session(session_id)
+        if command.endswith("/current_activity"):
+            return self._reply(fake.activity)
+        if command.endswith("/current_package"):
+            return self._reply(fake.package)
+        if command == "/source":
+            return self._reply(fake.page_source)
+        if command == "/screenshot":
+            return self._reply(_BLANK_PNG)
+        return self._reply(None)
+
+    def do_POST(self):
+        fake = self.server.fake
+        body = self._body()
+        fake.requests.append(("POST", self.path))
+        if self.path == "/session":
+            caps = dict((body.get("capabilities") or {}).get("alwaysMatch") or {})
+            for first in (body.get("capabilities") or {}).get("firstMatch") or []:
+                caps.update(first)
+            session_id = uuid.uuid4().hex
+            fake.sessions[session_id] = caps
+            fake.created.append(caps)
+            return self._reply({"sessionId": session_id, "capabilities": caps})
+        m = _SESSION_RE.match(self.path)
+        if m and m.group(1) not in fake.sessions:
+            return self._no_session(m.group(1))
+        if self.path.endswith("/elements"):
+            return self._reply([])
+        if self.path.endswith("/execute/sync"):
+            # Appium-Python-Client 4+ reads the current package/activity through `mobile:` scripts
+            script = body.get("script")
+            if script == "mobile: getCurrentPackage":
+                return self._reply(fake.package)
+            if script == "mobile: getCurrentActivity":
+                return self._reply(fake.activity)
+        return self._reply(None)
+
+    def do_DELETE(self):
+        fake = self.server.fake
+        fake.requests.append(("DELETE", self.path))
+        m = _SESSION_RE.match(self.path)
+        if m and not m.group(2):
+            fake.sessions.pop(m.group(1), None)
+        return self._reply(None)
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeAppiumServer"
+
+
+class FakeAppiumServer:
+    """In-process fake Appium server on localhost"""
+
+    def __init__(
+        self,
+        port: int = 0,
+        activity: str = "com.papajohns.android.MainActivity",
+        package: str = "com.papajohns.android.debug.qa",
+        page_source: str = "<hierarchy rotation=\"0\"/>",
+    ):
+        """
+        Args:
+            port:        TCP port (0 = pick a free one; see .port after start())
+            activity:    value returned for the current activity
+            package:     value returned for the current package
+            page_source: XML returned for GET /source
+        """
+        self.activity = activity
+        self.package = package
+        self.page_source = page_source
+        self.sessions: Dict[str, dict] = {}  # open sessions → capabilities
+        self.created: List[dict] = []        # capabilities of every session ever created
+        self.requests: List[tuple] = []
+        self._httpd = _FakeHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "FakeAppiumServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name=f"fake-appium-{self.port}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Serve fake Appium endpoints")
+    parser.add_argument("--ports", type=int, nargs="+", default=[4723])
+    args = parser.parse_args()
+
+    servers = [FakeAppiumServer(port).start() for port in args.ports]
+    print(f"🧪 Fake Appium listening on {', '.join(s.url for s in servers)} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for s in servers:
+            s.stop()
@@ -0,0 +1,136 @@
+"""
+Navigation fast path - open the voice ordering screen without the home screen
+
+The UI path (activate the app, scroll to "Start Voice Order", tap it) costs
+the same scrolling and waiting on every run. Debug builds can open the
+voice ordering screen directly, via a deep link or an exported activity; set
+either under `navigation:` in config/appium_config.yaml:
+
+    navigation:
+      fast_path: true
+      voice_order_deep_link: "papajohns-qa://voice-order"
+      voice_order_activity: "com.papajohns.android.VoiceOrderActivity"
+      fast_path_timeout: 8
+
+try_fast_path() fires them in that order and confirms the landing with the
+screen classifier; if neither is configured, accepted or lands on the
+voice screen in time, the caller takes the UI path. NavigationTiming
+records which path was used and, against the median of recent UI-path
+runs in the run index, how much time it saved.
+"""
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from src.screen_classifier import TARGET_SCREEN, classify
+from src.ui_hierarchy import UiSnapshot
+
+UI_PATH = "ui"
+
+
+@dataclass
+class NavigationTiming:
+    """How the run reached the voice ordering screen"""
+    path: str                                # deep_link | activity | ui
+    seconds: float
+    baseline_seconds: Optional[float] = None  # median UI-path time of recent runs
+    saved_seconds: Optional[float] = None
+    fallback_reason: Optional[str] = None     # why the fast path was not used
+
+    def to_dict(self) -> dict:
+        return {k: (round(v, 2) if isinstance(v, float) else v) for k, v in asdict(self).items()}
+
+    def index_fields(self) -> dict:
+        """Run index columns for this timing"""
+        return {
+            "navigation_path": self.path,
+            "navigation_seconds": round(self.seconds, 2),
+            "navigation_saved_seconds": round(self.saved_seconds, 2) if self.saved_seconds is not None else None,
+        }
+
+    def describe(self) -> str:
+        text = f"{self.path} {self.seconds:.1f}s"
+        if self.saved_seconds is not None:
+            text += f" (saved ~{self.saved_seconds:.1f}s vs UI path {self.baseline_seconds:.1f}s)"
+        elif self.fallback_reason:
+            text += f" ({self.fallback_reason})"
+        return text
+
+
+def _wait_for_voice_screen(driver, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if classify(UiSnapshot.capture(driver)) == TARGET_SCREEN:
+                return True
+        except Exception:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def fast_path_configured(config: dict) -> bool:
+    """True if the fast path is on and has a deep link or activity to try"""
+    nav = config.get("navigation") or {}
+    return bool(nav.get("fast_path") and (nav.get("voice_order_deep_link") or nav.get("voice_order_activity")))
+
+
+def try_fast_path(driver) -> Optional[str]:
+    """
+    Open the voice ordering screen through a deep link or activity intent.
+
+    Args:
+        driver: AppiumDriver with a running session
+
+    Returns:
+        "deep_link" or "activity" if the voice screen is showing, None if
+        the caller has to navigate through the UI (the app may then be on
+        any screen; restart it first)
+    """
+    if not fast_path_configured(driver.config):
+        return None
+    nav = driver.config["navigation"]
+    package = driver.config["capabilities"]["appPackage"]
+    timeout = float(nav.get("fast_path_timeout", 8))
+
+    attempts = []
+    if nav.get("voice_order_deep_link"):
+        attempts.append(("deep_link", "mobile: deepLink", {
+            "url": nav["voice_order_deep_link"], "package": package, "waitForLaunch": True,
+        }))
+    if nav.get("voice_order_activity"):
+        activity = nav["voice_order_activity"]
+        component = activity if "/" in activity else f"{package}/{activity}"
+        attempts.append(("activity", "mobile: startActivity", {"component": component, "wait": True}))
+
+    for path, script, params in attempts:
+        print(f"  ⚡ Fast path: {path} → {params.get('url') or params.get('component')}")
+        try:
+            driver.driver.execute_script(script, params)
+        except Exception as e:
+            print(f"  ⚠️  {path} rejected: {str(e).splitlines()[0] if str(e) else e}")
+            continue
+        if _wait_for_voice_screen(driver, timeout):
+            return path
+        print(f"  ⚠️  {path} did not reach the voice ordering screen within {timeout:.0f}s")
+    return None
+
+
+def ui_path_baseline(limit: int = 20) -> Optional[float]:
+    """Median navigation time of the last `limit` UI-path runs in the run index"""
+    try:
+        from src.run_index import get_run_index
+
+        return get_run_index().median_navigation_seconds(UI_PATH, limit)
+    except Exception:
+        return None
+
+
+def navigation_timing(path: Optional[str], seconds: float, fallback_reason: Optional[str] = None) -> NavigationTiming:
+    """NavigationTiming for a finished navigation, with the time saved for fast paths"""
+    timing = NavigationTiming(path=path or UI_PATH, seconds=seconds, fallback_reason=fallback_reason)
+    if timing.path != UI_PATH:
+        timing.baseline_seconds = ui_path_baseline()
+        if timing.baseline_seconds is not None:
+            timing.saved_seconds = timing.baseline_seconds - seconds
+    return timing
@@ -0,0 +1,35 @@
+"""
+Inter-process file lock for the small JSON stores under ~/.cache
+
+Device-pool workers (src/device_pool.py) are separate processes sharing the
+session and calibration stores; a threading.Lock only covers one of them.
+`locked(path)` takes an exclusive flock on `<path>.lock` for a
+load → modify → replace sequence:
+
+    with locked(self.path):
+        entries = self._load()
+        entries[key] = entry
+        self._save(entries)
+
+Where fcntl is unavailable (Windows) the lock is a no-op.
+"""
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def locked(path: str):
+    """Hold an exclusive lock on `<path>.lock` for the duration of the block"""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,210 @@
+"""
+Menu Catalog - canonical menu items, sizes, aliases and ASR mishearings
+
+Loads config/menu_catalog.yaml once and precomputes a flat phrase index, so
+normalising "garlic nuts", "2-liter Pepsi" or "lg pepperoni" is a dict
+lookup instead of repeated regex cleaning or an extra LLM call.
+"""
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import yaml
+
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "config",
+    "menu_catalog.yaml",
+)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]")
+
+# Spoken quantities → digits so "two liter pepsi" and "2-liter Pepsi" share a key
+_NUMBER_WORDS = {
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
+    "six": "6", "seven": "7", "eight": "8", "nine": "9", "ten": "10",
+}
+
+# How many unmatched tokens a pending quantity/size survives before it is
+# dropped, e.g. "one large thin crust pepperoni" keeps "one large".
+_PENDING_WINDOW = 3
+
+
+@dataclass(frozen=True)
+class MenuEntry:
+    """One index value: a canonical item or size"""
+
+    kind: str  # "item" | "size"
+    name: str
+    category: str = ""
+
+
+@dataclass
+class MenuMatch:
+    """A menu item recognised in free text"""
+
+    item: str
+    category: str
+    size: Optional[str] = None
+    quantity: Optional[int] = None
+    heard: str = ""
+
+    def label(self) -> str:
+        """Canonical 'quantity size item' string, e.g. '1 large pepperoni pizza'"""
+        parts = []
+        if self.quantity is not None:
+            parts.append(str(self.quantity))
+        if self.size:
+            parts.append(self.size)
+        parts.append(self.item)
+        return " ".join(parts)
+
+
+class MenuCatalog:
+    """Precomputed lookup index over the menu catalog"""
+
+    def __init__(self, data: dict):
+        self.stop_words = {str(w) for w in data.get("stop_words", [])}
+        self.token_fixes: Dict[str, str] = {
+            str(k): str(v) for k, v in (data.get("token_fixes") or {}).items()
+        }
+        self.items: Dict[str, str] = {}  # canonical item → category
+        self.index: Dict[str, MenuEntry] = {}
+        self._size_tokens: Dict[str, str] = {}  # single-token size alias → size
+
+        for size, aliases in (data.get("sizes") or {}).items():
+            entry = MenuEntry("size", size)
+            for phrase in [size] + list(aliases or []):
+                key = self.normalize(phrase)
+                self._add(key, entry)
+                if " " not in key:
+                    self._size_tokens[key] = size
+
+        for name, spec in (data.get("items") or {}).items():
+            spec = spec or {}
+            category = spec.get("category", "")
+            self.items[name] = category
+            entry = MenuEntry("item", name, category)
+            phrases = [name] + list(spec.get("aliases") or []) + list(
+                spec.get("mishearings") or []
+            )
+            for phrase in phrases:
+                self._add(self.normalize(phrase), entry)
+
+        # Singular/plural variants of every phrase, without overriding
+        # anything the catalog spells out explicitly.
+        for key, entry in list(self.index.items()):
+            variant = key[:-1] if key.endswith("s") else key + "s"
+            self.index.setdefault(variant, entry)
+
+        self.max_phrase_len = max((len(k.split()) for k in self.index), default=1)
+
+    def _add(self, key: str, entry: MenuEntry):
+        if key:
+            self.index.setdefault(key, entry)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CATALOG_PATH) -> "MenuCatalog":
+        """Load the catalog from a YAML (or JSON) file"""
+        with open(path, "r") as f:
+            return cls(yaml.safe_load(f) or {})
+
+    # ── Normalisation ──────────────────────────────────────────────
+
+    def normalize_token(self, word: str) -> str:
+        """Map a single cleaned token to its canonical spelling"""
+        word = self.token_fixes.get(word, word)
+        return self._size_tokens.get(word, word)
+
+    def tokens(self, text: str) -> List[str]:
+        """Lowercase, strip punctuation, apply token fixes and number words"""
+        words = _NON_ALNUM.sub(" ", text.lower()).split()
+        return [_NUMBER_WORDS.get(w, self.token_fixes.get(w, w)) for w in words]
+
+    def normalize(self, text: str) -> str:
+        """Normalised phrase key for index lookups"""
+        return " ".join(self.tokens(text))
+
+    def lookup(self, phrase: str) -> Optional[MenuEntry]:
+        """Resolve a phrase (alias, mishearing, size) to its catalog entry"""
+        return self.index.get(self.normalize(phrase))
+
+    def keyword_tokens(self, text: str) -> List[str]:
+        """Meaningful, normalised tokens from a text string (stop words removed)"""
+        words = (self.normalize_token(w) for w in _NON_ALNUM.sub(" ", text.lower()).split())
+        return [w for w in words if w and w not in self.stop_words]
+
+    # ── Item recognition ───────────────────────────────────────────
+
+    def find_items(self, text: str) -> List[MenuMatch]:
+        """
+        Find every menu item mentioned in text, longest phrase first.
+
+        A quantity or size directly preceding an item is attached to it:
+        "three large pepperoni pizzas" → MenuMatch(3, large, pepperoni pizza).
+        """
+        toks = self.tokens(text)
+        matches: List[MenuMatch] = []
+        quantity: Optional[int] = None
+        size: Optional[str] = None
+        idle = 0
+
+        i = 0
+        while i < len(toks):
+            entry = None
+            span = 1
+            for n in range(min(self.max_phrase_len, len(toks) - i), 0, -1):
+                entry = self.index.get(" ".join(toks[i:i + n]))
+                if entry:
+                    span = n
+                    break
+
+            if entry and entry.kind == "item":
+                matches.append(MenuMatch(
+                    item=entry.name,
+                    category=entry.category,
+                    size=size,
+                    quantity=quantity,
+                    heard=" ".join(toks[i:i + span]),
+                ))
+                quantity, size, idle = None, None, 0
+            elif entry and entry.kind == "size":
+                size, idle = entry.name, 0
+            elif toks[i].isdigit():
+                quantity, idle = int(toks[i]), 0
+            elif toks[i] not in self.stop_words:
+                idle += 1
+                if idle > _PENDING_WINDOW:
+                    quantity, size = None, None
+            i += span
+
+        return matches
+
+    def item_names(self, text: str) -> List[str]:
+        """Canonical item names mentioned in text, de-duplicated, in order"""
+        names: List[str] = []
+        for match in self.find_items(text):
+            if match.item not in names:
+                names.append(match.item)
+        return names
+
+    def canonicalize(self, text: str) -> str:
+        """
+        Rewrite an order line with canonical names, e.g.
+        "1 Large Pepperoni" → "1 large pepperoni pizza".
+        Unrecognised text (or a non-string from an LLM response) is returned unchanged.
+        """
+        if not isinstance(text, str):
+            return text
+        matches = self.find_items(text)
+        if not matches:
+            return text
+        return ", ".join(m.label() for m in matches)
+
+
+@lru_cache(maxsize=None)
+def get_menu_catalog(path: str = DEFAULT_CATALOG_PATH) -> MenuCatalog:
+    """Shared catalog instance — the index is built once per process"""
+    return MenuCatalog.load(path)
@@ -0,0 +1,189 @@
+"""
+Microphone calibration store - ambient-noise energy thresholds per mic
+
+adjust_for_ambient_noise(duration=1) on every listen() adds a second of dead
+time per turn. The store calibrates each microphone once per session, seeds
+the next run with the persisted threshold (so that calibration can be
+short), and folds in the recognizer's own dynamic threshold updates from
+background noise between phrases.
+"""
+import json
+import math
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.file_lock import locked
+
+DEFAULT_STORE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pizza-voice-test", "mic_calibration.json"
+)
+
+# speech_recognition treats audio louder than noise * ratio as speech
+DYNAMIC_ENERGY_RATIO = 1.5
+
+# Relative threshold drift below which save() leaves the file alone
+PERSIST_TOLERANCE = 0.02
+
+
+def microphone_label(mic_index: Optional[int]) -> str:
+    """Stable store key for a device index from find_microphone_index()"""
+    if mic_index is None:
+        return "default"
+    import speech_recognition as sr
+
+    names = sr.Microphone.list_microphone_names()
+    return names[mic_index] if 0 <= mic_index < len(names) else f"device-{mic_index}"
+
+
+class MicCalibrationStore:
+    """Energy thresholds keyed by microphone name, persisted as JSON"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_STORE_PATH,
+        calibration_seconds: float = 1.0,
+        recalibration_seconds: float = 0.3,
+        smoothing: float = 0.2,
+    ):
+        """
+        Args:
+            path:                  JSON file the thresholds persist to
+            calibration_seconds:   ambient sample for a mic never seen before
+            recalibration_seconds: ambient sample when a persisted value exists
+            smoothing:             weight of each new observation in the stored EMA
+        """
+        self.path = path
+        self.calibration_seconds = calibration_seconds
+        self.recalibration_seconds = recalibration_seconds
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._calibrated_this_session = set()
+        self._entries: Dict[str, dict] = self._load()
+        self._persisted = self._thresholds()  # what the file holds, to skip no-op saves
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _thresholds(self) -> Dict[str, float]:
+        return {name: entry["energy_threshold"] for name, entry in self._entries.items()}
+
+    def _changed_names(self) -> List[str]:
+        """Mics whose threshold is new or moved by more than PERSIST_TOLERANCE (caller holds the lock)"""
+        return [
+            name for name, value in self._thresholds().items()
+            if name not in self._persisted
+            or abs(value - self._persisted[name]) > PERSIST_TOLERANCE * self._persisted[name]
+        ]
+
+    @property
+    def changed(self) -> bool:
+        """True if a threshold moved by more than PERSIST_TOLERANCE since the last load/save"""
+        with self._lock:
+            return bool(self._changed_names())
+
+    def save(self):
+        """
+        Merge this process's changed thresholds into the store file, if any
+        changed. Pool workers share the file, so it is re-read under an
+        inter-process lock and only our changed entries are written over it.
+        """
+        with self._lock:
+            names = self._changed_names()
+            ours = {name: dict(self._entries[name]) for name in names}
+        if not ours:
+            return
+        try:
+            with locked(self.path):
+                entries = self._load()
+                entries.update(ours)
+                tmp = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(entries, f, indent=2, sort_keys=True)
+                os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"   ⚠️ Could not save mic calibration: {e}")
+            return
+        with self._lock:
+            for name, entry in entries.items():  # pick up other workers' mics too
+                if name not in names:
+                    self._entries[name] = entry
+            self._persisted = {name: entry["energy_threshold"] for name, entry in entries.items()}
+
+    def threshold(self, mic_name: str) -> Optional[float]:
+        with self._lock:
+            entry = self._entries.get(mic_name)
+            return entry["energy_threshold"] if entry else None
+
+    def noise_floor_db(self, mic_name: str) -> Optional[float]:
+        """Stored ambient level in dBFS-like units (as used by the energy VAD)"""
+        threshold = self.threshold(mic_name)
+        if threshold is None:
+            return None
+        return 20.0 * math.log10(max(threshold / DYNAMIC_ENERGY_RATIO, 1.0))
+
+    def observe(
+        self, mic_name: str, energy_threshold: float, persist: bool = False, replace: bool = False
+    ):
+        """
+        Fold a new threshold estimate (e.g. after a listen) into the stored value.
+
+        Args:
+            replace: overwrite instead of smoothing (fresh calibrations)
+        """
+        if not energy_threshold or energy_threshold <= 0:
+            return
+        with self._lock:
+            entry = self._entries.get(mic_name)
+            if entry is None or replace:
+                entry = self._entries[mic_name] = {"energy_threshold": energy_threshold, "samples": 0}
+            else:
+                entry["energy_threshold"] += self.smoothing * (
+                    energy_threshold - entry["energy_threshold"]
+                )
+            entry["samples"] += 1
+            entry["updated"] = datetime.now().isoformat(timespec="seconds")
+        if persist:
+            self.save()
+
+    def observe_noise_floor_db(self, mic_name: str, noise_floor_db: float, persist: bool = False):
+        """observe() for an ambient level measured by the energy VAD"""
+        self.observe(mic_name, (10.0 ** (noise_floor_db / 20.0)) * DYNAMIC_ENERGY_RATIO, persist)
+
+    def apply(self, recognizer, source, mic_name: str) -> float:
+        """
+        Set recognizer.energy_threshold for this mic, calibrating only on the
+        first use of the session. Returns the threshold in effect.
+        """
+        stored = self.threshold(mic_name)
+        if mic_name in self._calibrated_this_session and stored:
+            recognizer.energy_threshold = stored
+            return stored
+
+        if stored:
+            recognizer.energy_threshold = stored
+            duration = self.recalibration_seconds
+        else:
+            duration = self.calibration_seconds
+        print(f"   🎚️ Calibrating '{mic_name}' for ambient noise ({duration:.1f}s)...")
+        recognizer.adjust_for_ambient_noise(source, duration=duration)
+        with self._lock:
+            self._calibrated_this_session.add(mic_name)
+        self.observe(mic_name, recognizer.energy_threshold, persist=True, replace=True)
+        return recognizer.energy_threshold
+
+
+_store: Optional[MicCalibrationStore] = None
+
+
+def get_mic_calibration_store() -> MicCalibrationStore:
+    """Process-wide calibration store"""
+    global _store
+    if _store is None:
+        _store = MicCalibrationStore()
+    return _store
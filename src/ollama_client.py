@@ -1,9 +1,9 @@
 """
 Ollama Client for AI-powered test generation and evaluation
 """
-import requests
 import json
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 
 
 class OllamaClient:
@@ -16,6 +16,8 @@ class OllamaClient:
         
     def is_available(self) -> bool:
         """Check if Ollama server is running"""
+        import requests
+
         try:
             response = requests.get(f"{self.base_url}/api/tags", timeout=2)
             return response.status_code == 200
@@ -33,6 +35,8 @@ class OllamaClient:
         if system:
             payload["system"] = system
         
+        import requests
+
         try:
             response = requests.post(self.api_url, json=payload, timeout=30)
             response.raise_for_status()
@@ -41,6 +45,43 @@ class OllamaClient:
             print(f"⚠️  Ollama generation failed: {e}")
             return ""
     
+    def generate_with_timing(
+        self, prompt: str, system: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Optional[float]]]:
+        """
+        Generate with a streamed request so time-to-first-token can be measured.
+
+        Returns:
+            (response text, {"ttft": seconds to first non-empty token or None,
+                             "total": seconds until the stream finished})
+        """
+        payload = {"model": self.model, "prompt": prompt, "stream": True}
+        if system:
+            payload["system"] = system
+
+        import requests
+
+        start = time.monotonic()
+        ttft = None
+        parts = []
+        try:
+            with requests.post(self.api_url, json=payload, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    token = chunk.get("response", "")
+                    if token and ttft is None:
+                        ttft = time.monotonic() - start
+                    parts.append(token)
+                    if chunk.get("done"):
+                        break
+        except Exception as e:
+            print(f"⚠️  Ollama generation failed: {e}")
+            return "", {"ttft": ttft, "total": time.monotonic() - start}
+        return "".join(parts).strip(), {"ttft": ttft, "total": time.monotonic() - start}
+    
     def evaluate_response(self, user_input: str, agent_response: str, expected_behavior: str) -> Dict:
         """
         Use AI to evaluate if the voice agent responded appropriately
@@ -110,30 +110,14 @@ class VoiceOrderingPage:
     def _list_clickable_elements(self):
         """Helper to list all clickable elements for debugging"""
         try:
-            clickable = self.driver.driver.find_elements(
-                AppiumBy.XPATH,
-                "//*[@clickable='true']"
-            )
-            print(f"\n   Found {len(clickable)} clickable elements:")
-            for elem in clickable[:10]:  # Show first 10
-                text = elem.get_attribute('text') or elem.get_attribute('content-desc') or 'No text'
-                class_name = elem.get_attribute('class')
-                resource_id = elem.get_attribute('resource-id')
-                print(f"     - {class_name}: '{text}' (ID: {resource_id})")
+            self.driver.dump_hierarchy("clickable", clickable_only=True, print_limit=10)
         except Exception as e:
             print(f"   Error listing elements: {e}")
 
     def _list_all_elements(self):
         """Helper to list all elements on screen for debugging"""
         try:
-            all_elems = self.driver.driver.find_elements(AppiumBy.XPATH, "//*")
-            print(f"\n   Found {len(all_elems)} total elements (showing first 15):")
-            for elem in all_elems[:15]:
-                text = elem.get_attribute('text') or elem.get_attribute('content-desc') or ''
-                class_name = elem.get_attribute('class')
-                resource_id = elem.get_attribute('resource-id')
-                if text or resource_id:
-                    print(f"     - {class_name}: '{text}' (ID: {resource_id})")
+            self.driver.dump_hierarchy("all_elements", print_limit=15)
         except Exception as e:
             print(f"   Error listing elements: {e}")
 
@@ -0,0 +1,109 @@
+"""
+Report asset store - content-addressed screenshots and thumbnails for HTML reports
+
+Instead of base64-embedding full-resolution PNGs in every report, each
+screenshot is stored once under reports/assets/ by content hash, next to a
+downscaled JPEG thumbnail:
+
+    reports/assets/3f9a1c0e8b7d2a64.png         original (copied once)
+    reports/assets/3f9a1c0e8b7d2a64_w360.jpg    thumbnail shown in the report
+
+Reports reference them by relative path, so identical screens captured in
+different runs share one copy. Thumbnails need Pillow; without it the
+report links the original for both.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+DEFAULT_ASSETS_DIR = "reports/assets"
+
+
+@dataclass
+class ReportAsset:
+    """Paths of a stored screenshot, relative to the reports directory"""
+    original: str
+    thumbnail: str
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+@contextmanager
+def _replacing(dest: str):
+    """
+    Yield a unique temp path next to `dest` and move it into place on success
+    (pool workers may write the same asset at once; a shared .tmp would collide).
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dest) or ".", prefix=os.path.basename(dest) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp
+        os.replace(tmp, dest)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class ReportAssetStore:
+    """Content-addressed asset directory shared by all reports"""
+
+    def __init__(self, assets_dir: str = DEFAULT_ASSETS_DIR, thumb_width: int = 360, quality: int = 70):
+        """
+        Args:
+            assets_dir:  where originals and thumbnails live (inside the reports directory)
+            thumb_width: thumbnail width in pixels (aspect ratio kept)
+            quality:     JPEG quality for thumbnails
+        """
+        self.assets_dir = assets_dir
+        self.thumb_width = thumb_width
+        self.quality = quality
+        self.prefix = os.path.basename(os.path.normpath(assets_dir))
+        os.makedirs(assets_dir, exist_ok=True)
+        try:
+            import PIL  # noqa: F401
+            self.can_thumbnail = True
+        except ImportError:
+            print("   ⚠️ Pillow not installed — report thumbnails disabled (linking originals)")
+            self.can_thumbnail = False
+
+    def add(self, path: str) -> ReportAsset:
+        """Store a screenshot (no-op if its content is already stored)"""
+        digest = _file_digest(path)
+        ext = os.path.splitext(path)[1].lower() or ".png"
+        original = f"{digest}{ext}"
+        original_path = os.path.join(self.assets_dir, original)
+        if not os.path.isfile(original_path):
+            with _replacing(original_path) as tmp:
+                shutil.copyfile(path, tmp)
+
+        thumbnail = original
+        if self.can_thumbnail:
+            thumbnail = f"{digest}_w{self.thumb_width}.jpg"
+            thumb_path = os.path.join(self.assets_dir, thumbnail)
+            if not os.path.isfile(thumb_path):
+                self._write_thumbnail(original_path, thumb_path)
+
+        return ReportAsset(
+            original=f"{self.prefix}/{original}",
+            thumbnail=f"{self.prefix}/{thumbnail}",
+        )
+
+    def _write_thumbnail(self, source: str, dest: str):
+        from PIL import Image
+
+        with Image.open(source) as img:
+            img = img.convert("RGB")
+            if img.width > self.thumb_width:
+                height = max(1, round(img.height * self.thumb_width / img.width))
+                img = img.resize((self.thumb_width, height), Image.LANCZOS)
+            with _replacing(dest) as tmp:
+                img.save(tmp, format="JPEG", quality=self.quality, optimize=True)
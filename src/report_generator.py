@@ -1,8 +1,11 @@
 """
 HTML Test Report Generator for Papa John's Voice Ordering Tests.
 
-Generates a self-contained HTML report after each end-to-end test run.
-Screenshots are embedded as base64 data URIs when show_images=True.
+Generates an HTML report after each end-to-end test run. With
+show_images=True, screenshots are shown as thumbnails linked to full-size
+originals in the shared, content-addressed reports/assets/ store
+(image_mode="linked"), or embedded as base64 data URIs for a single
+self-contained file (image_mode="embed").
 """
 
 import base64
@@ -10,6 +13,10 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+from src.event_log import read_conversation
+from src.report_assets import ReportAssetStore
+from src.turn_timing import STAGES, load_timings
+
 # Screenshot filename stem → human-readable caption (in display order)
 SCREENSHOT_CAPTIONS = [
     ("step1_app_launched",              "Step 1: App Launched"),
@@ -24,6 +31,20 @@ SCREENSHOT_CAPTIONS = [
     ("cart_verification",               "Cart Screen"),
 ]
 
+# Turn stage → waterfall bar colour
+STAGE_COLORS = {
+    "listen_wait":     "#cbd5e1",
+    "agent_speech":    "#93c5fd",
+    "endpointing":     "#f59e0b",
+    "transcription":   "#a855f7",
+    "prompt_build":    "#64748b",
+    "llm_ttft":        "#f43f5e",
+    "llm_total":       "#fb7185",
+    "tts_first_audio": "#10b981",
+    "tts_synthesis":   "#34d399",
+    "playback":        "#0ea5e9",
+}
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
@@ -66,27 +87,11 @@ def _esc(text) -> str:
 
 def _parse_conversation(log_file: str) -> list[dict]:
     """
-    Parse conversation log into a list of turn dicts.
-    Returns: [{"speaker": "Agent"|"Ravi"|"system", "text": "..."}]
+    Conversation turns for a log, read from its .events.jsonl when present
+    (text log otherwise).
+    Returns: [{"role": "agent"|"customer"|"system", "speaker": "...", "text": "..."}]
     """
-    turns = []
-    if not log_file or not os.path.isfile(log_file):
-        return turns
-
-    with open(log_file, "r") as f:
-        for line in f:
-            line = line.rstrip("\n")
-            if line.startswith("Agent:"):
-                text = line[len("Agent:"):].strip()
-                if text:
-                    turns.append({"speaker": "Agent", "text": text})
-            elif line.startswith("Ravi:"):
-                text = line[len("Ravi:"):].strip()
-                if text:
-                    turns.append({"speaker": "Ravi", "text": text})
-            elif line.startswith("[") and line.endswith("]"):
-                turns.append({"speaker": "system", "text": line})
-    return turns
+    return read_conversation(log_file)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -187,9 +192,21 @@ def _build_styles() -> str:
                            box-shadow: 0 1px 3px rgba(0,0,0,0.06); }
       .screenshot-card img { width: 100%; display: block; object-fit: contain;
                                background: #0f172a; max-height: 420px; }
+      .screenshot-card a { display: block; }
       .screenshot-caption { padding: 8px 12px; font-size: 0.8rem; color: #64748b;
                               font-weight: 600; background: #f8fafc; }
 
+      /* Latency waterfall */
+      .waterfall { display: flex; flex-direction: column; gap: 10px; margin-bottom: 20px; }
+      .wf-row { display: grid; grid-template-columns: 110px 1fr; align-items: center; gap: 12px; }
+      .wf-label { font-size: 0.8rem; color: #475569; font-weight: 600; }
+      .wf-track { position: relative; background: #f8fafc; border-radius: 4px; }
+      .wf-bar { position: absolute; height: 8px; border-radius: 2px; min-width: 2px; }
+      .wf-legend { display: flex; flex-wrap: wrap; gap: 12px; font-size: 0.75rem;
+                    color: #64748b; margin-bottom: 14px; }
+      .wf-legend span { display: inline-flex; align-items: center; gap: 4px; }
+      .wf-legend i { width: 10px; height: 10px; border-radius: 2px; display: inline-block; }
+
       /* Reasoning box */
       .reasoning { background: #f8fafc; border-left: 4px solid #94a3b8; border-radius: 6px;
                     padding: 12px 16px; font-size: 0.88rem; color: #475569; margin-top: 16px; }
@@ -232,6 +249,12 @@ def _build_config(metadata: dict) -> str:
         ("Microphone", mic),
         ("Session ID", session_id),
     ]
+    nav = metadata.get("navigation")
+    if nav:
+        text = f"{nav['path']} · {nav['seconds']:.1f}s"
+        if nav.get("saved_seconds") is not None:
+            text += f" · saved ~{nav['saved_seconds']:.1f}s vs UI path"
+        rows.append(("Navigation", _esc(text)))
     rows_html = []
     for k, v in rows:
         if k == "Session ID" and v and v != "—":
@@ -367,14 +390,14 @@ def _build_conversation(log_file: str) -> str:
 
     bubbles = []
     for turn in turns:
-        speaker = turn["speaker"]
-        text    = _esc(turn["text"])
-        if speaker == "system":
+        role = turn["role"]
+        text = _esc(turn["text"])
+        if role == "system":
             bubbles.append(
                 f'<div class="bubble-wrap agent">'
                 f'<div class="bubble system">{text}</div></div>'
             )
-        elif speaker == "Agent":
+        elif role == "agent":
             bubbles.append(
                 f'<div class="bubble-wrap agent">'
                 f'<div class="speaker-label">Voice Agent</div>'
@@ -383,7 +406,7 @@ def _build_conversation(log_file: str) -> str:
         else:
             bubbles.append(
                 f'<div class="bubble-wrap ravi">'
-                f'<div class="speaker-label">Ravi (AI Customer)</div>'
+                f'<div class="speaker-label">{_esc(turn["speaker"])} (AI Customer)</div>'
                 f'<div class="bubble ravi">{text}</div></div>'
             )
 
@@ -395,19 +418,77 @@ def _build_conversation(log_file: str) -> str:
 """
 
 
-def _build_screenshots(screenshot_dir: str) -> str:
+def _build_latency(timings: dict | None) -> str:
+    """Per-turn waterfall of stage spans plus a p50/p95 table"""
+    if not timings or not timings.get("turns"):
+        return ""
+    turns = timings["turns"]
+    scale = max(t["total"] for t in turns) or 1.0
+    stage_order = {name: i for i, name in enumerate(STAGES)}
+
+    rows = []
+    for t in turns:
+        spans = sorted(t["spans"], key=lambda s: stage_order.get(s["name"], len(stage_order)))
+        bars = []
+        for lane, span in enumerate(spans):
+            left = 100.0 * span["start"] / scale
+            width = 100.0 * span["seconds"] / scale
+            color = STAGE_COLORS.get(span["name"], "#94a3b8")
+            bars.append(
+                f'<div class="wf-bar" title="{_esc(span["name"])}: {span["seconds"] * 1000:.0f} ms" '
+                f'style="left:{left:.2f}%;width:{width:.2f}%;top:{lane * 10 + 2}px;'
+                f'background:{color};"></div>'
+            )
+        rows.append(
+            f'<div class="wf-row"><div class="wf-label">Turn {t["turn"]} · {t["total"]:.1f}s</div>'
+            f'<div class="wf-track" style="height:{len(spans) * 10 + 4}px;">{"".join(bars)}</div></div>'
+        )
+
+    summary = timings.get("summary") or {}
+    legend = "".join(
+        f'<span><i style="background:{STAGE_COLORS[name]};"></i>{_esc(name)}</span>'
+        for name in STAGES if name in summary
+    )
+    stat_rows = "".join(
+        f'<tr><td>{_esc(name)}</td><td>{s["count"]}</td><td>{s["p50"] * 1000:.0f} ms</td>'
+        f'<td>{s["p95"] * 1000:.0f} ms</td><td>{s["mean"] * 1000:.0f} ms</td></tr>'
+        for name, s in summary.items()
+    )
+
+    return f"""
+    <div class="section">
+      <h2>Turn Latency ({len(turns)} turns)</h2>
+      <div class="wf-legend">{legend}</div>
+      <div class="waterfall">{''.join(rows)}</div>
+      <table class="items-table">
+        <thead><tr><th>Stage</th><th>Turns</th><th>p50</th><th>p95</th><th>Mean</th></tr></thead>
+        <tbody>{stat_rows}</tbody>
+      </table>
+    </div>
+"""
+
+
+def _build_screenshots(screenshot_dir: str, image_mode: str = "linked", assets_dir: str = "reports/assets") -> str:
+    store = ReportAssetStore(assets_dir) if image_mode == "linked" else None
     cards = []
     for stem, caption in SCREENSHOT_CAPTIONS:
         path = os.path.join(screenshot_dir, f"{stem}.png")
         if not os.path.isfile(path):
             continue
         try:
-            b64 = _img_to_base64(path)
+            if store:
+                asset = store.add(path)
+                img = (
+                    f'<a href="{_esc(asset.original)}" target="_blank">'
+                    f'<img src="{_esc(asset.thumbnail)}" alt="{_esc(caption)}" loading="lazy"></a>'
+                )
+            else:
+                img = f'<img src="data:image/png;base64,{_img_to_base64(path)}" alt="{_esc(caption)}">'
         except Exception:
             continue
         cards.append(f"""
         <div class="screenshot-card">
-          <img src="data:image/png;base64,{b64}" alt="{_esc(caption)}">
+          {img}
           <div class="screenshot-caption">{_esc(caption)}</div>
         </div>""")
 
@@ -433,24 +514,31 @@ def generate_html_report(
     metadata: dict,
     phase_statuses: dict,
     screenshot_dir: str,
+    image_mode: str = "linked",
 ) -> str:
     """
-    Generate a self-contained HTML test report.
+    Generate an HTML test report.
 
     Args:
         results:        dict from verify_order() — passed, score, matched/missing/extra, overview
-        log_file:       path to conversation log (logs/test_run_*.txt) or None
-        show_images:    if True, embed screenshots as base64 in the report
-        metadata:       dict with keys: persona, scenario, mic, start_time, end_time
+        log_file:       path to conversation log (logs/test_run_*.txt) or None;
+                        its .timings.json sidecar (if any) drives the latency section
+        show_images:    if True, include screenshots in the report
+        metadata:       dict with keys: persona, scenario, mic, start_time, end_time,
+                        navigation (NavigationTiming.to_dict(), optional)
         phase_statuses: dict with keys: navigation, conversation, verification
                         each value is "passed" | "failed" | "skipped"
         screenshot_dir: directory where Appium screenshots are saved
+        image_mode:     "linked" — thumbnails linking to originals in reports/assets/;
+                        "embed"  — full-size base64 images, self-contained file
 
     Returns:
         Absolute path to the generated HTML file (inside reports/)
     """
     passed = results.get("passed", False)
     score  = results.get("score", 0)
+    reports_dir = Path("reports")
+    reports_dir.mkdir(exist_ok=True)
 
     html = f"""<!DOCTYPE html>
 <html lang="en">
@@ -466,7 +554,8 @@ def generate_html_report(
   {_build_phases(phase_statuses)}
   {_build_verification(results)}
   {_build_conversation(log_file or '')}
-  {_build_screenshots(screenshot_dir) if show_images else ''}
+  {_build_latency(load_timings(log_file))}
+  {_build_screenshots(screenshot_dir, image_mode, str(reports_dir / "assets")) if show_images else ''}
   <div style="text-align:center;padding:24px 0 32px;color:#94a3b8;font-size:0.8rem;">
     Generated by pizza-voice-test &nbsp;|&nbsp;
     {metadata.get('end_time', datetime.now()).strftime('%Y-%m-%d %H:%M:%S')}
@@ -475,8 +564,6 @@ def generate_html_report(
 </html>"""
 
     # Save report
-    reports_dir = Path("reports")
-    reports_dir.mkdir(exist_ok=True)
     ts = metadata.get("end_time", datetime.now()).strftime("%Y%m%d_%H%M%S")
     report_path = reports_dir / f"report_{ts}.html"
     report_path.write_text(html, encoding="utf-8")
@@ -0,0 +1,165 @@
+"""
+Machine-readable run results: compact JSON plus JUnit XML
+
+Written next to the HTML report for every full-flow run, whether it passed,
+failed or crashed part-way:
+
+    reports/<run_id>.results.json   schema-versioned summary for aggregators
+    reports/<run_id>.junit.xml      one testcase per phase for CI systems
+
+The JSON carries phase statuses, the verification outcome, per-turn stage
+timings (from the .timings.json sidecar) and references to every artifact
+of the run, so nothing downstream has to parse the HTML or text logs.
+"""
+import json
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Optional, Tuple
+
+from src.event_log import events_path_for
+from src.turn_timing import load_timings, timings_path_for
+
+SCHEMA_VERSION = 1
+PHASES = ["navigation", "conversation", "verification"]
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat(timespec="seconds") if isinstance(value, datetime) else value
+
+
+def _artifacts(log_file: Optional[str], report_path: Optional[str], index_row: Optional[dict]) -> dict:
+    """Artifact paths, preferring what the run index recorded"""
+    row = index_row or {}
+    artifacts = {
+        "log": row.get("log_file") or log_file,
+        "events": row.get("events_file"),
+        "timings": row.get("timings_file"),
+        "verification": row.get("verification_file"),
+        "report": report_path or row.get("report_file"),
+    }
+    if log_file:
+        for key, path in (("events", events_path_for(log_file)), ("timings", timings_path_for(log_file))):
+            if not artifacts[key] and os.path.isfile(path):
+                artifacts[key] = path
+    return {k: v for k, v in artifacts.items() if v}
+
+
+def build_results_document(
+    run_id: str,
+    results: dict,
+    phase_statuses: dict,
+    metadata: dict,
+    log_file: Optional[str] = None,
+    report_path: Optional[str] = None,
+    index_row: Optional[dict] = None,
+) -> dict:
+    """
+    Args:
+        run_id:         run identifier (conversation log stem)
+        results:        dict from verify_order()
+        phase_statuses: {navigation, conversation, verification} → passed|failed|skipped
+        metadata:       persona, scenario, session_id, navigation, start_time, end_time
+        log_file:       conversation log, if the conversation produced one
+        report_path:    HTML report, if generated
+        index_row:      the run's row from the run index, for artifact paths
+
+    Returns:
+        JSON-serialisable results document
+    """
+    start, end = metadata.get("start_time"), metadata.get("end_time")
+    verified = phase_statuses.get("verification", "skipped") != "skipped"
+    timings = load_timings(log_file) or {}
+    return {
+        "schema": SCHEMA_VERSION,
+        "run_id": run_id,
+        "persona": metadata.get("persona") or "default",
+        "scenario": metadata.get("scenario"),
+        "session_id": metadata.get("session_id"),
+        "started_at": _iso(start),
+        "ended_at": _iso(end),
+        "duration_seconds": round((end - start).total_seconds(), 1)
+        if isinstance(start, datetime) and isinstance(end, datetime) else None,
+        "passed": verified and bool(results.get("passed")),  # same as the run's exit status
+        "phases": {p: phase_statuses.get(p, "skipped") for p in PHASES},
+        "navigation": metadata.get("navigation"),  # path, seconds, saved_seconds (src/fast_path.py)
+        "verification": {
+            "passed": bool(results.get("passed")),
+            "score": results.get("score"),
+            "matched_items": results.get("matched_items", []),
+            "missing_items": results.get("missing_items", []),
+            "extra_items": results.get("extra_items", []),
+            "reasoning": results.get("reasoning"),
+            "overview": results.get("overview") or {},
+            "stages": results.get("stage_timings"),  # order-screen scrape/match spans
+            "short_circuit": results.get("short_circuit"),
+        } if verified else None,
+        "timings": {
+            "summary": timings.get("summary") or {},
+            "turns": timings.get("turns") or [],
+        },
+        "artifacts": _artifacts(log_file, report_path, index_row),
+    }
+
+
+def build_junit_xml(doc: dict) -> ET.ElementTree:
+    """JUnit XML for a results document: one testcase per phase"""
+    statuses = doc["phases"].values()
+    suite = ET.Element("testsuite", {
+        "name": "voice_order",
+        "tests": str(len(doc["phases"])),
+        "failures": str(sum(1 for s in statuses if s == "failed")),
+        "skipped": str(sum(1 for s in statuses if s == "skipped")),
+        "errors": "0",
+        "timestamp": doc["started_at"] or "",
+        "time": str(doc["duration_seconds"] or 0),
+    })
+    props = ET.SubElement(suite, "properties")
+    for key in ("run_id", "persona", "scenario", "session_id"):
+        if doc.get(key):
+            ET.SubElement(props, "property", {"name": key, "value": str(doc[key])})
+    verification = doc["verification"]
+    if verification:
+        ET.SubElement(props, "property", {"name": "score", "value": str(verification["score"])})
+    for name, path in doc["artifacts"].items():
+        ET.SubElement(props, "property", {"name": f"artifact.{name}", "value": str(path)})
+
+    for phase, status in doc["phases"].items():
+        case = ET.SubElement(suite, "testcase", {
+            "classname": f"voice_order.{doc['persona']}",
+            "name": phase,
+        })
+        if status == "skipped":
+            ET.SubElement(case, "skipped")
+        elif status == "failed":
+            message = f"{phase} failed"
+            if phase == "verification" and verification:
+                message = (f"score {verification['score']}/100; "
+                           f"missing {verification['missing_items']}; extra {verification['extra_items']}")
+            failure = ET.SubElement(case, "failure", {"message": message})
+            if phase == "verification" and verification:
+                failure.text = verification["reasoning"] or ""
+    return ET.ElementTree(suite)
+
+
+def write_run_results(out_dir: str = "reports", **kwargs) -> Tuple[str, str]:
+    """
+    Write <run_id>.results.json and <run_id>.junit.xml.
+
+    Args:
+        out_dir: output directory
+        kwargs:  build_results_document() arguments
+
+    Returns:
+        (json_path, junit_path)
+    """
+    doc = build_results_document(**kwargs)
+    os.makedirs(out_dir, exist_ok=True)
+    json_path = os.path.join(out_dir, f"{doc['run_id']}.results.json")
+    junit_path = os.path.join(out_dir, f"{doc['run_id']}.junit.xml")
+    with open(json_path, "w") as f:
+        json.dump(doc, f, separators=(",", ":"))
+    tree = build_junit_xml(doc)
+    ET.indent(tree)
+    tree.write(junit_path, encoding="utf-8", xml_declaration=True)
+    return json_path, junit_path
@@ -0,0 +1,298 @@
+"""
+Run index - SQLite catalogue of test runs and their artifacts
+
+Every run is recorded at write time (persona, scenario, session ID, phase
+statuses, score, turn latency and artifact paths) in logs/run_index.sqlite3,
+so "latest run" and "failures by persona" are indexed queries instead of
+globbing and sorting logs/ and reports/. backfill() imports runs that
+predate the index from the files on disk.
+
+Usage:
+    python -m src.run_index backfill
+    python -m src.run_index latest
+    python -m src.run_index failures
+"""
+import glob
+import json
+import os
+import re
+import sqlite3
+import statistics
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_DB_PATH = "logs/run_index.sqlite3"
+
+_COLUMNS = [
+    ("run_id", "TEXT PRIMARY KEY"),  # conversation log stem, e.g. test_run_20260218_113414
+    ("started_at", "TEXT"),
+    ("ended_at", "TEXT"),
+    ("persona", "TEXT"),
+    ("scenario", "TEXT"),
+    ("session_id", "TEXT"),
+    ("device", "TEXT"),
+    ("passed", "INTEGER"),
+    ("score", "REAL"),
+    ("phase_navigation", "TEXT"),
+    ("phase_conversation", "TEXT"),
+    ("phase_verification", "TEXT"),
+    ("navigation_path", "TEXT"),  # deep_link | activity | ui (src/fast_path.py)
+    ("navigation_seconds", "REAL"),
+    ("navigation_saved_seconds", "REAL"),
+    ("end_reason", "TEXT"),
+    ("turns", "INTEGER"),
+    ("turn_p50", "REAL"),
+    ("turn_p95", "REAL"),
+    ("log_file", "TEXT"),
+    ("events_file", "TEXT"),
+    ("timings_file", "TEXT"),
+    ("report_file", "TEXT"),
+    ("verification_file", "TEXT"),
+    ("updated_at", "TEXT"),  # last write, lets readers pick up only changed runs
+]
+COLUMN_NAMES = [name for name, _ in _COLUMNS]
+
+_TS_RE = re.compile(r"(\d{8}_\d{6})")
+
+
+def run_id_for(log_file: str) -> str:
+    """Run ID for a conversation log path"""
+    return os.path.splitext(os.path.basename(str(log_file)))[0]
+
+
+def _ts_from_name(path: str) -> Optional[str]:
+    """ISO timestamp from a *_YYYYMMDD_HHMMSS.* filename"""
+    m = _TS_RE.search(os.path.basename(path))
+    if not m:
+        return None
+    return datetime.strptime(m.group(1), "%Y%m%d_%H%M%S").isoformat()
+
+
+class RunIndex:
+    """SQLite-backed run catalogue (one connection per instance, thread-safe)"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                + ", ".join(f"{name} {kind}" for name, kind in _COLUMNS)
+                + ")"
+            )
+            existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(runs)")}
+            for name, kind in _COLUMNS:
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE runs ADD COLUMN {name} {kind}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS runs_updated ON runs (updated_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS runs_persona ON runs (persona, passed)")
+
+    def close(self):
+        self._conn.close()
+
+    # ── Writes ────────────────────────────────────────────────────
+
+    def record_run(self, run_id: str, **fields) -> dict:
+        """Insert or update a run; only the given (non-None) fields are changed"""
+        fields = {k: v for k, v in fields.items() if k in COLUMN_NAMES and v is not None}
+        if isinstance(fields.get("passed"), bool):
+            fields["passed"] = int(fields["passed"])
+        for key in ("started_at", "ended_at"):
+            if isinstance(fields.get(key), datetime):
+                fields[key] = fields[key].isoformat(timespec="seconds")
+        fields["updated_at"] = datetime.now().isoformat(timespec="microseconds")
+        columns = ["run_id"] + list(fields)
+        updates = ", ".join(f"{k} = excluded.{k}" for k in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO runs ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)}) "
+                f"ON CONFLICT(run_id) DO UPDATE SET {updates}",
+                [run_id] + list(fields.values()),
+            )
+        return self.get(run_id)
+
+    def record_from_log(self, log_file: str, **fields) -> dict:
+        """record_run() for a conversation log, filling artifact paths and timing stats"""
+        from src.event_log import events_path_for, read_events, run_metadata
+        from src.turn_timing import load_timings, timings_path_for
+
+        fields.setdefault("log_file", str(log_file))
+        if os.path.isfile(events_path_for(log_file)):
+            fields.setdefault("events_file", events_path_for(log_file))
+            events = read_events(log_file)
+            meta = run_metadata(events)
+            for key in ("persona", "scenario", "session_id"):
+                if fields.get(key) is None and meta.get(key):
+                    fields[key] = meta[key]
+            for e in events:
+                if e["type"] == "run_end":
+                    fields.setdefault("end_reason", e.get("reason"))
+                    fields.setdefault("turns", e.get("turns"))
+        timings = load_timings(log_file)
+        if timings:
+            fields.setdefault("timings_file", timings_path_for(log_file))
+            turn = (timings.get("summary") or {}).get("turn")
+            if turn:
+                fields.setdefault("turn_p50", turn["p50"])
+                fields.setdefault("turn_p95", turn["p95"])
+        fields.setdefault("started_at", _ts_from_name(log_file))
+        return self.record_run(run_id_for(log_file), **fields)
+
+    # ── Queries ───────────────────────────────────────────────────
+
+    def get(self, run_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def latest_run(self, require_log: bool = True) -> Optional[dict]:
+        """Most recently started run (with a conversation log on disk, by default)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM runs ORDER BY started_at DESC LIMIT 20"
+            ).fetchall()
+        for row in rows:
+            if not require_log or (row["log_file"] and os.path.isfile(row["log_file"])):
+                return dict(row)
+        return None
+
+    def runs(self, persona: Optional[str] = None, limit: int = 50) -> List[dict]:
+        query, args = "SELECT * FROM runs", []
+        if persona is not None:
+            query, args = query + " WHERE persona = ?", [persona]
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY started_at DESC LIMIT ?", args + [limit])
+            return [dict(r) for r in rows.fetchall()]
+
+    def runs_updated_since(self, since: Optional[str] = None) -> List[dict]:
+        """Runs written after `since` (an updated_at value), oldest first; all runs if None"""
+        query, args = "SELECT * FROM runs", []
+        if since:
+            query, args = query + " WHERE updated_at > ?", [since]
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY started_at", args).fetchall()
+        return [dict(r) for r in rows]
+
+    def median_navigation_seconds(self, path: str = "ui", limit: int = 20) -> Optional[float]:
+        """Median navigation time of the most recent `limit` runs that took `path`"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT navigation_seconds FROM runs WHERE navigation_path = ? "
+                "AND navigation_seconds IS NOT NULL ORDER BY started_at DESC LIMIT ?",
+                (path, limit),
+            ).fetchall()
+        return statistics.median(r[0] for r in rows) if rows else None
+
+    def failures_by_persona(self) -> List[dict]:
+        """[{persona, runs, failures, last_failure}] for personas with failed runs"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT COALESCE(persona, 'default') AS persona, COUNT(*) AS runs, "
+                "SUM(CASE WHEN passed = 0 THEN 1 ELSE 0 END) AS failures, "
+                "MAX(CASE WHEN passed = 0 THEN started_at END) AS last_failure "
+                "FROM runs GROUP BY COALESCE(persona, 'default') "
+                "HAVING failures > 0 ORDER BY failures DESC, last_failure DESC"
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    # ── Backfill ──────────────────────────────────────────────────
+
+    def backfill(self, logs_dir: str = "logs", reports_dir: str = "reports") -> int:
+        """
+        Import runs that predate the index. Verification logs and HTML reports
+        are attached to the latest run that started before them.
+
+        Returns:
+            number of runs recorded
+        """
+        logs = sorted(glob.glob(os.path.join(logs_dir, "test_run_*.txt")))
+        starts = []
+        for log_file in logs:
+            header = _read_header(log_file)
+            persona = header.get("Persona")
+            started = header.get("Time")
+            started = started.replace(" ", "T") if started else _ts_from_name(log_file)
+            self.record_from_log(
+                log_file, persona=None if persona == "default" else persona, started_at=started
+            )
+            starts.append((started, run_id_for(log_file)))
+        starts.sort()
+
+        def owner(path):
+            ts = _ts_from_name(path)
+            candidates = [run for start, run in starts if ts and start and start <= ts]
+            return candidates[-1] if candidates else None
+
+        for path in sorted(glob.glob(os.path.join(logs_dir, "order_verification_*.txt"))):
+            run_id = owner(path)
+            if run_id:
+                results = _read_verification(path)
+                self.record_run(
+                    run_id,
+                    verification_file=path,
+                    passed=results.get("passed"),
+                    score=results.get("score"),
+                    ended_at=_ts_from_name(path),
+                )
+        for path in sorted(glob.glob(os.path.join(reports_dir, "report_*.html"))):
+            run_id = owner(path)
+            if run_id:
+                self.record_run(run_id, report_file=path)
+        return len(logs)
+
+
+def _read_header(log_file: str) -> Dict[str, str]:
+    header = {}
+    with open(log_file, "r") as f:
+        for line in f:
+            if line.startswith("---") or not line.strip():
+                break
+            key, _, value = line.partition(":")
+            header[key.strip()] = value.strip()
+    return header
+
+
+def _read_verification(path: str) -> dict:
+    with open(path, "r") as f:
+        text = f.read()
+    try:
+        return json.loads(text[text.index("{"):])
+    except ValueError:
+        m = re.search(r"Result: (PASSED|FAILED) \(Score: ([\d.]+)/100\)", text)
+        return {"passed": m.group(1) == "PASSED", "score": float(m.group(2))} if m else {}
+
+
+_index: Optional[RunIndex] = None
+
+
+def get_run_index() -> RunIndex:
+    """Process-wide RunIndex at DEFAULT_DB_PATH"""
+    global _index
+    if _index is None:
+        _index = RunIndex()
+    return _index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query or backfill the run index")
+    parser.add_argument("command", choices=["backfill", "latest", "failures"])
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+
+    index = RunIndex(args.db)
+    if args.command == "backfill":
+        print(f"Indexed {index.backfill()} runs into {args.db}")
+    elif args.command == "latest":
+        print(json.dumps(index.latest_run(require_log=False), indent=2))
+    else:
+        for row in index.failures_by_persona():
+            print(f"{row['persona']:<24} {row['failures']:>4}/{row['runs']:<4} "
+                  f"last failure {row['last_failure']}")
@@ -0,0 +1,153 @@
+"""
+Screen classifier and navigation table for the Papa John's app
+
+classify() names the current screen from one UiSnapshot by checking
+precomputed signatures (label patterns that must / must not be present, plus
+a minimum number of input fields) in priority order — dialogs before the
+screens they cover. TRANSITIONS is the app's navigation graph: for each
+screen, the actions that leave it and the screen each one leads to. The
+shortest path from every screen to the voice agent is computed once, at
+import, by a reverse breadth-first search, so a navigator only has to ask
+next_transition(screen) after each snapshot:
+
+    snapshot = UiSnapshot.capture(driver)
+    screen = classify(snapshot)                  # e.g. "home"
+    step = next_transition(screen)               # Transition("open_carryout_banner", ...)
+
+Patterns follow src.ui_hierarchy: lowercase, "=label" for a whole label,
+anything else for a substring.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from src.ui_hierarchy import UiSnapshot
+
+TARGET_SCREEN = "voice_agent"
+UNKNOWN_SCREEN = "unknown"
+
+
+@dataclass(frozen=True)
+class ScreenSignature:
+    """
+    How to recognise a screen.
+
+    require: groups of patterns; every group needs at least one match
+    exclude: patterns that must not match
+    min_inputs: minimum number of EditText fields
+    """
+    name: str
+    require: Tuple[Tuple[str, ...], ...]
+    exclude: Tuple[str, ...] = ()
+    min_inputs: int = 0
+
+    def matches(self, snapshot: UiSnapshot, inputs: int) -> bool:
+        if inputs < self.min_inputs:
+            return False
+        if any(snapshot.has(p) for p in self.exclude):
+            return False
+        return all(any(snapshot.has(p) for p in group) for group in self.require)
+
+
+@dataclass(frozen=True)
+class Transition:
+    """An action available on a screen and the screen it leads to"""
+    action: str
+    leads_to: str
+    tap: Optional[str] = None  # label pattern to tap; None = the navigator handles `action` itself
+
+
+# Priority order: the first matching signature wins
+SIGNATURES: List[ScreenSignature] = [
+    ScreenSignature(
+        "voice_agent",
+        require=(("pizza assistant", "listening", "how can i help", "welcome to papa john",
+                  "microphone", "speak", "talk"),),
+        exclude=("start voice order",),
+    ),
+    ScreenSignature("samsung_pass", require=(("samsung pass",),)),
+    ScreenSignature("post_login_dialog", require=(("=no",), ("=yes",))),
+    ScreenSignature("qa_environment", require=(("=qa",),)),
+    ScreenSignature("login_form", require=(("=log in",),), min_inputs=2),
+    ScreenSignature("login_prompt", require=(("=log in",),)),
+    ScreenSignature("onboarding", require=(("=continue",),)),
+    ScreenSignature("store_detail", require=(("carryout from this store",),)),
+    ScreenSignature("store_list", require=(("miles",), ("online ordering",))),
+    ScreenSignature("order_screen", require=(("start voice order",),)),
+    ScreenSignature("home", require=(("carryout",), ("asap",))),
+    ScreenSignature("order_type", require=(("=carryout",),)),
+]
+
+# Screens only seen before the app is set up (QA environment, login, ...)
+SETUP_SCREENS = {"qa_environment", "onboarding", "login_prompt", "login_form", "post_login_dialog", "samsung_pass"}
+
+TRANSITIONS: Dict[str, List[Transition]] = {
+    "qa_environment": [Transition("select_qa_environment", "onboarding", tap="=qa")],
+    "onboarding": [Transition("continue", "login_prompt", tap="=continue")],
+    "login_prompt": [Transition("open_login", "login_form", tap="=log in")],
+    "login_form": [Transition("enter_credentials", "post_login_dialog")],
+    "post_login_dialog": [Transition("dismiss_dialog", "order_type", tap="=no")],
+    "samsung_pass": [Transition("dismiss_samsung_pass", "order_type", tap="never use samsung pass")],
+    "order_type": [Transition("select_carryout", "store_list", tap="=carryout")],
+    "store_list": [Transition("select_location", "store_detail", tap="online ordering")],
+    "store_detail": [Transition("carryout_from_store", "order_screen", tap="carryout from this store")],
+    "home": [Transition("open_carryout_banner", "order_screen", tap="asap")],
+    "order_screen": [Transition("start_voice_order", TARGET_SCREEN, tap="start voice order")],
+}
+
+
+def _shortest_paths(target: str) -> Dict[str, Tuple[int, Transition]]:
+    """screen → (steps to target, first transition) by BFS over reversed edges"""
+    incoming: Dict[str, List[Tuple[str, Transition]]] = {}
+    for screen, transitions in TRANSITIONS.items():
+        for t in transitions:
+            incoming.setdefault(t.leads_to, []).append((screen, t))
+    best: Dict[str, Tuple[int, Transition]] = {}
+    queue = deque([(target, 0)])
+    seen = {target}
+    while queue:
+        screen, dist = queue.popleft()
+        for source, transition in incoming.get(screen, []):
+            if source not in seen:
+                seen.add(source)
+                best[source] = (dist + 1, transition)
+                queue.append((source, dist + 1))
+    return best
+
+
+_PATHS = _shortest_paths(TARGET_SCREEN)
+
+
+def classify(snapshot: UiSnapshot) -> str:
+    """Name of the screen in the snapshot, or UNKNOWN_SCREEN"""
+    inputs = snapshot.count("android.widget.EditText")
+    for signature in SIGNATURES:
+        if signature.matches(snapshot, inputs):
+            return signature.name
+    return UNKNOWN_SCREEN
+
+
+def next_transition(screen: str) -> Optional[Transition]:
+    """First action on the shortest known path from `screen` to the voice agent"""
+    entry = _PATHS.get(screen)
+    return entry[1] if entry else None
+
+
+def steps_to_target(screen: str) -> Optional[int]:
+    """Number of actions between `screen` and the voice agent (0 = there)"""
+    if screen == TARGET_SCREEN:
+        return 0
+    entry = _PATHS.get(screen)
+    return entry[0] if entry else None
+
+
+def plan(screen: str) -> List[Transition]:
+    """Full shortest path from `screen` (assuming every action lands as expected)"""
+    path = []
+    while screen != TARGET_SCREEN:
+        transition = next_transition(screen)
+        if transition is None or len(path) > len(TRANSITIONS):
+            break
+        path.append(transition)
+        screen = transition.leads_to
+    return path
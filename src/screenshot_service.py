@@ -0,0 +1,123 @@
+"""
+Screenshot service - decode and write screenshots off the main thread
+
+`save_screenshot` blocks for the device capture, the base64 transfer, the
+decode and the file write. The capture itself has to stay on the caller's
+thread: the screenshot must show the screen at call time (not after the
+next swipe), and the session is not shared between threads. So
+AppiumDriver.take_screenshot() fetches the base64 and hands it here; a
+single worker thread decodes and writes each PNG (atomically, via a temp
+file) in submission order. Anything that reads the files — the HTML report,
+a session hand-back — calls flush() first.
+
+LazyScreenshot is the screenshot handle in AppiumDriver.get_screen_state():
+nothing is fetched until .base64 or .png is read.
+"""
+import base64
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import List, Optional
+
+
+class LazyScreenshot:
+    """Screenshot of the current screen, fetched on first access"""
+
+    def __init__(self, driver):
+        self._driver = driver  # AppiumDriver
+        self._base64: Optional[str] = None
+
+    @property
+    def fetched(self) -> bool:
+        return self._base64 is not None
+
+    @property
+    def base64(self) -> str:
+        if self._base64 is None:
+            self._base64 = self._driver.driver.get_screenshot_as_base64()
+        return self._base64
+
+    @property
+    def png(self) -> bytes:
+        return base64.b64decode(self.base64)
+
+    def __str__(self) -> str:  # code that used the base64 string directly keeps working
+        return self.base64
+
+
+class ScreenshotService:
+    """Background screenshot writer (one worker thread, submission order)"""
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+        self.background_seconds = 0.0
+
+    def _write(self, png_base64: str, path: str) -> str:
+        started = time.monotonic()
+        try:
+            png = base64.b64decode(png_base64)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(png)
+            os.replace(tmp, path)
+            self.written += 1
+            return path
+        except Exception as e:
+            self.failed += 1
+            print(f"⚠️  Screenshot {os.path.basename(path)} failed: {e}")
+            raise
+        finally:
+            self.background_seconds += time.monotonic() - started
+
+    def submit(self, png_base64: str, path: str) -> Future:
+        """
+        Queue a captured screenshot for decoding and writing.
+
+        Args:
+            png_base64: screenshot as returned by get_screenshot_as_base64()
+            path:       PNG file to write
+
+        Returns:
+            Future resolving to `path` once the file is written
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+            future = self._executor.submit(self._write, png_base64, path)
+            self._pending = [f for f in self._pending if not f.done()] + [future]
+        return future
+
+    def flush(self, timeout: Optional[float] = 30) -> bool:
+        """Wait for queued screenshots; True if all finished within `timeout`"""
+        with self._lock:
+            pending = list(self._pending)
+        if not pending:
+            return True
+        done, not_done = wait(pending, timeout=timeout)
+        if not_done:
+            print(f"⚠️  {len(not_done)} screenshot(s) still pending after {timeout}s")
+        return not not_done
+
+    def shutdown(self):
+        self.flush()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_service: Optional[ScreenshotService] = None
+
+
+def get_screenshot_service() -> ScreenshotService:
+    """Process-wide ScreenshotService"""
+    global _service
+    if _service is None:
+        _service = ScreenshotService()
+    return _service
@@ -0,0 +1,176 @@
+"""
+Appium session broker - keep a warm driver session between runs
+
+Creating a webdriver.Remote session (and starting the UiAutomator2 server on
+the phone) costs many seconds. With `appium.reuse_session: true`, a run that
+finishes returns its session to the broker instead of quitting it; the next
+run on the same server + device leases it back, checks it is still healthy,
+resets the app (terminate + relaunch) and carries on.
+
+Sessions are recorded in ~/.cache/pizza-voice-test/appium_sessions.json so
+they survive between separate invocations; the Appium server keeps them
+alive for `newCommandTimeout` seconds, and the broker never hands out a
+session idle for longer than `appium.session_max_idle_seconds`.
+
+    driver = AppiumDriver(config_path).lease()   # warm session or a new one
+    ...
+    driver.release()                              # back to the broker
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from src.file_lock import locked
+
+DEFAULT_STORE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pizza-voice-test", "appium_sessions.json"
+)
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SessionBroker:
+    """Warm Appium sessions keyed by server URL and device, persisted as JSON"""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.reused = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def key_for(config: dict) -> str:
+        caps = config.get("capabilities") or {}
+        device = caps.get("udid") or caps.get("deviceName") or "default"
+        return f"{config['appium']['server_url']}|{device}"
+
+    @staticmethod
+    def max_idle_for(config: dict) -> float:
+        """Idle limit: configured, or 80% of the server-side newCommandTimeout"""
+        configured = config["appium"].get("session_max_idle_seconds")
+        if configured:
+            return float(configured)
+        return 0.8 * float((config.get("capabilities") or {}).get("newCommandTimeout", 60))
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: Dict[str, dict]):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"   ⚠️ Could not save Appium session store: {e}")
+
+    def _update(self, key: str, entry):
+        """
+        Set (or with None, remove) one store entry. Pool workers share the
+        file, so load → modify → replace runs under an inter-process lock.
+
+        Args:
+            entry: dict, None, or a callable(previous entry or {}) -> dict
+        """
+        with self._lock, locked(self.path):
+            entries = self._load()
+            if callable(entry):
+                entry = entry(entries.get(key) or {})
+            if entry is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = entry
+            self._save(entries)
+
+    def lease(self, driver, reset_app: bool = True) -> bool:
+        """
+        Attach `driver` (an AppiumDriver without a session) to a warm session.
+
+        Args:
+            driver:    AppiumDriver to attach
+            reset_app: terminate and relaunch the app under test
+
+        Returns:
+            True if a healthy session was attached; False if the caller has
+            to start a new session
+        """
+        key = self.key_for(driver.config)
+        with self._lock:
+            entry = self._load().get(key)
+        if not entry:
+            return False
+        if entry.get("leased_by") not in (None, os.getpid()) and _pid_alive(entry.get("leased_by")):
+            print(f"   ⏭ Warm session for {key} is in use by pid {entry['leased_by']}")
+            return False
+        idle = time.time() - entry.get("returned_at", 0)
+        if idle > self.max_idle_for(driver.config):
+            print(f"   ⏭ Warm session idle {idle:.0f}s — starting a new one")
+            self._update(key, None)
+            return False
+
+        try:
+            driver.attach(entry["session_id"])
+        except Exception as e:
+            print(f"   ⚠️ Could not attach to warm session: {e}")
+            self._update(key, None)
+            return False
+        if not driver.is_healthy():
+            print("   ⚠️ Warm session failed its health check — starting a new one")
+            driver.driver = None
+            self._update(key, None)
+            return False
+
+        if reset_app:
+            driver.reset_app_state()
+        entry.update(leased_by=os.getpid(), reuses=entry.get("reuses", 0) + 1)
+        self._update(key, entry)
+        driver.startup_seconds = entry.get("startup_seconds")
+        self.reused += 1
+        self.saved_seconds += entry.get("startup_seconds") or 0.0
+        print(f"♻️  Reusing warm Appium session {entry['session_id'][:8]} "
+              f"(use #{entry['reuses']}, saved ~{entry.get('startup_seconds') or 0:.1f}s)")
+        return True
+
+    def give_back(self, driver):
+        """Park the driver's session for the next run (the driver is detached)"""
+        session_id = driver.driver.session_id
+        self._update(self.key_for(driver.config), lambda previous: {
+            "session_id": session_id,
+            "returned_at": time.time(),
+            "leased_by": None,
+            "reuses": previous.get("reuses", 0) if previous.get("session_id") == session_id else 0,
+            "startup_seconds": driver.startup_seconds,
+        })
+        print(f"🅿️  Appium session {driver.driver.session_id[:8]} kept warm for the next run")
+
+    def discard(self, driver):
+        """Forget the driver's session (after it was quit)"""
+        self._update(self.key_for(driver.config), None)
+
+
+_broker: Optional[SessionBroker] = None
+
+
+def get_session_broker() -> SessionBroker:
+    """Process-wide SessionBroker at DEFAULT_STORE_PATH"""
+    global _broker
+    if _broker is None:
+        _broker = SessionBroker()
+    return _broker
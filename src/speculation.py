@@ -0,0 +1,252 @@
+"""
+Incremental ASR and speculative response generation
+
+While the agent is still talking, VADSegmenter hands the audio captured so
+far to IncrementalTranscriber at every short pause; a background Whisper
+pass turns it into a partial hypothesis. Once a partial reads as a complete
+question, the conversation loop can start the LLM on it through
+SpeculativeGenerator. When the final transcript arrives the speculation is
+used if it matches (normalized text), otherwise it is dropped and the
+response is generated normally.
+"""
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+SAMPLE_WIDTH = 2
+
+
+def normalize_utterance(text: str) -> str:
+    """Case/punctuation-insensitive form used to match partial and final transcripts"""
+    text = re.sub(r"[^a-z0-9' ]+", " ", text.lower())
+    return " ".join(text.split())
+
+
+@dataclass
+class PartialHypothesis:
+    """One partial transcript of the agent's in-progress utterance"""
+
+    text: str
+    audio_seconds: float   # audio transcribed for this hypothesis
+    decode_seconds: float  # Whisper time for this pass
+
+
+class IncrementalTranscriber:
+    """
+    Transcribes partial audio on a background thread, newest audio wins.
+
+    If a partial arrives while the previous one is still being decoded, only
+    the latest is kept, so the recognizer never falls behind the speaker.
+    Uses its own sr.Recognizer (and Whisper model instance) so it never
+    contends with the final transcription on the main thread.
+    """
+
+    def __init__(
+        self,
+        model: str = "tiny.en",
+        sample_rate: int = 16000,
+        on_hypothesis: Optional[Callable[[PartialHypothesis], None]] = None,
+    ):
+        import speech_recognition as sr
+
+        self._sr = sr
+        self.recognizer = sr.Recognizer()
+        self.model = model
+        self.sample_rate = sample_rate
+        self.on_hypothesis = on_hypothesis
+        self.hypotheses: List[PartialHypothesis] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="partial-asr")
+        self._lock = threading.Lock()
+        self._pending = None
+        self._running = False
+        self._turn = 0
+
+    def new_turn(self):
+        """Discard queued audio and ignore results still in flight"""
+        with self._lock:
+            self._turn += 1
+            self._pending = None
+            self.hypotheses = []
+
+    def submit(self, pcm: bytes):
+        """Queue partial audio (replaces anything not yet started)"""
+        with self._lock:
+            self._pending = (self._turn, pcm)
+            if self._running:
+                return
+            self._running = True
+        self._executor.submit(self._drain)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                job, self._pending = self._pending, None
+                if job is None:
+                    self._running = False
+                    return
+            turn, pcm = job
+            start = time.monotonic()
+            try:
+                audio = self._sr.AudioData(pcm, self.sample_rate, SAMPLE_WIDTH)
+                text = self.recognizer.recognize_whisper(audio, model=self.model).strip()
+            except Exception:
+                continue  # unintelligible partial — wait for more audio
+            hypothesis = PartialHypothesis(
+                text=text,
+                audio_seconds=len(pcm) / float(SAMPLE_WIDTH * self.sample_rate),
+                decode_seconds=time.monotonic() - start,
+            )
+            with self._lock:
+                if turn != self._turn or not text:
+                    continue
+                self.hypotheses.append(hypothesis)
+            if self.on_hypothesis:
+                self.on_hypothesis(hypothesis)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+@dataclass
+class _Speculation:
+    key: str
+    future: Future
+    started_at: float
+    finished_at: Optional[float] = None
+
+
+@dataclass
+class SpeculationStats:
+    """Per-run speculation outcome counters"""
+
+    turns: int = 0
+    speculated_turns: int = 0
+    hits: int = 0
+    generations: int = 0  # speculative LLM calls started (incl. superseded ones)
+    latency_saved: List[float] = field(default_factory=list)  # seconds, one per hit
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.speculated_turns if self.speculated_turns else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "turns": self.turns,
+            "speculated_turns": self.speculated_turns,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate,
+            "wasted_generations": self.generations - self.hits,
+            "saved_mean": statistics.mean(self.latency_saved) if self.latency_saved else 0.0,
+            "saved_total": sum(self.latency_saved),
+        }
+
+
+class SpeculativeGenerator:
+    """
+    Starts LLM generation on a partial transcript and reuses it if the
+    final transcript matches.
+
+    Latency saved on a hit is min(generation time, final transcript time −
+    speculation start): the part of the generation that overlapped with the
+    agent finishing their sentence and the final Whisper pass.
+    """
+
+    def __init__(self, generate: Callable[[str], str], max_per_turn: int = 2):
+        """
+        Args:
+            generate:     prompt -> response (e.g. a bound OllamaClient.generate)
+            max_per_turn: cap on speculative LLM calls per agent turn; local
+                          Ollama serialises requests, so each wasted call can
+                          delay the real one
+        """
+        self.generate = generate
+        self.max_per_turn = max_per_turn
+        self.stats = SpeculationStats()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative-llm")
+        self._lock = threading.Lock()
+        self._speculations: List[_Speculation] = []
+        self._accepting = False  # between new_turn() and resolve()
+
+    def _cancel_pending(self, keep: Optional[_Speculation] = None):
+        """Cancel queued speculations (caller holds the lock) so Ollama never runs them"""
+        for spec in self._speculations:
+            if spec is not keep:
+                spec.future.cancel()
+        self._speculations = []
+
+    def new_turn(self):
+        """Open a turn for speculation; anything left over from the last one is cancelled"""
+        with self._lock:
+            self._cancel_pending()
+            self._accepting = True
+
+    def speculate(self, text: str, prompt: str) -> bool:
+        """Start generating for a partial transcript; False if skipped (or the turn is resolved)"""
+        key = normalize_utterance(text)
+
+        def run(spec):
+            try:
+                return self.generate(prompt)
+            finally:
+                spec.finished_at = time.monotonic()
+
+        with self._lock:
+            if not self._accepting:  # a late partial after resolve() would only delay the next turn
+                return False
+            if not key or any(s.key == key for s in self._speculations):
+                return False
+            if len(self._speculations) >= self.max_per_turn:
+                return False
+            spec = _Speculation(key, Future(), time.monotonic())
+            spec.future = self._executor.submit(run, spec)
+            self._speculations.append(spec)
+            if len(self._speculations) == 1:
+                self.stats.speculated_turns += 1
+            self.stats.generations += 1
+        return True
+
+    def resolve(self, text: str, prompt: str) -> str:
+        """
+        Response for the final transcript: the matching speculation if there
+        is one, otherwise a fresh generation.
+        """
+        final_at = time.monotonic()
+        key = normalize_utterance(text)
+        with self._lock:
+            self.stats.turns += 1
+            match = next((s for s in self._speculations if s.key == key), None)
+            self._cancel_pending(keep=match)
+            self._accepting = False
+
+        if match is not None:
+            try:
+                response = match.future.result()
+            except Exception as e:  # e.g. an Ollama timeout — regenerate rather than lose the turn
+                print(f"   ⚠️  Speculative generation failed ({e}) — generating again")
+                response = None
+            if response:
+                generation = (match.finished_at or time.monotonic()) - match.started_at
+                saved = max(0.0, min(generation, final_at - match.started_at))
+                self.stats.hits += 1
+                self.stats.latency_saved.append(saved)
+                print(f"   ⚡ Speculative response reused (saved {saved * 1000:.0f} ms)")
+                return response
+        return self.generate(prompt)
+
+    def print_stats(self):
+        s = self.stats.summary()
+        if not s["turns"]:
+            return
+        print(
+            f"\n⚡ Speculation: {s['hits']}/{s['speculated_turns']} speculated turns hit "
+            f"({s['hit_rate']:.0%}) over {s['turns']} turns | "
+            f"saved {s['saved_mean'] * 1000:.0f} ms mean, {s['saved_total']:.1f}s total | "
+            f"{s['wasted_generations']} wasted generations"
+        )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,115 @@
+"""
+Speech Service - one long-lived event loop thread and VoiceAI instance
+
+speak_sync() used to build a new VoiceAI (re-running temp-file cleanup) and
+call asyncio.run() (creating and tearing down an event loop) on every turn.
+SpeechService keeps both alive for the whole process and speaks queued
+utterances in order, with blocking and awaitable submit APIs.
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+from typing import Dict, Optional
+
+from src.voice_ai import VoiceAI, get_shared_playback
+
+
+class SpeechService:
+    """Owns one event loop thread and one VoiceAI; utterances are spoken in FIFO order"""
+
+    def __init__(self, voice: str = "en-US-GuyNeural", voice_ai: Optional[VoiceAI] = None):
+        """
+        Args:
+            voice:    TTS voice name (ignored when voice_ai is given)
+            voice_ai: pre-built VoiceAI to speak with; default shares the
+                      process-wide playback backend
+        """
+        self.voice_ai = voice_ai or VoiceAI(voice=voice, playback=get_shared_playback())
+        self._loop = asyncio.new_event_loop()
+        self._queue: Optional[asyncio.Queue] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="speech-service", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    # ── Event loop thread ─────────────────────────────────────────
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._ready.set()
+        try:
+            self._loop.run_until_complete(self._worker())
+        finally:
+            self._loop.close()
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                break
+            text, filename, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(await self.voice_ai.speak(text, filename=filename))
+            except BaseException as e:
+                future.set_exception(e)
+
+    # ── Public API ────────────────────────────────────────────────
+
+    @property
+    def pending(self) -> int:
+        """Utterances queued but not yet started"""
+        return self._queue.qsize() if self._queue else 0
+
+    def submit(self, text: str, filename: str = "utterance") -> concurrent.futures.Future:
+        """Queue an utterance; the future resolves to VoiceAI.speak()'s result"""
+        if not self._thread.is_alive():
+            raise RuntimeError("SpeechService has been shut down")
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (text, filename, future))
+        return future
+
+    def speak(self, text: str, filename: str = "utterance", timeout: Optional[float] = None):
+        """Queue an utterance and block until it has been played"""
+        return self.submit(text, filename).result(timeout)
+
+    async def speak_async(self, text: str, filename: str = "utterance"):
+        """Queue an utterance and await it from any other event loop"""
+        return await asyncio.wrap_future(self.submit(text, filename))
+
+    def run_coroutine(self, coro) -> concurrent.futures.Future:
+        """Run an arbitrary coroutine on the service loop (bypasses the queue)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def shutdown(self, wait: bool = True):
+        """Finish queued utterances, then stop the loop thread"""
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+            if wait:
+                self._thread.join()
+
+
+_services: Dict[str, SpeechService] = {}
+_services_lock = threading.Lock()
+
+
+def get_speech_service(voice: str = "en-US-GuyNeural") -> SpeechService:
+    """Process-wide SpeechService for a voice, created on first use"""
+    with _services_lock:
+        service = _services.get(voice)
+        if service is None:
+            service = _services[voice] = SpeechService(voice=voice)
+        return service
+
+
+@atexit.register
+def shutdown_speech_services():
+    """Stop every shared SpeechService (registered with atexit)"""
+    with _services_lock:
+        services = list(_services.values())
+        _services.clear()
+    for service in services:
+        service.shutdown()
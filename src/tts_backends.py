@@ -0,0 +1,352 @@
+"""
+TTS backends - pluggable speech synthesizers for VoiceAI
+
+Every backend streams 16-bit PCM chunks for a piece of text and records
+latency / real-time-factor stats per utterance:
+
+  edge    - Microsoft Edge TTS (network, neural voices)
+  piper   - Piper ONNX voice, fully offline; the model stays loaded in-process
+  silence - offline stand-in that emits silence sized to the text, for
+            conversation load tests with no TTS cost at all
+
+Backends are cached per process (get_tts_backend), so a model is loaded once
+no matter how many VoiceAI instances use it.
+"""
+import asyncio
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from src.audio_playback import SAMPLE_WIDTH, decode_audio
+
+
+@dataclass
+class PCMChunk:
+    """A block of signed 16-bit PCM"""
+
+    pcm: bytes
+    sample_rate: int
+    channels: int = 1
+
+
+@dataclass
+class SynthesisSample:
+    """Timing of one synthesized utterance (seconds)"""
+
+    text_chars: int
+    first_chunk_seconds: float
+    synthesis_seconds: float
+    audio_seconds: float
+
+    @property
+    def rtf(self) -> float:
+        """Real-time factor: synthesis time / audio duration (<1 is faster than real time)"""
+        return self.synthesis_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+
+@dataclass
+class BackendStats:
+    """Accumulated per-backend synthesis stats"""
+
+    backend: str
+    samples: List[SynthesisSample] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        if not self.samples:
+            return {"backend": self.backend, "utterances": 0}
+
+        def pct(values, p):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+        first = [s.first_chunk_seconds for s in self.samples]
+        rtf = [s.rtf for s in self.samples]
+        return {
+            "backend": self.backend,
+            "utterances": len(self.samples),
+            "first_chunk_p50": pct(first, 50),
+            "first_chunk_p95": pct(first, 95),
+            "rtf_mean": statistics.mean(rtf),
+            "rtf_p95": pct(rtf, 95),
+            "audio_seconds": sum(s.audio_seconds for s in self.samples),
+        }
+
+
+class TTSBackend:
+    """Base class: subclasses implement _stream_pcm()"""
+
+    name = "base"
+
+    def __init__(self):
+        self.stats = BackendStats(self.name)
+
+    def _stream_pcm(self, text: str) -> AsyncIterator[PCMChunk]:
+        raise NotImplementedError
+
+    async def stream(self, text: str) -> AsyncIterator[PCMChunk]:
+        """Yield PCM chunks for text, recording latency and RTF for this backend"""
+        start = time.monotonic()
+        first_chunk = None
+        audio_seconds = 0.0
+        pcm_stream = self._stream_pcm(text)
+        try:
+            async for chunk in pcm_stream:
+                if not chunk.pcm:
+                    continue
+                if first_chunk is None:
+                    first_chunk = time.monotonic() - start
+                audio_seconds += len(chunk.pcm) / float(
+                    SAMPLE_WIDTH * chunk.channels * chunk.sample_rate
+                )
+                yield chunk
+        finally:
+            await pcm_stream.aclose()  # a consumer that stops early stops the synthesizer too
+        self.stats.samples.append(SynthesisSample(
+            text_chars=len(text),
+            first_chunk_seconds=first_chunk or 0.0,
+            synthesis_seconds=time.monotonic() - start,
+            audio_seconds=audio_seconds,
+        ))
+
+    async def synthesize(self, text: str) -> PCMChunk:
+        """Synthesize the whole utterance into a single PCM chunk"""
+        parts, fmt = [], None
+        async for chunk in self.stream(text):
+            parts.append(chunk.pcm)
+            fmt = (chunk.sample_rate, chunk.channels)
+        if fmt is None:
+            raise RuntimeError(f"{self.name} TTS returned no audio")
+        return PCMChunk(b"".join(parts), *fmt)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# edge-tts (network)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class IncrementalMP3Decoder:
+    """
+    Turns a growing MP3 byte stream into new PCM as chunks arrive.
+
+    libsndfile has no push API, so the accumulated buffer is re-decoded each
+    time enough new bytes have arrived and only samples past what was already
+    emitted are returned. The last couple of MP3 frames are held back because
+    a truncated tail frame may decode differently once it is complete.
+    """
+
+    HOLDBACK_SAMPLES = 2 * 1152  # two MPEG-1 Layer III frames
+
+    def __init__(self, min_step_bytes: int = 2048):
+        self.min_step_bytes = min_step_bytes
+        self.sample_rate: Optional[int] = None
+        self.channels: Optional[int] = None
+        self._data = bytearray()
+        self._decoded_at = 0
+        self._emitted = 0  # bytes of PCM already returned
+
+    def feed(self, chunk: bytes) -> bytes:
+        self._data.extend(chunk)
+        if len(self._data) - self._decoded_at < self.min_step_bytes:
+            return b""
+        return self._emit(final=False)
+
+    def flush(self) -> bytes:
+        return self._emit(final=True) if self._data else b""
+
+    def _emit(self, final: bool) -> bytes:
+        try:
+            pcm, self.sample_rate, self.channels = decode_audio(bytes(self._data))
+        except Exception:
+            if final:
+                raise
+            return b""  # not enough complete frames yet
+        self._decoded_at = len(self._data)
+        end = len(pcm)
+        if not final:
+            end -= self.HOLDBACK_SAMPLES * SAMPLE_WIDTH * self.channels
+        if end <= self._emitted:
+            return b""
+        new = pcm[self._emitted:end]
+        self._emitted = end
+        return new
+
+
+class EdgeTTSBackend(TTSBackend):
+    """Microsoft Edge neural TTS — needs network access"""
+
+    name = "edge"
+
+    def __init__(self, voice: str = "en-US-GuyNeural"):
+        super().__init__()
+        import edge_tts
+
+        self._edge_tts = edge_tts
+        self.voice = voice
+
+    async def _stream_pcm(self, text: str) -> AsyncIterator[PCMChunk]:
+        communicate = self._edge_tts.Communicate(text, voice=self.voice)
+        decoder = IncrementalMP3Decoder()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                pcm = decoder.feed(chunk["data"])
+                if pcm:
+                    yield PCMChunk(pcm, decoder.sample_rate, decoder.channels)
+        pcm = decoder.flush()
+        if pcm:
+            yield PCMChunk(pcm, decoder.sample_rate, decoder.channels)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Offline backends
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _ThreadedBackend(TTSBackend):
+    """Runs a blocking, CPU-bound synthesizer in a worker thread and streams its output"""
+
+    def _iter_pcm(self, text: str) -> Iterator[PCMChunk]:
+        raise NotImplementedError
+
+    async def _stream_pcm(self, text: str) -> AsyncIterator[PCMChunk]:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()  # set when the consumer stops early (error, cancellation)
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:  # event loop already closed
+                stop.set()
+
+        def produce():
+            try:
+                for chunk in self._iter_pcm(text):
+                    if stop.is_set():
+                        return
+                    put(chunk)
+            except BaseException as e:
+                put(e)
+            finally:
+                put(done)
+
+        worker = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+            await worker
+        finally:
+            stop.set()
+
+
+class PiperBackend(_ThreadedBackend):
+    """Piper neural TTS (ONNX) — fully offline, model loaded once per process"""
+
+    name = "piper"
+
+    def __init__(self, model_path: str, config_path: Optional[str] = None):
+        """
+        Args:
+            model_path:  path to a Piper voice, e.g. en_US-lessac-medium.onnx
+            config_path: matching .onnx.json (default: model_path + ".json")
+        """
+        super().__init__()
+        from piper import PiperVoice
+
+        print(f"   🗣️ Loading Piper voice: {model_path}")
+        self.voice = PiperVoice.load(model_path, config_path=config_path)
+        self.sample_rate = self.voice.config.sample_rate
+        # Serialise synthesis: one ONNX session shared by all callers
+        self._lock = threading.Lock()
+
+    def _iter_pcm(self, text: str) -> Iterator[PCMChunk]:
+        with self._lock:
+            if hasattr(self.voice, "synthesize_stream_raw"):  # piper-tts < 1.3
+                for pcm in self.voice.synthesize_stream_raw(text):
+                    yield PCMChunk(pcm, self.sample_rate, 1)
+            else:  # piper-tts >= 1.3 yields AudioChunk objects per sentence
+                for chunk in self.voice.synthesize(text):
+                    yield PCMChunk(chunk.audio_int16_bytes, chunk.sample_rate, chunk.sample_channels)
+
+
+class SilenceBackend(TTSBackend):
+    """Emits silence sized to the text — load tests with zero TTS cost or jitter"""
+
+    name = "silence"
+
+    def __init__(self, words_per_second: float = 2.5, sample_rate: int = 16000):
+        super().__init__()
+        self.words_per_second = words_per_second
+        self.sample_rate = sample_rate
+
+    async def _stream_pcm(self, text: str) -> AsyncIterator[PCMChunk]:
+        seconds = max(0.3, len(text.split()) / self.words_per_second)
+        chunk_bytes = int(self.sample_rate * 0.1) * SAMPLE_WIDTH
+        remaining = int(self.sample_rate * seconds) * SAMPLE_WIDTH
+        while remaining > 0:
+            n = min(chunk_bytes, remaining)
+            yield PCMChunk(b"\0" * n, self.sample_rate, 1)
+            remaining -= n
+
+
+TTS_BACKENDS = {
+    EdgeTTSBackend.name: EdgeTTSBackend,
+    PiperBackend.name: PiperBackend,
+    SilenceBackend.name: SilenceBackend,
+}
+
+_backends: Dict[Tuple, TTSBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_tts_backend(name: str = "edge", **options) -> TTSBackend:
+    """Shared backend instance for (name, options), created on first use"""
+    if name not in TTS_BACKENDS:
+        raise ValueError(f"Unknown TTS backend '{name}'. Available: {', '.join(TTS_BACKENDS)}")
+    key = (name, tuple(sorted(options.items())))
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = _backends[key] = TTS_BACKENDS[name](**options)
+        return backend
+
+
+def tts_backend_from_config(config: dict, voice: str) -> TTSBackend:
+    """Create the TTS backend selected by voice_ai.tts_backend"""
+    name = config.get("tts_backend", "edge")
+    if name == "edge":
+        return get_tts_backend("edge", voice=voice)
+    if name == "piper":
+        model = config.get("piper_model")
+        if not model:
+            raise ValueError("voice_ai.piper_model must be set to use the piper TTS backend")
+        return get_tts_backend("piper", model_path=model, config_path=config.get("piper_config") or None)
+    return get_tts_backend(name)
+
+
+def tts_stats_summary() -> List[dict]:
+    """Stats summary for every backend used in this process"""
+    with _backends_lock:
+        backends = list(_backends.values())
+    return [b.stats.summary() for b in backends if b.stats.samples]
+
+
+def print_tts_stats():
+    """Print per-backend latency and real-time-factor stats"""
+    summaries = tts_stats_summary()
+    if not summaries:
+        return
+    print("\n📈 TTS backend stats:")
+    for s in summaries:
+        print(
+            f"   {s['backend']:<8} {s['utterances']:>3} utterances | "
+            f"first chunk p50 {s['first_chunk_p50'] * 1000:.0f} ms, "
+            f"p95 {s['first_chunk_p95'] * 1000:.0f} ms | "
+            f"RTF mean {s['rtf_mean']:.2f}, p95 {s['rtf_p95']:.2f} | "
+            f"{s['audio_seconds']:.1f}s audio"
+        )
@@ -0,0 +1,175 @@
+"""
+Turn timing - span-based latency instrumentation for the conversation loop
+
+Each turn is a list of named spans (start offset from the turn start, and
+duration). The recorder writes them next to the conversation log as
+logs/test_run_<ts>.timings.json, with p50/p95 per stage, and the HTML
+report renders them as a per-turn waterfall.
+
+Stages used by the e2e loop (in order):
+  listen_wait, agent_speech, endpointing, transcription, prompt_build,
+  llm_ttft, llm_total, tts_first_audio, tts_synthesis, playback
+"""
+import json
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+STAGES = [
+    "listen_wait",
+    "agent_speech",
+    "endpointing",
+    "transcription",
+    "prompt_build",
+    "llm_ttft",
+    "llm_total",
+    "tts_first_audio",
+    "tts_synthesis",
+    "playback",
+]
+
+
+def timings_path_for(log_file: str) -> str:
+    """logs/test_run_X.txt → logs/test_run_X.timings.json"""
+    return os.path.splitext(str(log_file))[0] + ".timings.json"
+
+
+def _pct(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+
+def summarize_turns(turns: List[dict]) -> Dict[str, dict]:
+    """{stage: {count, mean, p50, p95}} over all turns, plus "turn" totals"""
+    by_stage: Dict[str, List[float]] = {}
+    for turn in turns:
+        for span in turn["spans"]:
+            by_stage.setdefault(span["name"], []).append(span["seconds"])
+        by_stage.setdefault("turn", []).append(turn["total"])
+    order = {name: i for i, name in enumerate(STAGES + ["turn"])}
+    return {
+        name: {
+            "count": len(values),
+            "mean": statistics.mean(values),
+            "p50": _pct(values, 50),
+            "p95": _pct(values, 95),
+        }
+        for name, values in sorted(by_stage.items(), key=lambda kv: order.get(kv[0], len(order)))
+    }
+
+
+class TurnTimer:
+    """Spans for one conversation turn"""
+
+    def __init__(self, turn: int):
+        self.turn = turn
+        self.started_at = time.monotonic()
+        self.spans: List[dict] = []
+
+    def offset(self, at: Optional[float] = None) -> float:
+        """Seconds from turn start to `at` (a time.monotonic() value, default now)"""
+        return (time.monotonic() if at is None else at) - self.started_at
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a block: `with timer.span("transcription"): ...`"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.monotonic() - start)
+
+    def add(self, name: str, start: float, seconds: float):
+        """Record a span measured elsewhere (start is a time.monotonic() value)"""
+        if seconds is None or seconds < 0:
+            return
+        self.spans.append({
+            "name": name,
+            "start": round(self.offset(start), 4),
+            "seconds": round(seconds, 4),
+        })
+
+    def add_utterance(self, start: float, stats):
+        """Spans from a VoiceAI UtteranceStats; start is when speak() was called"""
+        if stats is None:
+            return
+        self.add("tts_first_audio", start, stats.time_to_first_audio)
+        self.add("tts_synthesis", start, stats.synthesis_seconds)
+        self.add(
+            "playback",
+            start + stats.time_to_first_audio,
+            stats.total_seconds - stats.time_to_first_audio,
+        )
+
+    def add_segment(self, listen_start: float, segment):
+        """listen_wait / agent_speech / endpointing spans from a VAD SpeechSegment"""
+        onset = segment.onset_at or listen_start
+        last_speech = segment.last_speech_at or onset
+        self.add("listen_wait", listen_start, onset - listen_start)
+        self.add("agent_speech", onset, last_speech - onset)
+        self.add("endpointing", last_speech, segment.endpoint_latency)
+
+    def to_dict(self) -> dict:
+        end = max((s["start"] + s["seconds"] for s in self.spans), default=self.offset())
+        return {"turn": self.turn, "spans": self.spans, "total": round(end, 4)}
+
+
+class TimingRecorder:
+    """Collects TurnTimers for a run and writes the sidecar JSON"""
+
+    def __init__(self, log_file: str, on_turn: Optional[Callable[[dict], None]] = None):
+        """
+        Args:
+            log_file: conversation log the sidecar is written next to
+            on_turn:  callback(turn_dict) as each turn is finished
+        """
+        self.path = timings_path_for(log_file)
+        self.on_turn = on_turn
+        self.turns: List[dict] = []
+        self.current: Optional[TurnTimer] = None
+
+    def start_turn(self, turn: int) -> TurnTimer:
+        self.finish_turn()
+        self.current = TurnTimer(turn)
+        return self.current
+
+    def finish_turn(self):
+        if self.current and self.current.spans:
+            self.turns.append(self.current.to_dict())
+            if self.on_turn:
+                self.on_turn(self.turns[-1])
+        self.current = None
+
+    def discard_turn(self):
+        """Drop the current turn's spans (a turn that is retried under the same number)"""
+        self.current = None
+
+    def save(self) -> str:
+        self.finish_turn()
+        data = {"turns": self.turns, "summary": summarize_turns(self.turns) if self.turns else {}}
+        with open(self.path, "w") as f:
+            json.dump(data, f, indent=2)
+        return self.path
+
+    def print_summary(self):
+        if not self.turns:
+            return
+        print("\n⏱️ Turn latency (p50 / p95):")
+        for name, s in summarize_turns(self.turns).items():
+            print(f"   {name:<16} {s['p50'] * 1000:8.0f} ms {s['p95'] * 1000:8.0f} ms")
+
+
+def load_timings(log_file: Optional[str]) -> Optional[dict]:
+    """Sidecar timings for a conversation log, or None"""
+    if not log_file:
+        return None
+    path = timings_path_for(log_file)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
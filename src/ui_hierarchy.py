@@ -0,0 +1,149 @@
+"""
+UI hierarchy snapshots - one page_source dump parsed into plain nodes
+
+Every `find_element` call is a round trip to the phone (and, with an implicit
+wait, possibly several seconds). A snapshot takes a single `page_source`
+dump and answers all the questions a step needs — which labels are visible,
+how many input fields there are, where a button is — locally.
+
+    snapshot = UiSnapshot.capture(driver)        # AppiumDriver
+    node = snapshot.find("=continue")
+    if node:
+        driver.driver.execute_script("mobile: clickGesture", {"x": node.center[0], "y": node.center[1]})
+
+Patterns are lowercase; "=label" matches a whole text/content-desc, anything
+else matches a substring.
+"""
+import hashlib
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+_BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+
+@dataclass(frozen=True)
+class UiNode:
+    """One element of the hierarchy with the attributes the flows look at"""
+    cls: str
+    text: str
+    desc: str
+    resource_id: str
+    clickable: bool
+    bounds: Optional[Tuple[int, int, int, int]]  # left, top, right, bottom
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        """Normalised (lowercase, stripped) non-empty text and content-desc"""
+        return tuple(v.strip().lower() for v in (self.text, self.desc) if v and v.strip())
+
+    @property
+    def center(self) -> Optional[Tuple[int, int]]:
+        if not self.bounds:
+            return None
+        left, top, right, bottom = self.bounds
+        return (left + right) // 2, (top + bottom) // 2
+
+    def to_dict(self) -> dict:
+        """Compact record for dumps: empty attributes left out, class without its package"""
+        record = {"class": self.cls.rsplit(".", 1)[-1]}
+        for key, value in (("text", self.text), ("desc", self.desc), ("id", self.resource_id)):
+            if value:
+                record[key] = value
+        if self.clickable:
+            record["clickable"] = True
+        if self.bounds:
+            record["bounds"] = list(self.bounds)
+        return record
+
+    def summary(self) -> str:
+        """One-line description for console output"""
+        parts = [self.cls.rsplit(".", 1)[-1]]
+        if self.text:
+            parts.append(f"text={self.text!r}")
+        if self.desc:
+            parts.append(f"desc={self.desc!r}")
+        if self.resource_id:
+            parts.append(f"id={self.resource_id}")
+        if self.clickable:
+            parts.append("[clickable]")
+        return " ".join(parts)
+
+    def matches(self, pattern: str) -> bool:
+        if pattern.startswith("="):
+            return pattern[1:] in self.labels
+        return any(pattern in label for label in self.labels)
+
+
+def _parse_bounds(value: str) -> Optional[Tuple[int, int, int, int]]:
+    m = _BOUNDS_RE.match(value or "")
+    return tuple(int(g) for g in m.groups()) if m else None
+
+
+class UiSnapshot:
+    """Parsed page_source: nodes in document order plus a label index"""
+
+    def __init__(self, page_source: str):
+        self.page_source = page_source or ""
+        self.nodes: List[UiNode] = []
+        try:
+            root = ET.fromstring(self.page_source)
+        except ET.ParseError:
+            root = None
+        if root is not None:
+            for el in root.iter():
+                if el is root:
+                    continue
+                self.nodes.append(UiNode(
+                    cls=el.get("class") or el.tag,
+                    text=el.get("text") or "",
+                    desc=el.get("content-desc") or "",
+                    resource_id=el.get("resource-id") or "",
+                    clickable=el.get("clickable") == "true",
+                    bounds=_parse_bounds(el.get("bounds")),
+                ))
+        self.labels = frozenset(label for node in self.nodes for label in node.labels)
+        # One string for substring checks; patterns have no "\n", so none straddles two labels
+        self._joined = "\n".join(sorted(self.labels))
+
+    @classmethod
+    def capture(cls, driver) -> "UiSnapshot":
+        """Snapshot of the current screen of an AppiumDriver"""
+        return cls(driver.driver.page_source)
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable digest of the visible labels (changes when the screen does)"""
+        return hashlib.sha1(self._joined.encode("utf-8")).hexdigest()[:12]
+
+    def has(self, pattern: str) -> bool:
+        """True if any node's text or content-desc matches the pattern"""
+        if pattern.startswith("="):
+            return pattern[1:] in self.labels
+        return pattern in self._joined
+
+    def count(self, cls: str) -> int:
+        """Number of nodes of a class, e.g. 'android.widget.EditText'"""
+        return sum(1 for node in self.nodes if node.cls == cls)
+
+    def find(self, pattern: str) -> Optional[UiNode]:
+        """First node matching the pattern, preferring clickable ones"""
+        matches = [node for node in self.nodes if node.bounds and node.matches(pattern)]
+        clickable = [node for node in matches if node.clickable]
+        return (clickable or matches or [None])[0]
+
+    def labelled(self, clickable_only: bool = False) -> List[UiNode]:
+        """Nodes worth showing in a dump: clickable ones, or any with text, content-desc or a resource-id"""
+        if clickable_only:
+            return [node for node in self.nodes if node.clickable]
+        return [node for node in self.nodes if node.text or node.desc or node.resource_id]
+
+    def texts(self) -> List[str]:
+        """Visible text/content-desc values in document order (for logging)"""
+        out = []
+        for node in self.nodes:
+            for value in (node.text, node.desc):
+                if value and value.strip() and value.strip() not in out:
+                    out.append(value.strip())
+        return out
@@ -0,0 +1,354 @@
+"""
+Voice activity detection - endpoint agent speech as soon as it stops
+
+recognizer.listen() waits for `pause_threshold` seconds of silence (1 s in
+the e2e test) before it returns, and hard-cuts phrases at phrase_time_limit.
+VADSegmenter instead classifies every 30 ms frame, smooths the per-frame
+speech probability, and closes a segment after a short hangover once the
+probability drops. A pre-roll buffer keeps the onset of the first word.
+
+Frame classifiers:
+  webrtc - webrtcvad (optional dependency), binary decision per frame
+  energy - adaptive noise-floor energy detector, no extra dependencies
+"""
+import collections
+import math
+import statistics
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Deque, List, Optional
+
+SAMPLE_WIDTH = 2  # 16-bit PCM, as delivered by sr.Microphone
+
+
+@dataclass
+class SpeechSegment:
+    """One endpointed stretch of speech"""
+
+    pcm: bytes
+    sample_rate: int
+    speech_seconds: float    # frames classified as speech
+    endpoint_latency: float  # last speech frame → segment returned (seconds)
+    onset_at: Optional[float] = None        # time.monotonic() of speech onset
+    last_speech_at: Optional[float] = None  # time.monotonic() of last speech frame
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / float(SAMPLE_WIDTH * self.sample_rate)
+
+    def to_audio_data(self):
+        """Wrap as speech_recognition.AudioData for recognize_whisper() etc."""
+        import speech_recognition as sr
+
+        return sr.AudioData(self.pcm, self.sample_rate, SAMPLE_WIDTH)
+
+
+@dataclass
+class EndpointStats:
+    """Endpointing latency per segment (seconds)"""
+
+    latencies: List[float] = field(default_factory=list)
+    durations: List[float] = field(default_factory=list)
+
+    def record(self, segment: SpeechSegment):
+        self.latencies.append(segment.endpoint_latency)
+        self.durations.append(segment.duration)
+
+    def summary(self) -> dict:
+        if not self.latencies:
+            return {"segments": 0}
+        ordered = sorted(self.latencies)
+        return {
+            "segments": len(ordered),
+            "endpoint_p50": statistics.median(ordered),
+            "endpoint_p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+            "endpoint_max": ordered[-1],
+            "audio_seconds": sum(self.durations),
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Frame classifiers
+# ─────────────────────────────────────────────────────────────────────────────
+
+class FrameClassifier:
+    """Returns a speech probability in [0, 1] for one PCM frame"""
+
+    name = "base"
+
+    def speech_probability(self, frame: bytes, sample_rate: int) -> float:
+        raise NotImplementedError
+
+
+class WebRTCClassifier(FrameClassifier):
+    """Google WebRTC VAD (GMM based); frames must be 10/20/30 ms at 8/16/32/48 kHz"""
+
+    name = "webrtc"
+
+    def __init__(self, aggressiveness: int = 2):
+        """
+        Args:
+            aggressiveness: 0 (least) .. 3 (most aggressive about rejecting non-speech)
+        """
+        import webrtcvad
+
+        self.vad = webrtcvad.Vad(aggressiveness)
+
+    def speech_probability(self, frame: bytes, sample_rate: int) -> float:
+        return 1.0 if self.vad.is_speech(frame, sample_rate) else 0.0
+
+
+class EnergyClassifier(FrameClassifier):
+    """
+    Frame energy relative to an adaptive noise floor.
+
+    Probability ramps from 0 at `onset_db` above the floor to 1 at
+    `full_db` above it; the floor tracks quiet frames so room noise and
+    mic gain changes don't need a manual threshold.
+    """
+
+    name = "energy"
+
+    def __init__(self, onset_db: float = 4.0, full_db: float = 14.0, floor_adapt: float = 0.05):
+        self.onset_db = onset_db
+        self.full_db = full_db
+        self.floor_adapt = floor_adapt
+        self.noise_floor_db: Optional[float] = None
+
+    @staticmethod
+    def frame_db(frame: bytes) -> float:
+        samples = array("h", frame)
+        if not samples:
+            return 0.0
+        rms = math.sqrt(sum(s * s for s in samples) / len(samples))
+        return 20.0 * math.log10(max(rms, 1.0))
+
+    def speech_probability(self, frame: bytes, sample_rate: int) -> float:
+        db = self.frame_db(frame)
+        if self.noise_floor_db is None:
+            self.noise_floor_db = db
+        above = db - self.noise_floor_db
+        prob = min(1.0, max(0.0, (above - self.onset_db) / (self.full_db - self.onset_db)))
+        if prob < 0.5:
+            # Quiet frame: follow the floor (fast downwards, slowly upwards)
+            rate = 0.5 if db < self.noise_floor_db else self.floor_adapt
+            self.noise_floor_db += rate * (db - self.noise_floor_db)
+        return prob
+
+
+def create_frame_classifier(name: str = "webrtc", aggressiveness: int = 2) -> FrameClassifier:
+    """Build a classifier by name; webrtc falls back to energy when webrtcvad is missing"""
+    if name == "webrtc":
+        try:
+            return WebRTCClassifier(aggressiveness)
+        except ImportError:
+            print("   ⚠️ webrtcvad not installed — using energy VAD")
+            return EnergyClassifier()
+    if name == "energy":
+        return EnergyClassifier()
+    raise ValueError(f"Unknown VAD '{name}'. Available: webrtc, energy")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Segmenter
+# ─────────────────────────────────────────────────────────────────────────────
+
+class VADSegmenter:
+    """
+    Frame-level speech segmenter.
+
+    Feed 16-bit mono PCM with process(); it returns a SpeechSegment the
+    moment the smoothed speech probability has stayed below
+    `end_threshold` for `hangover_ms`. listen() runs the same loop
+    directly on an open sr.Microphone.
+
+    While a segment is open, `on_partial` (if set) receives the audio so
+    far at every short pause (`partial_pause_ms`), so a streaming
+    recognizer can produce partial hypotheses before the endpoint.
+    """
+
+    def __init__(
+        self,
+        classifier: Optional[FrameClassifier] = None,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        start_threshold: float = 0.6,
+        end_threshold: float = 0.3,
+        smoothing: float = 0.4,
+        hangover_ms: int = 500,
+        pre_roll_ms: int = 300,
+        min_speech_ms: int = 150,
+        max_segment_seconds: float = 120.0,
+        partial_pause_ms: int = 240,
+        on_partial: Optional[Callable[[bytes], None]] = None,
+    ):
+        """
+        Args:
+            classifier:          frame classifier (default: webrtc, energy fallback)
+            sample_rate:         input rate; webrtc needs 8000/16000/32000/48000
+            frame_ms:            frame length (10, 20 or 30 for webrtc)
+            start_threshold:     smoothed probability that opens a segment
+            end_threshold:       smoothed probability below which silence is counted
+            smoothing:           EMA weight of the newest frame (1.0 = no smoothing)
+            hangover_ms:         silence that ends a segment (vs. 1 s pause_threshold)
+            pre_roll_ms:         audio kept from before the onset
+            min_speech_ms:       shorter bursts (clicks, taps) are dropped
+            max_segment_seconds: safety cap for a single segment
+            partial_pause_ms:    in-segment pause that triggers on_partial
+            on_partial:          callback(pcm_so_far) for incremental ASR
+        """
+        self.classifier = classifier or create_frame_classifier()
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * SAMPLE_WIDTH
+        self.start_threshold = start_threshold
+        self.end_threshold = end_threshold
+        self.smoothing = smoothing
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_segment_frames = int(max_segment_seconds * 1000 / frame_ms)
+        self.partial_pause_frames = max(1, partial_pause_ms // frame_ms)
+        self.on_partial = on_partial
+        self.pre_roll: Deque[bytes] = collections.deque(maxlen=max(0, pre_roll_ms // frame_ms))
+        self.stats = EndpointStats()
+        self.reset()
+
+    def reset(self):
+        """Drop any partial segment and buffered audio"""
+        self.pre_roll.clear()
+        self._pending = bytearray()
+        self._frames: List[bytes] = []
+        self._triggered = False
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self._last_speech_at: Optional[float] = None
+        self._onset_at: Optional[float] = None
+        self.probability = 0.0
+
+    @property
+    def in_speech(self) -> bool:
+        return self._triggered
+
+    def process(self, pcm: bytes) -> Optional[SpeechSegment]:
+        """Consume PCM of any length; returns a segment once speech has ended"""
+        self._pending.extend(pcm)
+        segment = None
+        while len(self._pending) >= self.frame_bytes and segment is None:
+            frame = bytes(self._pending[:self.frame_bytes])
+            del self._pending[:self.frame_bytes]
+            segment = self._process_frame(frame)
+        return segment
+
+    def _process_frame(self, frame: bytes) -> Optional[SpeechSegment]:
+        raw = self.classifier.speech_probability(frame, self.sample_rate)
+        self.probability += self.smoothing * (raw - self.probability)
+        now = time.monotonic()
+
+        if not self._triggered:
+            self.pre_roll.append(frame)
+            if self.probability >= self.start_threshold:
+                self._triggered = True
+                self._frames = list(self.pre_roll)
+                self.pre_roll.clear()
+                self._speech_frames = 1
+                self._silent_frames = 0
+                self._last_speech_at = now
+                self._onset_at = now
+            return None
+
+        self._frames.append(frame)
+        if self.probability >= self.end_threshold:
+            self._speech_frames += 1
+            self._silent_frames = 0
+            self._last_speech_at = now
+        else:
+            self._silent_frames += 1
+
+        if self._silent_frames >= self.hangover_frames:
+            return self._close_segment(now, trailing=self._silent_frames)
+        if (
+            self.on_partial
+            and self._silent_frames == self.partial_pause_frames
+            and self._speech_frames >= self.min_speech_frames
+        ):
+            self.on_partial(b"".join(self._frames))
+        if len(self._frames) >= self.max_segment_frames:
+            return self._close_segment(now, trailing=0)
+        return None
+
+    def _close_segment(self, now: float, trailing: int) -> Optional[SpeechSegment]:
+        frames, speech_frames, last_speech = self._frames, self._speech_frames, self._last_speech_at
+        self._frames = []
+        self._triggered = False
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self.probability = 0.0
+        if speech_frames < self.min_speech_frames:
+            return None  # click / tap, not speech
+
+        # Keep a little of the trailing silence so the recognizer sees a clean ending
+        drop = max(0, trailing - self.pre_roll.maxlen)
+        if drop:
+            frames = frames[:-drop]
+        segment = SpeechSegment(
+            pcm=b"".join(frames),
+            sample_rate=self.sample_rate,
+            speech_seconds=speech_frames * self.frame_ms / 1000.0,
+            endpoint_latency=now - (last_speech or now),
+            onset_at=self._onset_at,
+            last_speech_at=last_speech,
+        )
+        self.stats.record(segment)
+        return segment
+
+    def listen(self, source, timeout: Optional[float] = None) -> SpeechSegment:
+        """
+        Read from an open sr.Microphone until one segment has been endpointed.
+
+        The microphone must have been opened at this segmenter's sample rate,
+        e.g. sr.Microphone(device_index, sample_rate=16000).
+
+        Raises:
+            sr.WaitTimeoutError: no speech started within `timeout` seconds
+        """
+        import speech_recognition as sr
+
+        if source.SAMPLE_RATE != self.sample_rate or source.SAMPLE_WIDTH != SAMPLE_WIDTH:
+            raise ValueError(
+                f"Microphone is {source.SAMPLE_RATE} Hz / {source.SAMPLE_WIDTH * 8}-bit; "
+                f"VADSegmenter needs {self.sample_rate} Hz / 16-bit"
+            )
+        self.reset()
+        start = time.monotonic()
+        while True:
+            segment = self.process(source.stream.read(source.CHUNK))
+            if segment is not None:
+                return segment
+            if timeout and not self._triggered and time.monotonic() - start > timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+
+    def print_stats(self):
+        """Print endpointing latency summary"""
+        s = self.stats.summary()
+        if not s["segments"]:
+            return
+        print(
+            f"\n⏱️ VAD endpointing ({self.classifier.name}): {s['segments']} segments | "
+            f"p50 {s['endpoint_p50'] * 1000:.0f} ms, p95 {s['endpoint_p95'] * 1000:.0f} ms, "
+            f"max {s['endpoint_max'] * 1000:.0f} ms | {s['audio_seconds']:.1f}s audio"
+        )
+
+
+def vad_segmenter_from_config(config: dict) -> VADSegmenter:
+    """Build a VADSegmenter from the voice_ai config section"""
+    classifier = create_frame_classifier(
+        config.get("vad", "webrtc"), int(config.get("vad_aggressiveness", 2))
+    )
+    return VADSegmenter(
+        classifier=classifier,
+        sample_rate=int(config.get("vad_sample_rate", 16000)),
+        hangover_ms=int(config.get("vad_hangover_ms", 500)),
+        pre_roll_ms=int(config.get("vad_pre_roll_ms", 300)),
+        max_segment_seconds=float(config.get("vad_max_segment_seconds", 120)),
+    )
@@ -7,6 +7,7 @@ import speech_recognition as sr
 import asyncio
 import json
 from typing import Optional, Dict, Tuple
+from src.mic_calibration import get_mic_calibration_store
 from src.ollama_client import OllamaClient
 from src.voice_ai import VoiceAI
 from src.appium_driver import AppiumDriver
@@ -35,6 +36,7 @@ class VoiceAgent:
         self.ollama = OllamaClient(model=ollama_model)
         self.voice_ai = VoiceAI(voice=voice)
         self.recognizer = sr.Recognizer()
+        self.calibration = get_mic_calibration_store()
 
         self.system_prompt = system_prompt or self._get_default_system_prompt()
         self.conversation_history = []
@@ -75,10 +77,13 @@ Always be helpful and professional."""
         try:
             print("\n🎤 Listening...")
             with sr.Microphone() as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                # Calibrated once per session; dynamic updates between phrases
+                # are folded back into the stored threshold
+                self.calibration.apply(self.recognizer, source, "default")
                 audio = self.recognizer.listen(
                     source, timeout=timeout, phrase_time_limit=15
                 )
+            self.calibration.observe("default", self.recognizer.energy_threshold, persist=True)
 
             print("   Processing audio...")
             text = self.recognizer.recognize_google(audio)
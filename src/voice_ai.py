@@ -1,24 +1,115 @@
 """
-Voice AI integration - Text-to-Speech using edge-tts (high quality, consistent)
+Voice AI integration - Text-to-Speech through pluggable TTS backends
+
+The synthesizer (edge-tts by default, or an offline backend) is selected by
+voice_ai.tts_backend in the config; see src/tts_backends.py. Audio is kept in
+memory as PCM and played in-process through a playback backend
+(see src/audio_playback.py).
 """
 
-import edge_tts
 import asyncio
 import time
 import os
-import subprocess
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Union
+
+import yaml
+
+from src.audio_playback import (
+    PlaybackBackend,
+    StreamingPlayer,
+    create_playback_backend,
+    pcm_duration,
+)
+from src.tts_backends import TTSBackend, tts_backend_from_config
+
+DEFAULT_CONFIG_PATH = "config/appium_config.yaml"
+
+
+@dataclass
+class UtteranceStats:
+    """Timing of one spoken utterance (seconds)"""
+
+    text_chars: int
+    streaming: bool
+    time_to_first_audio: float  # speak() start → first PCM handed to the device
+    synthesis_seconds: float    # speak() start → last TTS chunk received
+    audio_seconds: float        # duration of the synthesized audio
+    total_seconds: float        # speak() start → playback finished
+    backend: str = "edge"
+
+
+def load_voice_ai_config(config_path: str = DEFAULT_CONFIG_PATH) -> dict:
+    """Return the `voice_ai` section of the config file ({} if unavailable)"""
+    try:
+        with open(config_path, "r") as f:
+            return (yaml.safe_load(f) or {}).get("voice_ai") or {}
+    except OSError:
+        return {}
+
+
+def playback_from_config(config: dict) -> PlaybackBackend:
+    """Create the playback backend selected in the voice_ai config section"""
+    name = config.get("playback", "pyaudio")
+    options = {}
+    if name == "pyaudio" and config.get("playback_device"):
+        options["device_name"] = config["playback_device"]
+    elif name == "file" and config.get("playback_dir"):
+        options["output_dir"] = config["playback_dir"]
+    elif name == "null":
+        options["realtime"] = bool(config.get("playback_realtime", False))
+    return create_playback_backend(name, **options)
 
 
 class VoiceAI:
-    """Voice synthesis for test automation - uses Microsoft Edge TTS"""
+    """Voice synthesis for test automation - edge-tts or an offline TTS backend"""
 
     def __init__(
-        self, voice: str = "en-US-GuyNeural", audio_dir: str = "/tmp/pizza_voice_test"
+        self,
+        voice: str = "en-US-GuyNeural",
+        audio_dir: str = "/tmp/pizza_voice_test",
+        playback: Optional[Union[str, PlaybackBackend]] = None,
+        streaming: Optional[bool] = None,
+        prebuffer_ms: Optional[int] = None,
+        tts_backend: Optional[Union[str, TTSBackend]] = None,
     ):
+        """
+        Args:
+            voice:        edge-tts voice name
+            audio_dir:    scratch directory (legacy temp files are cleaned here)
+            playback:     PlaybackBackend instance, backend name ("pyaudio" |
+                          "null" | "file"), or None to use the voice_ai config
+            streaming:    start playback while synthesis is still running;
+                          None uses voice_ai.streaming from the config
+            prebuffer_ms: audio buffered before streaming playback starts
+            tts_backend:  TTSBackend instance, backend name ("edge" | "piper" |
+                          "silence"), or None to use voice_ai.tts_backend
+        """
         self.voice = voice  # Use a consistent neural voice
         self.audio_dir = audio_dir
         os.makedirs(audio_dir, exist_ok=True)
 
+        config = load_voice_ai_config()
+        if isinstance(playback, PlaybackBackend):
+            self.playback = playback
+        else:
+            if playback:
+                config = dict(config, playback=playback)
+            self.playback = playback_from_config(config)
+
+        if isinstance(tts_backend, TTSBackend):
+            self.tts = tts_backend
+        else:
+            if tts_backend:
+                config = dict(config, tts_backend=tts_backend)
+            self.tts = tts_backend_from_config(config, voice)
+
+        self.streaming = config.get("streaming", True) if streaming is None else streaming
+        self.prebuffer_ms = config.get("prebuffer_ms", 300) if prebuffer_ms is None else prebuffer_ms
+        self.stats: List[UtteranceStats] = []
+        # callback(text, pcm, sample_rate, channels) after each utterance
+        self.audio_listeners: List[Callable[[str, bytes, int, int], None]] = []
+
         # Clean up old temp files on initialization
         self._cleanup_old_files()
 
@@ -58,26 +149,45 @@ class VoiceAI:
         except Exception as e:
             print(f"   ⚠️ Temp file cleanup warning: {e}")
 
-    async def speak(self, text: str, filename: str = "utterance"):
-        """Generate and play speech using edge-tts"""
-        print(f"🔊 Speaking: '{text}'")
-        wav_file = None
-        try:
-            timestamp = str(int(time.time() * 1000))
-            wav_file = f"{self.audio_dir}/{filename}_{timestamp}.wav"
+    def add_audio_listener(self, listener: Callable[[str, bytes, int, int], None]):
+        """Receive the synthesized PCM of every utterance (e.g. to archive it)"""
+        self.audio_listeners.append(listener)
 
-            print(f"   📝 Generating audio...")
+    def remove_audio_listener(self, listener: Callable[[str, bytes, int, int], None]):
+        if listener in self.audio_listeners:
+            self.audio_listeners.remove(listener)
 
-            # Use edge-tts to generate audio
-            communicate = edge_tts.Communicate(text, voice=self.voice)
-            await communicate.save(wav_file)
+    def _notify_audio_listeners(self, text: str, pcm: bytes, sample_rate: int, channels: int):
+        for listener in list(self.audio_listeners):
+            try:
+                listener(text, pcm, sample_rate, channels)
+            except Exception as e:
+                print(f"   ⚠️ Audio listener error: {e}")
 
-            print(f"   🔊 Playing audio...")
-            # Play the audio file
-            subprocess.run(["afplay", wav_file], check=True, timeout=60)
+    async def speak(self, text: str, filename: str = "utterance"):
+        """
+        Generate and play speech with the configured TTS backend.
 
-            print(f"   ✅ Audio spoken")
-            return wav_file
+        Args:
+            text:     text to speak
+            filename: utterance label (kept for call-site compatibility)
+
+        Returns:
+            UtteranceStats for the utterance, or None on error
+        """
+        print(f"🔊 Speaking: '{text}'")
+        try:
+            if self.streaming:
+                stats = await self._speak_streaming(text)
+            else:
+                stats = await self._speak_buffered(text)
+
+            self.stats.append(stats)
+            print(
+                f"   ✅ Audio spoken (first audio after {stats.time_to_first_audio * 1000:.0f} ms, "
+                f"{stats.audio_seconds:.1f}s of audio)"
+            )
+            return stats
 
         except Exception as e:
             print(f"   ❌ TTS Error: {str(e)}")
@@ -85,19 +195,93 @@ class VoiceAI:
 
             traceback.print_exc()
             return None
+
+    async def _speak_buffered(self, text: str) -> UtteranceStats:
+        """Synthesize the whole utterance, then play it"""
+        start = time.monotonic()
+        print(f"   📝 Generating audio ({self.tts.name})...")
+        audio = await self.tts.synthesize(text)
+        synthesized = time.monotonic()
+
+        print(f"   🔊 Playing audio...")
+        first_audio = time.monotonic()
+        # Device writes block at playback speed — keep them off the event loop
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.playback.play, audio.pcm, audio.sample_rate, audio.channels
+        )
+        self._notify_audio_listeners(text, audio.pcm, audio.sample_rate, audio.channels)
+        return UtteranceStats(
+            text_chars=len(text),
+            streaming=False,
+            time_to_first_audio=first_audio - start,
+            synthesis_seconds=synthesized - start,
+            audio_seconds=pcm_duration(audio.pcm, audio.sample_rate, audio.channels),
+            total_seconds=time.monotonic() - start,
+            backend=self.tts.name,
+        )
+
+    async def _speak_streaming(self, text: str) -> UtteranceStats:
+        """Play PCM chunks as the backend produces them, after prebuffer_ms"""
+        start = time.monotonic()
+        player: Optional[StreamingPlayer] = None
+        keep = bool(self.audio_listeners)
+        parts: List[bytes] = []
+        chunks = self.tts.stream(text)
+        try:
+            async for chunk in chunks:
+                if player is None:
+                    player = StreamingPlayer(
+                        self.playback, chunk.sample_rate, chunk.channels, self.prebuffer_ms
+                    ).start()
+                player.feed(chunk.pcm)
+                if keep:
+                    parts.append(chunk.pcm)
+            synthesized = time.monotonic()
+        except BaseException:
+            # Cut the partial utterance off before whatever the caller plays next
+            if player:
+                await asyncio.get_running_loop().run_in_executor(None, player.stop)
+            raise
         finally:
-            # Clean up the temp file immediately after playing
-            if wav_file and os.path.exists(wav_file):
-                try:
-                    os.unlink(wav_file)
-                    print(f"   🗑️ Cleaned up temp audio file")
-                except OSError:
-                    pass
+            await chunks.aclose()  # stops the backend's synthesizer if we bailed out early
+            if player:
+                player.finish()
+
+        if player is None:
+            raise RuntimeError(f"{self.tts.name} TTS returned no audio")
+        await asyncio.get_running_loop().run_in_executor(None, player.wait)
+        if keep:
+            self._notify_audio_listeners(text, b"".join(parts), player.sample_rate, player.channels)
+
+        return UtteranceStats(
+            text_chars=len(text),
+            streaming=True,
+            time_to_first_audio=(player.first_audio_at or time.monotonic()) - start,
+            synthesis_seconds=synthesized - start,
+            audio_seconds=player.seconds_played,
+            total_seconds=time.monotonic() - start,
+            backend=self.tts.name,
+        )
+
+
+_shared_playback: Optional[PlaybackBackend] = None
+
+
+def get_shared_playback() -> PlaybackBackend:
+    """One playback backend per process so the output stream stays open"""
+    global _shared_playback
+    if _shared_playback is None:
+        _shared_playback = playback_from_config(load_voice_ai_config())
+    return _shared_playback
 
 
 def speak_sync(text: str, voice: str = "en-US-GuyNeural"):
-    """Synchronous wrapper for speaking text"""
-    vai = VoiceAI(voice=voice)
-    import asyncio
+    """
+    Synchronous wrapper for speaking text.
+
+    Utterances go through the process-wide SpeechService, so the VoiceAI
+    instance and its event loop are reused across calls.
+    """
+    from src.speech_service import get_speech_service
 
-    return asyncio.run(vai.speak(text))
+    return get_speech_service(voice).speak(text)
@@ -17,8 +17,22 @@ Usage:
   - From log:   verify_order(driver, log_file="logs/test_run_20260209_162033.txt")
 """
 from appium.webdriver.common.appiumby import AppiumBy
-from src.appium_driver import AppiumDriver
+from src.event_log import (
+    DEFAULT_SPEAKERS,
+    ROLE_AGENT,
+    ROLE_CUSTOMER,
+    format_transcript,
+    read_conversation,
+    read_events,
+    rejected_items,
+    run_metadata,
+)
+from src.menu_catalog import get_menu_catalog
 from src.ollama_client import OllamaClient
+from src.run_index import get_run_index, run_id_for
+from src.turn_timing import TurnTimer
+from src.ui_hierarchy import UiSnapshot
+from concurrent.futures import ThreadPoolExecutor
 import os
 import glob
 import re
@@ -100,39 +114,27 @@ def detect_screen(driver):
 def scrape_screen_texts(driver, screenshot_name=None):
     """
     Collect all visible text and content-desc strings from the current screen
-    (single viewport — no scrolling).
+    (single viewport — no scrolling) from one page_source fetch.
 
     Returns:
         list of unique non-empty strings
     """
-    texts = []
-    seen = set()
-
-    for xpath, attr in [("//*[@text != '']", "text"), ("//*[@content-desc != '']", "content-desc")]:
-        try:
-            time.sleep(1)
-            for el in driver.driver.find_elements(AppiumBy.XPATH, xpath):
-                try:
-                    val = el.get_attribute(attr)
-                    if val and val.strip() and val.strip() not in seen:
-                        texts.append(val.strip())
-                        seen.add(val.strip())
-                except Exception:
-                    continue
-        except Exception as e:
-            print(f"   ⚠️  Error scraping {attr}: {e}")
+    try:
+        texts = UiSnapshot.capture(driver).texts()
+    except Exception as e:
+        print(f"   ⚠️  Error scraping screen: {e}")
+        texts = []
 
     if screenshot_name:
         try:
             driver.take_screenshot(screenshot_name)
-            print(f"   📸 Screenshot saved: {screenshot_name}")
         except Exception:
             pass
 
     return texts
 
 
-def scrape_full_page_texts(driver, screenshot_name=None, max_scrolls=8):
+def scrape_full_page_texts(driver, screenshot_name=None, max_scrolls=8, on_page=None):
     """
     Collect all text on a scrollable screen by scrolling down until no new
     content appears. Captures items that are off-screen on first load.
@@ -143,6 +145,8 @@ def scrape_full_page_texts(driver, screenshot_name=None, max_scrolls=8):
         driver:          AppiumDriver instance
         screenshot_name: if set, saves a screenshot after initial scrape
         max_scrolls:     safety cap on scroll iterations
+        on_page:         optional callback(new_texts) -> bool, called with the
+                         texts each page adds; returning True stops scrolling
 
     Returns:
         list of unique non-empty strings from the entire page
@@ -153,6 +157,8 @@ def scrape_full_page_texts(driver, screenshot_name=None, max_scrolls=8):
     initial = scrape_screen_texts(driver, screenshot_name=screenshot_name)
     all_texts.update(initial)
     print(f"   Visible texts before scrolling: {len(all_texts)}")
+    if on_page and on_page(initial):
+        return list(all_texts)
 
     size = driver.driver.get_window_size()
     scroll_params = {
@@ -168,16 +174,17 @@ def scrape_full_page_texts(driver, screenshot_name=None, max_scrolls=8):
         driver.driver.execute_script("mobile: swipeGesture", scroll_params)
         time.sleep(1)
 
-        new_texts = scrape_screen_texts(driver)
-        new_count = len(all_texts)
+        new_texts = [t for t in scrape_screen_texts(driver) if t not in all_texts]
         all_texts.update(new_texts)
 
-        added = len(all_texts) - new_count
+        added = len(new_texts)
         print(f"   Scroll {scroll_num}: +{added} new text elements (total {len(all_texts)})")
 
         if added == 0:
             print(f"   No new content after scroll {scroll_num} — reached end of page")
             break
+        if on_page and on_page(new_texts):
+            break
 
     return list(all_texts)
 
@@ -292,14 +299,53 @@ def click_order_details_tab(driver, retries=3, wait_between=2):
 # Order Complete verification
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Order Details ends with the totals block; once a scroll brings it into view every item
+# row has been seen (a totals bar already showing on the first page may be sticky)
+DETAILS_FOOTER = ("subtotal", "order total")
+
+
+def _timed(timer, name, fn, *args):
+    """Run fn(*args) and record it as a span on `timer`"""
+    start = time.monotonic()
+    try:
+        return fn(*args)
+    finally:
+        timer.add(name, start, time.monotonic() - start)
+
+
+def _stream_match(matcher, texts):
+    for item in matcher.add(texts):
+        print(f"   ✅ Streamed match: '{item}' ({len(matcher.matched)}/{len(matcher.expected)})")
+
+
+def print_stage_timings(stage_timings):
+    """Per-stage table from a TurnTimer dict: seconds summed over spans of the same name"""
+    totals = {}
+    for span in stage_timings.get("spans", []):
+        seconds, count = totals.get(span["name"], (0.0, 0))
+        totals[span["name"]] = (seconds + span["seconds"], count + 1)
+    print("\n   Stage timings:")
+    for name, (seconds, count) in totals.items():
+        print(f"      {name:<16} {seconds:6.2f}s" + (f"  ({count} pages)" if count > 1 else ""))
+    print(f"      {'total':<16} {stage_timings.get('total', 0):6.2f}s")
+
+
 def verify_order_complete(driver, expected_items, ollama):
     """
     Verify the ORDER COMPLETE screen — Overview tab and Order Details tab.
 
     Steps:
       1. Scrape Overview tab  → order number, item count, payment card, totals
-      2. Click Order Details  → full-page scroll to capture all items
-      3. Compare items against expected_items via Ollama
+      2. Click Order Details  → scroll the page to capture all items
+      3. Compare items against expected_items (keyword matching)
+
+    The Overview is parsed on a pipeline thread during the Order Details
+    navigation, and each page of Order Details is matched against the
+    expected items as soon as it is scraped (inline, before the next swipe;
+    only the Overview parse overlaps device work). Scrolling stops early once every
+    item is matched, or when a scroll brings the order totals into view
+    (anything unmatched by then is missing); otherwise the whole page is
+    scrolled. Stage spans are returned under "stage_timings".
 
     Args:
         driver:         AppiumDriver with ORDER COMPLETE screen visible
@@ -308,47 +354,82 @@ def verify_order_complete(driver, expected_items, ollama):
 
     Returns:
         dict with keys: passed, score, matched_items, missing_items,
-                        extra_items, reasoning, overview
+                        extra_items, reasoning, overview, stage_timings,
+                        short_circuit, details_pages
     """
     print("\n" + "=" * 60)
     print("ORDER COMPLETE VERIFICATION")
     print("=" * 60)
 
-    # ── OVERVIEW TAB ──────────────────────────────────────────────
-    print("\n── Overview Tab ──")
-    clicked_overview = click_overview_tab(driver)
-    if not clicked_overview:
-        print("   ⚠️  'Overview' tab click failed — scraping current screen anyway.")
+    timer = TurnTimer(0)
+    pipeline = ThreadPoolExecutor(max_workers=1, thread_name_prefix="verify")
+    matcher = StreamingMatcher(expected_items)
+    state = {"pages": 0, "short_circuit": None, "on_details": False}
+
+    def on_page(texts):
+        state["pages"] += 1
+        _timed(timer, "match", _stream_match, matcher, texts)  # cheap; the next scroll waits on it
+        if matcher.complete:
+            state["short_circuit"] = "all expected items matched"
+        elif (state["on_details"] and state["pages"] > 1
+              and any(t.lower().startswith(DETAILS_FOOTER) for t in texts)):
+            state["short_circuit"] = "order totals reached"
+        return state["short_circuit"] is not None
 
-    overview_texts = scrape_screen_texts(driver, screenshot_name="order_complete_overview")
-    print(f"   Scraped {len(overview_texts)} text elements from Overview")
-    for i, t in enumerate(overview_texts, 1):
-        print(f"      [{i}] {t}")
+    try:
+        # ── OVERVIEW TAB ──────────────────────────────────────────────
+        print("\n── Overview Tab ──")
+        with timer.span("overview_tab"):
+            clicked_overview = click_overview_tab(driver)
+        if not clicked_overview:
+            print("   ⚠️  'Overview' tab click failed — scraping current screen anyway.")
+
+        with timer.span("overview_scrape"):
+            overview_texts = scrape_screen_texts(driver, screenshot_name="order_complete_overview")
+        print(f"   Scraped {len(overview_texts)} text elements from Overview")
+        for i, t in enumerate(overview_texts, 1):
+            print(f"      [{i}] {t}")
+        overview_future = pipeline.submit(_timed, timer, "overview_parse", _parse_overview, overview_texts)
+
+        # ── ORDER DETAILS TAB ─────────────────────────────────────────
+        print("\n── Order Details Tab ──")
+        with timer.span("details_tab"):
+            clicked_details = click_order_details_tab(driver)
+
+        if not clicked_details:
+            print("   ⚠️  'Order Details' tab click failed — scraping current screen anyway.")
+        state["on_details"] = clicked_details  # the Overview has an "Order Total" line too
+
+        # Expand any collapsed item rows so quantities are visible before scraping
+        with timer.span("show_details"):
+            click_show_details(driver)
+
+        # Scroll through the tab; each page is matched before the next swipe
+        with timer.span("details_scroll"):
+            details_texts = scrape_full_page_texts(
+                driver, screenshot_name="order_complete_details", on_page=on_page
+            )
+        print(f"   Total text elements collected ({state['pages']} pages): {len(details_texts)}")
+        for i, t in enumerate(details_texts, 1):
+            print(f"      [{i}] {t}")
+
+        with timer.span("pipeline_wait"):
+            overview = overview_future.result()
+            pipeline.shutdown(wait=True)
+    finally:
+        pipeline.shutdown(wait=False)
 
-    overview = _parse_overview(overview_texts)
     print(f"\n   Parsed Overview:")
     print(f"      Order #    : {overview.get('order_number', 'not found')}")
     print(f"      Item count : {overview.get('item_count', 'not found')}")
     print(f"      Payment    : {overview.get('payment', 'not found')}")
     print(f"      Total      : {overview.get('order_total', 'not found')}")
 
-    # ── ORDER DETAILS TAB ─────────────────────────────────────────
-    print("\n── Order Details Tab ──")
-    clicked_details = click_order_details_tab(driver)
-
-    if not clicked_details:
-        print("   ⚠️  'Order Details' tab click failed — scraping current screen anyway.")
-
-    # Expand any collapsed item rows so quantities are visible before scraping
-    click_show_details(driver)
-
-    # Scroll through the full tab so off-screen items are not missed
-    details_texts = scrape_full_page_texts(
-        driver, screenshot_name="order_complete_details"
-    )
-    print(f"   Total text elements collected (all scrolls): {len(details_texts)}")
-    for i, t in enumerate(details_texts, 1):
-        print(f"      [{i}] {t}")
+    short_circuit = state["short_circuit"]
+    if short_circuit:
+        if matcher.pending:
+            short_circuit += f" with {len(matcher.pending)} item(s) unmatched"
+        print(f"\n   ⏩ Stopped scrolling early: {short_circuit}")
 
     # ── COMPARE ITEMS ─────────────────────────────────────────────
     print("\n── Comparing Items vs Expected Order ──")
@@ -357,7 +438,8 @@ def verify_order_complete(driver, expected_items, ollama):
         "content_descs": [],
         "clickable_elements": [],
     }
-    item_results = compare_order_items(order_data, expected_items, ollama)
+    with timer.span("compare"):
+        item_results = compare_order_items(order_data, expected_items, ollama)
 
     # Attach overview summary
     item_results["overview"] = overview
@@ -370,6 +452,12 @@ def verify_order_complete(driver, expected_items, ollama):
             f" | Note: payment card shown as '{payment}' (expected ...007)"
         )
 
+    stages = timer.to_dict()
+    item_results["stage_timings"] = {"spans": stages["spans"], "total": stages["total"]}
+    item_results["short_circuit"] = short_circuit
+    item_results["details_pages"] = state["pages"]
+    print_stage_timings(item_results["stage_timings"])
+
     return item_results
 
 
@@ -462,7 +550,6 @@ def scrape_cart_items(driver):
 
     try:
         driver.take_screenshot("cart_verification")
-        print("   📸 Cart screenshot saved")
     except Exception as e:
         print(f"   ⚠️  Screenshot failed: {e}")
 
@@ -475,7 +562,10 @@ def scrape_cart_items(driver):
 
 def extract_expected_from_log(log_file, ollama=None):
     """
-    Parse a conversation log and use Ollama to extract the final confirmed items.
+    Read a conversation log and use Ollama to extract the final confirmed items.
+
+    Uses the structured .events.jsonl log when the run wrote one; older runs
+    fall back to parsing the plain-text log.
 
     Returns:
         list of expected item strings
@@ -484,20 +574,23 @@ def extract_expected_from_log(log_file, ollama=None):
     print("EXTRACTING EXPECTED ITEMS FROM CONVERSATION LOG")
     print("=" * 60)
 
-    if not os.path.isfile(log_file):
+    events = read_events(log_file)
+    if events is None and not os.path.isfile(log_file):
         print(f"   ❌ Log file not found: {log_file}")
         return []
 
-    with open(log_file, "r") as f:
-        transcript = f.read()
+    turns = read_conversation(log_file)
+    transcript = format_transcript(turns)
+    speakers = run_metadata(events).get("speakers") or DEFAULT_SPEAKERS
+    customer = speakers.get(ROLE_CUSTOMER, DEFAULT_SPEAKERS[ROLE_CUSTOMER])
 
-    print(f"   📄 Loaded log: {log_file}")
+    print(f"   📄 Loaded {'event log' if events is not None else 'log'}: {log_file} ({len(turns)} turns)")
     print(f"   📏 Transcript length: {len(transcript)} chars")
 
     if not ollama:
         ollama = OllamaClient()
 
-    prompt = f"""Read this conversation transcript between a customer (Ravi) and a pizza ordering agent.
+    prompt = f"""Read this conversation transcript between a customer ({customer}) and a pizza ordering agent.
 Extract ONLY the final confirmed order items. Include quantity, size, and item name for each.
 
 Transcript:
@@ -520,23 +613,61 @@ If no clear order was placed, return {{"items": []}}"""
     print("   🤖 Asking Ollama to extract order items...")
     response = ollama.generate(prompt, system=system)
 
+    catalog = get_menu_catalog()
     try:
         if "{" in response:
             json_start = response.index("{")
             json_end = response.rindex("}") + 1
             parsed = json.loads(response[json_start:json_end])
-            items = parsed.get("items", [])
+            items = [catalog.canonicalize(item) for item in parsed.get("items", [])
+                     if isinstance(item, str) and item.strip()]
             print(f"   ✅ Extracted {len(items)} expected items:")
             for i, item in enumerate(items, 1):
                 print(f"      [{i}] {item}")
             return items
         else:
             print(f"   ⚠️  No JSON in Ollama response: {response[:100]}")
-            return []
     except (json.JSONDecodeError, ValueError) as e:
         print(f"   ❌ Failed to parse Ollama response: {e}")
         print(f"      Raw response: {response[:200]}")
-        return []
+
+    return _extract_items_with_catalog(turns, rejected_items(events))
+
+
+def _extract_items_with_catalog(turns, known_rejected=None):
+    """
+    Deterministic fallback when the LLM response is unusable: keep menu items
+    that the customer asked for and the agent echoed back, minus anything the
+    agent said it does not have.
+
+    Args:
+        turns:          conversation turns from read_conversation()
+        known_rejected: items the run already logged as rejected
+
+    Returns:
+        list of canonical item strings
+    """
+    catalog = get_menu_catalog()
+    requested, echoed, rejected = [], set(), set(known_rejected or [])
+
+    for turn in turns:
+        if turn["role"] == ROLE_CUSTOMER:
+            for match in catalog.find_items(turn["text"]):
+                if match.item not in [m.item for m in requested]:
+                    requested.append(match)
+        elif turn["role"] == ROLE_AGENT:
+            text = turn["text"]
+            names = catalog.item_names(text)
+            if any(p in text.lower() for p in ("don't have", "do not have", "not available")):
+                rejected.update(names)
+            else:
+                echoed.update(names)
+
+    items = [m.label() for m in requested if m.item in echoed and m.item not in rejected]
+    print(f"   🍕 Menu catalog fallback extracted {len(items)} expected items:")
+    for i, item in enumerate(items, 1):
+        print(f"      [{i}] {item}")
+    return items
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -545,22 +676,8 @@ If no clear order was placed, return {{"items": []}}"""
 
 # ── Keyword-matching helpers (no LLM) ────────────────────────────────────────
 
-# Normalise size abbreviations so "lg" == "large", etc.
-_SIZE_ALIASES = {
-    "lg": "large", "lrg": "large",
-    "md": "medium", "med": "medium",
-    "sm": "small",
-    "xl": "xlarge",
-}
-
-# Words that carry no useful signal for item matching
-_STOP_WORDS = {
-    "a", "an", "the", "with", "and", "or", "of", "for", "on", "in",
-    "1", "2", "3", "4", "5", "6", "7", "8", "9", "0",
-    "one", "two", "three", "four", "five",
-    "order",  # "1 Order of Breadsticks" — "order" means serving, not product
-    "pizza",  # too generic — present in almost every screen line
-}
+# Size aliases, stop words and ASR mishearings live in config/menu_catalog.yaml;
+# the shared MenuCatalog index resolves each token/phrase with a dict lookup.
 
 
 def _clean(text):
@@ -570,8 +687,7 @@ def _clean(text):
 
 def _keywords(text):
     """Return meaningful, normalised tokens from a text string."""
-    return [_SIZE_ALIASES.get(w, w) for w in _clean(text).split()
-            if w and w not in _STOP_WORDS]
+    return get_menu_catalog().keyword_tokens(text)
 
 
 def _token_match(kw, screen_token_set):
@@ -590,15 +706,32 @@ def _token_match(kw, screen_token_set):
     return False
 
 
-def _item_found_in_screen(expected_item, screen_token_set, screen_combined):
+def _same_order_line(expected, seen):
+    """True if one of the on-screen matches of an item has the expected size and quantity"""
+    return any(
+        (expected.size is None or m.size == expected.size)
+        and (expected.quantity is None or m.quantity == expected.quantity)
+        for m in seen
+    )
+
+
+def _item_found_in_screen(expected_item, screen_token_set, screen_combined, screen_items=None):
     """
     Return True if the expected item is represented on the order screen.
 
+    Catalog check  : the item resolves to canonical menu items that all
+                     appear among the items found on screen with the same
+                     size and quantity (screen_items: name → MenuMatch list).
     Primary check  : ≥60 % of the item's keywords match screen tokens
                      (with basic singular/plural normalisation).
     Secondary check: the item's keyword sequence is a substring of the
                      concatenated screen text.
     """
+    if screen_items:
+        expected = get_menu_catalog().find_items(expected_item)
+        if expected and all(_same_order_line(m, screen_items.get(m.item, ())) for m in expected):
+            return True
+
     kws = _keywords(expected_item)
     if not kws:
         return True  # nothing meaningful to check — assume present
@@ -611,6 +744,79 @@ def _item_found_in_screen(expected_item, screen_token_set, screen_combined):
     return ratio >= 0.6 or kw_seq in screen_combined
 
 
+# Order-screen text that is never part of an item
+_UI_NOISE = {
+    "scrim", "remove all", "remove", "more sauce?",
+    "add extra cheese", "subtotal", "tax", "make it large",
+    "order complete", "overview", "order details", "view rewards",
+    "papa rewards", "get directions", "menu", "cart", "home",
+    "deals", "profile", "rewards",
+}
+
+
+def _order_text(texts):
+    """Screen texts minus UI noise and bare prices ("$X.XX")"""
+    kept = []
+    for text in texts:
+        lower = text.lower().strip()
+        if any(noise in lower for noise in _UI_NOISE):
+            continue
+        if lower.startswith("$") and lower.replace("$", "").replace(".", "").isdigit():
+            continue
+        kept.append(text)
+    return kept
+
+
+def _index_screen_text(texts, screen_token_set, screen_items):
+    """Add the normalised tokens of `texts` to the set and their menu matches to screen_items (name → matches)"""
+    catalog = get_menu_catalog()
+    for text in texts:
+        for word in _clean(text).split():
+            screen_token_set.add(catalog.normalize_token(word))
+        for match in catalog.find_items(text):
+            screen_items.setdefault(match.item, []).append(match)
+
+
+class StreamingMatcher:
+    """
+    Incremental form of compare_order_items(): screen text is added page by
+    page and every expected item is re-checked as it arrives, so a caller
+    knows after each page which items are already matched.
+    """
+
+    def __init__(self, expected_items):
+        self.expected = list(expected_items or [])
+        self.matched = []
+        self._tokens = set()
+        self._items = {}
+        self._combined = []
+
+    @property
+    def pending(self):
+        return [item for item in self.expected if item not in self.matched]
+
+    @property
+    def complete(self) -> bool:
+        """Every expected item has been matched (more text cannot change the result)"""
+        return not self.pending
+
+    def add(self, texts):
+        """
+        Add a page of scraped text.
+
+        Returns:
+            expected items newly matched by this page
+        """
+        kept = _order_text(texts)
+        _index_screen_text(kept, self._tokens, self._items)
+        self._combined.extend(_clean(t) for t in kept)
+        combined = " ".join(self._combined)
+        newly = [item for item in self.pending
+                 if _item_found_in_screen(item, self._tokens, combined, self._items)]
+        self.matched.extend(newly)
+        return newly
+
+
 def compare_order_items(order_data, expected_items, ollama=None):
     """
     Deterministically compare scraped order-screen text against expected items
@@ -641,34 +847,18 @@ def compare_order_items(order_data, expected_items, ollama=None):
         }
 
     # Filter out UI noise — keep only item-relevant text
-    UI_NOISE = {
-        "scrim", "remove all", "remove", "more sauce?",
-        "add extra cheese", "subtotal", "tax", "make it large",
-        "order complete", "overview", "order details", "view rewards",
-        "papa rewards", "get directions", "menu", "cart", "home",
-        "deals", "profile", "rewards",
-    }
-
-    all_order_text = []
-    for text in order_data.get("raw_texts", []) + order_data.get("content_descs", []):
-        lower = text.lower().strip()
-        if any(noise in lower for noise in UI_NOISE):
-            continue
-        # Skip bare price entries ("$X.XX")
-        if lower.startswith("$") and lower.replace("$", "").replace(".", "").isdigit():
-            continue
-        all_order_text.append(text)
+    all_order_text = _order_text(order_data.get("raw_texts", []) + order_data.get("content_descs", []))
 
     # Build lookup structures from screen text
     screen_token_set = set()
-    for text in all_order_text:
-        for word in _clean(text).split():
-            screen_token_set.add(_SIZE_ALIASES.get(word, word))
+    screen_items = {}
+    _index_screen_text(all_order_text, screen_token_set, screen_items)
     screen_combined = " ".join(_clean(t) for t in all_order_text)
 
     print(f"   📋 Expected items: {expected_items}")
     print(f"   🧾 Order text elements after noise filter: {len(all_order_text)}")
     print(f"   🔍 Screen tokens: {len(screen_token_set)}")
+    print(f"   🍕 Menu items on screen: {sorted(screen_items)}")
 
     matched_items = []
     missing_items = []
@@ -677,7 +867,7 @@ def compare_order_items(order_data, expected_items, ollama=None):
         kws = _keywords(item)
         found_count = sum(1 for kw in kws if kw in screen_token_set)
         ratio = round(found_count / len(kws), 2) if kws else 1.0
-        hit = _item_found_in_screen(item, screen_token_set, screen_combined)
+        hit = _item_found_in_screen(item, screen_token_set, screen_combined, screen_items)
         print(f"   {'✅' if hit else '❌'} '{item}' — keywords {kws}, "
               f"found {found_count}/{len(kws)} ({ratio:.0%})")
         if hit:
@@ -777,6 +967,18 @@ def print_report(results, log_filepath=None):
 # Main entry point
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _latest_log_file():
+    """Most recent conversation log: run index first, glob of logs/ as fallback"""
+    try:
+        latest = get_run_index().latest_run()
+        if latest:
+            return latest["log_file"]
+    except Exception as e:
+        print(f"   ⚠️  Run index unavailable ({e}), scanning logs/")
+    log_files = sorted(glob.glob(os.path.join("logs", "test_run_*.txt")), reverse=True)
+    return log_files[0] if log_files else None
+
+
 def verify_order(driver, expected_items=None, log_file=None):
     """
     Main verification entry point.
@@ -801,11 +1003,10 @@ def verify_order(driver, expected_items=None, log_file=None):
     if not expected_items and log_file:
         expected_items = extract_expected_from_log(log_file, ollama)
     elif not expected_items:
-        logs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
-        log_files = sorted(glob.glob(os.path.join(logs_dir, "test_run_*.txt")), reverse=True)
-        if log_files:
-            print(f"   No expected items provided, using latest log: {log_files[0]}")
-            expected_items = extract_expected_from_log(log_files[0], ollama)
+        log_file = _latest_log_file()
+        if log_file:
+            print(f"   No expected items provided, using latest log: {log_file}")
+            expected_items = extract_expected_from_log(log_file, ollama)
         else:
             print("   ⚠️  No expected items and no log files found")
 
@@ -830,14 +1031,26 @@ def verify_order(driver, expected_items=None, log_file=None):
             "reasoning": "ORDER COMPLETE screen did not appear within the wait timeout.",
         }
 
-    # Save report
-    logs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+    # Save report next to the conversation logs (relative to the working
+    # directory, like logs/test_run_*.txt, so device pool workers keep theirs apart)
+    logs_dir = "logs"
     os.makedirs(logs_dir, exist_ok=True)
     report_path = os.path.join(
         logs_dir, f"order_verification_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
     )
     print_report(results, log_filepath=report_path)
 
+    if log_file:
+        try:
+            get_run_index().record_run(
+                run_id_for(log_file),
+                verification_file=report_path,
+                passed=results["passed"],
+                score=results["score"],
+            )
+        except Exception as e:
+            print(f"   ⚠️  Could not update run index: {e}")
+
     return results
 
 
@@ -860,6 +1073,8 @@ if __name__ == "__main__":
             expected = sys.argv[1:]
             print(f"   Using expected items: {expected}")
 
+    from src.appium_driver import AppiumDriver
+
     driver = AppiumDriver("config/appium_config.yaml")
 
     try: